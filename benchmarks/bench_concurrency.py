@@ -0,0 +1,103 @@
+"""আপডেট কনকারেন্সি: একসাথে কতগুলো আপডেট চললে থ্রুপুট কত, আর ইউজারের ক্রম ঠিক থাকে কিনা।
+
+    python benchmarks/bench_concurrency.py --users 100 --levels 1 8 32 128
+    python benchmarks/bench_concurrency.py --latency 0.01 --tg-latency 0.05
+
+replay_updates এর একই ইউজার সেশন, কিন্তু এখানে আপডেটগুলো আসল রানটাইমের মতো
+`update_queue` এ রাখা হয় আর অ্যাপ্লিকেশনের নিজের ফেচার +
+UserOrderedUpdateProcessor সেগুলো চালায়। সব সেশন একসাথে কিউতে থাকে, তাই
+ভিন্ন ইউজারের আপডেট মিশে যায়।
+
+যাচাই: প্রতিটি ইউজারের উইজার্ড ঠিক একটি সম্পূর্ণ সাবমিশন তৈরি করেছে (ক্রম
+ভাঙলে ধাপ হারায় বা ভুল স্টেটে যায়)।
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import logging
+
+from replay_updates import ADMIN_ID, UpdateFactory, user_session
+
+import bot
+import repository
+from config import COLLECTION_SUBMISSIONS
+from fake_firestore import install
+from fake_telegram import FakeRequest
+
+
+async def _level(client, concurrency, users, group_messages, tg_latency, seed):
+    request = FakeRequest(latency=tg_latency, admins=[ADMIN_ID])
+    app = bot.build_application(os.environ["BOT_TOKEN"], request=request, concurrency=concurrency)
+    await app.initialize()
+
+    # প্রতি লেভেলে আলাদা ইউজার আইডি, যাতে আগের লেভেলের স্টেট/কুলডাউন প্রভাব না ফেলে
+    base = concurrency * 1_000_000
+    rng = random.Random(seed)
+    factory = UpdateFactory(app.bot)
+    sessions = [list(user_session(factory, base + i, rng, group_messages)) for i in range(1, users + 1)]
+
+    # সেশনগুলো রাউন্ড-রবিন করে কিউতে: প্রতি ইউজারের ক্রম ঠিক, কিন্তু ইউজাররা পাশাপাশি
+    total = 0
+    for step in range(max(len(s) for s in sessions)):
+        for session in sessions:
+            if step < len(session):
+                app.update_queue.put_nowait(session[step][1])
+                total += 1
+
+    started = time.perf_counter()
+    await app.start()
+    await app.update_queue.join()
+    elapsed = time.perf_counter() - started
+    peak = app.update_processor.peak
+    await app.stop()
+    await app.shutdown()
+
+    submissions = await repository.run_sync("read", 
+        lambda: [doc.to_dict() for doc in client.collection(COLLECTION_SUBMISSIONS).where("status", "==", "pending").stream()]
+    )
+    complete = {
+        s['user_id'] for s in submissions
+        if base < s['user_id'] <= base + users and len(s.get('data', {})) == 4
+    }
+    return total, elapsed, peak, len(complete)
+
+
+async def _run(args):
+    client = install(repository, latency=args.latency)
+    startup_app = bot.build_application(os.environ["BOT_TOKEN"], request=FakeRequest(admins=[ADMIN_ID]))
+    await startup_app.initialize()
+    await bot.on_startup(startup_app)
+
+    print(f"users={args.users} fs_latency={args.latency * 1000:.0f}ms tg_latency={args.tg_latency * 1000:.0f}ms")
+    print(f"{'limit':>6} {'updates':>8} {'seconds':>8} {'upd/sec':>8} {'peak':>5} {'ordered':>8}")
+    baseline = None
+    for level in args.levels:
+        total, elapsed, peak, complete = await _level(client, level, args.users, args.group_messages, args.tg_latency, args.seed)
+        rate = total / elapsed
+        baseline = baseline or rate
+        ok = "OK" if complete == args.users else f"{complete}/{args.users}"
+        print(f"{level:>6} {total:>8} {elapsed:>8.2f} {rate:>8.0f} {peak:>5} {ok:>8}  x{rate / baseline:.1f}")
+        assert complete == args.users, "per-user ordering broken: some wizards did not finish"
+
+    await bot.on_shutdown(startup_app)
+    await startup_app.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--group-messages", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.005, help="প্রতি ফায়ারস্টোর RPC এর সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--tg-latency", type=float, default=0.03, help="প্রতি Bot API কলের সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
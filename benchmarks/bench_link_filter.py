@@ -0,0 +1,75 @@
+"""সাপোর্ট গ্রুপের লিংক ফিল্টার: প্রতি মেসেজে শ্রেণীকরণের খরচ (মাইক্রোসেকেন্ড)।
+
+    python benchmarks/bench_link_filter.py --messages 200000 --allow 50 --block 500
+
+তিনটি মোড তুলনা হয়: আগের সাবস্ট্রিং চেক, এন্টিটি থেকে পাওয়া লিংকসহ
+LinkFilter (বটে যেভাবে চলে), আর এন্টিটি ছাড়া রেজেক্স ব্যাকআপসহ LinkFilter।
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_filter import LinkFilter, _LINK_RE
+
+WORDS = "ভাই আমার টাকা কবে আসবে please help withdraw pending review done bkash nagad ধন্যবাদ".split()
+
+
+def _naive(text):
+    lower_text = text.lower()
+    return 'http' in lower_text or 't.me' in lower_text or '.com' in lower_text
+
+
+def _messages(count, allow, block):
+    rng = random.Random(42)
+    messages = []
+    for _ in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 25)))
+        roll = rng.random()
+        if roll < 0.05:
+            text += f" https://{rng.choice(block)}/x{rng.randint(1, 999)}"
+        elif roll < 0.10:
+            text += f" {rng.choice(allow)}/page"
+        elif roll < 0.12:
+            text += f" https://spam{rng.randint(1, 99)}.xyz/join"
+        messages.append((text, _LINK_RE.findall(text)))
+    return messages
+
+
+def _per_message_us(fn, messages):
+    started = time.perf_counter()
+    for text, links in messages:
+        fn(text, links)
+    return (time.perf_counter() - started) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--allow", type=int, default=50)
+    parser.add_argument("--block", type=int, default=500)
+    args = parser.parse_args()
+
+    allow = [f"partner{i}.com" for i in range(args.allow)] + ["t.me/skyzone"]
+    block = [f"scam{i}.net" for i in range(args.block)]
+
+    started = time.perf_counter()
+    link_filter = LinkFilter(allow, block)
+    compile_ms = (time.perf_counter() - started) * 1000
+    messages = _messages(args.messages, allow, block)
+
+    naive = _per_message_us(lambda text, links: _naive(text), messages)
+    with_entities = _per_message_us(link_filter.classify, messages)
+    fallback = _per_message_us(lambda text, links: link_filter.classify(text), messages)
+
+    print(f"messages={args.messages} allow={len(allow)} block={len(block)} compile={compile_ms:.1f}ms")
+    print(f"{'substring (old)':<24} {naive:>8.2f} us/msg")
+    print(f"{'LinkFilter + entities':<24} {with_entities:>8.2f} us/msg  ({1e6 / with_entities:,.0f} msg/s)")
+    print(f"{'LinkFilter regex only':<24} {fallback:>8.2f} us/msg  ({1e6 / fallback:,.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""ডেটা মডেল: ডিক্ট বনাম __slots__ মডেল (models.py), মেমরি ও কনভার্সনের খরচ।
+
+    python benchmarks/bench_models.py --users 100000 --repeat 5
+
+`users` টি ইউজার ডক (doc.to_dict() এর মতো ডিক্ট) থেকে একবার ডিক্ট কপি আর
+একবার User বানিয়ে মেমরিতে রাখা হয়, tracemalloc দিয়ে প্রতি ইউজারের বাইট মাপা
+হয়। তারপর মাপা হয় ডক থেকে পড়া (from_dict), লেখার ডিক্ট বানানো (to_dict বনাম
+হাতে লেখা ডিক্ট লিটারাল), শুধু balance ফিল্ডের প্রজেকশন পড়া আর ফিল্ড অ্যাক্সেস।
+শেষে যাচাই হয় to_dict() এর আউটপুট আগের হাতে লেখা ডিক্টের সাথে হুবহু মেলে।
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_admin import firestore
+
+from config import STATE_IDLE
+from models import User, Withdrawal
+
+
+def _docs(users, seed):
+    rng = random.Random(seed)
+    joined = datetime.now(timezone.utc) - timedelta(days=30)
+    return [{
+        'user_id': user_id,
+        'username': f"user{user_id}",
+        'first_name': "U",
+        'balance': round(rng.random() * 100, 2),
+        'referred_by': rng.randint(1, users) if rng.random() < 0.3 else None,
+        'referral_count': rng.randint(0, 5),
+        'joined_at': joined,
+        'is_blocked': False,
+        'state': STATE_IDLE,
+        'temp_data': {}
+    } for user_id in range(1, users + 1)]
+
+
+def _new_user_dict(user_id):
+    # মডেলের আগে get_or_create_user এ হাতে লেখা ডিক্ট
+    return {
+        'user_id': user_id,
+        'username': f"user{user_id}",
+        'first_name': "U",
+        'balance': 0.0,
+        'referred_by': None,
+        'referral_count': 0,
+        'joined_at': firestore.SERVER_TIMESTAMP,
+        'is_blocked': False,
+        'state': STATE_IDLE,
+        'temp_data': {}
+    }
+
+
+def _retained(build, docs):
+    """build(doc) দিয়ে সব ডক মেমরিতে রাখলে মোট কত বাইট লাগে।"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(doc) for doc in docs]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def _timed(fn, items, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items) * 1e9
+
+
+def _run(args):
+    docs = _docs(args.users, args.seed)
+    users = [User.from_dict(doc) for doc in docs]
+    ids = list(range(1, args.users + 1))
+    # get(field_paths=['balance']) যা ফেরত দেয়
+    projected = [{'balance': doc['balance']} for doc in docs]
+    print(f"users={args.users} repeat={args.repeat} (best run, ns per item)")
+
+    dict_bytes = _retained(dict, docs) / args.users
+    model_bytes = _retained(User.from_dict, docs) / args.users
+    print(f"\n{'retained per user':<28} {'dict':>9} {'User':>9}")
+    print(f"{'bytes':<28} {dict_bytes:>9.0f} {model_bytes:>9.0f}   x{dict_bytes / model_bytes:.1f} smaller")
+
+    rows = [
+        ("read (to_dict -> object)", _timed(dict, docs, args.repeat), _timed(User.from_dict, docs, args.repeat)),
+        ("write (object -> dict)", _timed(dict, docs, args.repeat), _timed(User.to_dict, users, args.repeat)),
+        ("new user", _timed(_new_user_dict, ids, args.repeat),
+         _timed(lambda user_id: User(user_id=user_id, username=f"user{user_id}", first_name="U", joined_at=firestore.SERVER_TIMESTAMP).to_dict(), ids, args.repeat)),
+        ("projected read (balance)", _timed(dict, projected, args.repeat), _timed(User.from_dict, projected, args.repeat)),
+        ("field access (balance)", _timed(lambda doc: doc.get('balance', 0.0), docs, args.repeat),
+         _timed(lambda user: user.balance, users, args.repeat)),
+    ]
+    print(f"\n{'conversion':<28} {'dict':>9} {'User':>9}")
+    for name, dict_ns, model_ns in rows:
+        print(f"{name:<28} {dict_ns:>9.0f} {model_ns:>9.0f}")
+
+    for user_id, doc in zip(ids[:1000], docs):
+        assert User(user_id=user_id, username=f"user{user_id}", first_name="U", joined_at=firestore.SERVER_TIMESTAMP).to_dict() == _new_user_dict(user_id)
+        assert User.from_dict(doc).to_dict() == doc
+    withdrawal = Withdrawal(user_id=1, amount=50.0, method='Bkash', target='017', time=firestore.SERVER_TIMESTAMP).to_dict()
+    assert withdrawal == {'user_id': 1, 'amount': 50.0, 'method': 'Bkash', 'target': '017',
+                          'status': 'pending', 'time': firestore.SERVER_TIMESTAMP}, withdrawal
+    assert User.from_dict({'user_id': 1}).joined_at is None
+    print("\nOK: to_dict() matches the hand-built Firestore dicts")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+    _run(args)
+
+
+if __name__ == "__main__":
+    main()
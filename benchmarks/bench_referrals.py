@@ -0,0 +1,133 @@
+"""রেফারেল: /start এর পথে কতগুলো RPC ও কত সময়, আর ব্যাকগ্রাউন্ড প্রসেসর কী দেয়।
+
+    python benchmarks/bench_referrals.py --users 2000 --referrers 100 --latency 0.01
+
+প্রথম ধাপে `users` জন নতুন ইউজার রেফারেল লিংকে /start করে (get_or_create_user,
+WriteCoalescer চালু)। দ্বিতীয় ধাপে referral_processor ইভেন্টগুলো ব্যাচে প্রসেস
+করে। কিছু অ্যাবিউজ কেস ইচ্ছা করে রাখা: একজন রেফারারের অনেক রেফারেল (velocity),
+একটি নতুন অ্যাকাউন্ট (referrer_too_new) আর একটি পারস্পরিক জোড়া (circular)।
+শেষে যাচাই হয় বোনাসের যোগফল, রেফারারদের ব্যালেন্স আর system/stats মেলে।
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import repository
+from config import COLLECTION_USERS, COLLECTION_REFERRALS, REFERRAL_VELOCITY_LIMIT
+from referrals import referral_processor
+from fake_firestore import install
+
+BONUS = 2.0
+HEAVY_REFERRER = 1
+
+
+def _backdate(client, user_id, days=30):
+    path = f"{COLLECTION_USERS}/{user_id}"
+    client._write(path, {'joined_at': datetime.now(timezone.utc) - timedelta(days=days)}, merge=True)
+
+
+async def _seed(client, referrers):
+    for user_id in range(1, referrers + 1):
+        await repository.get_or_create_user(user_id, f"u{user_id}", "U")
+        _backdate(client, user_id)
+    await repository.set_refer_bonus(BONUS)
+
+
+async def _signups(client, args):
+    rng = random.Random(args.seed)
+    first_new = args.referrers + 1
+    plan = []
+    for offset in range(args.users):
+        user_id = first_new + offset
+        # প্রতি ১০ জনে একজন একই রেফারারের কাছে: velocity সীমা ছাড়িয়ে যাবে
+        referrer = HEAVY_REFERRER if offset % 10 == 0 else rng.randint(2, args.referrers)
+        plan.append((user_id, referrer))
+    circular_user = first_new + args.users
+    too_new_user = circular_user + 1
+    fresh_referrer = circular_user + 2
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def start(user_id, referrer):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await repository.get_or_create_user(user_id, f"u{user_id}", "U", referrer)
+            latencies.append(time.perf_counter() - started)
+            if result['data'].get('referred_by'):
+                referral_processor.submit(user_id, referrer)
+
+    repository.write_coalescer.start()
+    rpc_before = client.rpc_count
+    started = time.perf_counter()
+    await asyncio.gather(*(start(u, r) for u, r in plan))
+    elapsed = time.perf_counter() - started
+    rpcs = client.rpc_count - rpc_before
+
+    # অ্যাবিউজ কেস: এইমাত্র খোলা অ্যাকাউন্টের রেফারেল, আর 2 যার রেফারেলে এসেছিল তাকেই 2 এর রেফার করা
+    await repository.get_or_create_user(fresh_referrer, "fresh", "U")
+    await start(too_new_user, fresh_referrer)
+    client._write(f"{COLLECTION_USERS}/2", {'referred_by': circular_user}, merge=True)
+    await start(circular_user, 2)
+    return latencies, elapsed, rpcs
+
+
+async def _run(args):
+    client = install(repository, latency=0)
+    await _seed(client, args.referrers)
+    client.latency = args.latency
+
+    latencies, elapsed, rpcs = await _signups(client, args)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(f"signups={args.users} referrers={args.referrers} rpc_latency={args.latency * 1000:.0f}ms")
+    print(f"/start path: {rpcs / args.users:.2f} RPCs per signup, p50 {p50:.1f}ms, p95 {p95:.1f}ms, {args.users / elapsed:.0f} signups/sec")
+
+    started = time.perf_counter()
+    await referral_processor.start()
+    await referral_processor._queue.join()
+    processing = time.perf_counter() - started
+    await referral_processor.stop()
+    await repository.write_coalescer.stop()
+
+    stats = referral_processor.stats()
+    print(f"processor: {stats['credited']} credited, rejected {stats['rejected']}, "
+          f"{stats['batches']} batches in {processing:.2f}s")
+
+    users = dict(client._docs(COLLECTION_USERS))
+    referrals = client._docs(COLLECTION_REFERRALS)
+    credited = [d for _, d in referrals if d['status'] == 'credited']
+    assert not [d for _, d in referrals if d['status'] == 'pending'], "pending referrals left"
+    assert stats['credited'] == len(credited)
+    heavy = sum(1 for d in credited if d['referrer'] == HEAVY_REFERRER)
+    assert heavy == REFERRAL_VELOCITY_LIMIT, (heavy, REFERRAL_VELOCITY_LIMIT)
+    assert stats['rejected'].get('circular') == 1 and stats['rejected'].get('referrer_too_new') == 1, stats['rejected']
+    total_balance = sum(d.get('balance', 0.0) for d in users.values())
+    assert abs(total_balance - BONUS * len(credited)) < 1e-6
+    system = (await repository.run_sync("read", repository._stats_ref().get)).to_dict()
+    assert abs(system['total_balance'] - total_balance) < 1e-6, (system['total_balance'], total_balance)
+    assert all(users[str(r)]['referral_count'] == sum(1 for d in credited if d['referrer'] == r) for r in range(1, args.referrers + 1))
+    print("OK: bonuses, referral counts, balances and system/stats agree")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--referrers", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.01, help="প্রতি RPC এর সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
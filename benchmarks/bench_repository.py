@@ -0,0 +1,68 @@
+"""অনেকগুলো আপডেট একসাথে এলে ফায়ারস্টোর কল ইভেন্ট লুপ আটকায় কিনা তা মাপে।
+
+    python benchmarks/bench_repository.py --updates 200 --latency 0.05
+
+`inline` মোডে পুরনো আচরণ (async ফাংশনের ভেতরে সরাসরি সিঙ্ক কল) অনুকরণ করা হয়,
+`executor` মোডে repository.py এর থ্রেড পুল ব্যবহার হয়। executor মোডে
+লেটেন্সিগুলো ওভারল্যাপ করে, তাই মোট সময় প্রায় এক RPC × (updates / workers)।
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import repository
+from config import COLLECTION_USERS, STATE_IDLE
+from fake_firestore import FakeFirestore
+
+
+async def _inline_update(user_id):
+    # আগের আচরণ: async হ্যান্ডলারের ভেতরে ব্লকিং .get()
+    doc = repository.db.collection(COLLECTION_USERS).document(str(user_id)).get()
+    data = doc.to_dict() or {}
+    return data.get("state", STATE_IDLE), data.get("temp_data", {})
+
+
+async def _run(mode, updates):
+    # সব আপডেট একই মুহূর্তে এসেছে ধরে নিয়ে প্রতিটির লেটেন্সি শুরু থেকে মাপা হয়
+    latencies = []
+    started = time.perf_counter()
+
+    async def one(user_id):
+        if mode == "inline":
+            await _inline_update(user_id)
+        else:
+            await repository.get_user_state_and_data(user_id)
+        latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(uid) for uid in range(updates)))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="প্রতি RPC এর সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    args = parser.parse_args()
+
+    repository.db = FakeFirestore(latency=args.latency)
+    for uid in range(args.updates):
+        repository.db.collection(COLLECTION_USERS).document(str(uid)).set({'user_id': uid, 'state': STATE_IDLE, 'temp_data': {}})
+
+    print(f"updates={args.updates} rpc_latency={args.latency * 1000:.0f}ms workers={repository._executor._max_workers}")
+    for mode in ("inline", "executor"):
+        wall, latencies = asyncio.run(_run(mode, args.updates))
+        latencies.sort()
+        p50 = statistics.median(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{mode:>9}: wall={wall:.2f}s p50={p50 * 1000:.0f}ms p95={p95 * 1000:.0f}ms max={latencies[-1] * 1000:.0f}ms")
+
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
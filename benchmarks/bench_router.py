@@ -0,0 +1,71 @@
+"""রাউটার: রুট সংখ্যা বাড়লে callback খোঁজার খরচ বাড়ে কিনা।
+
+    python benchmarks/bench_router.py --menus 10 100 1000
+
+প্রতিটি আকারে অর্ধেক রুট হুবহু (dict) আর অর্ধেক প্রিফিক্স (ট্রাই)। তুলনার
+জন্য আগের if/elif চেইনের মতো রৈখিক startswith স্ক্যানও মাপা হয়।
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from router import Router
+
+
+async def _noop(update, context):
+    pass
+
+
+def _build(menus):
+    router = Router()
+    exact = [f"menu_{i}_open" for i in range(menus // 2)]
+    prefixes = [f"act{i}_" for i in range(menus - len(exact))]
+    for key in exact:
+        router.callback(key)(_noop)
+    for key in prefixes:
+        router.callback(key, prefix=True)(_noop)
+    return router, exact, prefixes
+
+
+def _per_lookup_ns(fn, keys, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            fn(key)
+    return (time.perf_counter() - started) / (rounds * len(keys)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--menus", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'routes':>7} {'router':>10} {'linear scan':>12}")
+    for menus in args.menus:
+        router, exact, prefixes = _build(menus)
+        keys = [rng.choice(exact) if rng.random() < 0.5 else rng.choice(prefixes) + "a1b2c3d4e5" for _ in range(1000)]
+        rounds = max(1, args.lookups // len(keys))
+
+        def linear(data):
+            for key in exact:
+                if data == key:
+                    return key
+            for key in prefixes:
+                if data.startswith(key):
+                    return key
+
+        for key in keys:
+            assert router.resolve_callback(key) is not None
+        routed = _per_lookup_ns(router.resolve_callback, keys, rounds)
+        scanned = _per_lookup_ns(linear, keys, rounds)
+        print(f"{menus:>7} {routed:>8.0f}ns {scanned:>10.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
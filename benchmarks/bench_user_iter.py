@@ -0,0 +1,69 @@
+"""পুরো ইউজার লিস্ট বানানো বনাম পেজ ধরে স্ট্রিম করার পিক মেমরি তুলনা।
+
+    python benchmarks/bench_user_iter.py --sizes 1000 10000 50000
+
+`list` মোডে আগের get_all_user_ids() এর মতো সব আইডি একটি লিস্টে জমা হয়;
+`stream` মোডে repository.iter_user_ids() ব্যবহার হয়। ইউজার সংখ্যা বাড়লেও
+stream মোডের পিক মেমরি প্রায় একই থাকে (সর্বোচ্চ দুটি পেজ)।
+"""
+import os
+import sys
+import asyncio
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import repository
+from config import COLLECTION_USERS
+from fake_firestore import FakeFirestore
+
+
+async def _as_list(page_size):
+    # আগের আচরণ: সব আইডি মেমরিতে জমা করে তারপর ব্যবহার
+    ids = []
+    async for user_id in repository.iter_user_ids(page_size):
+        ids.append(user_id)
+    return len(ids)
+
+
+async def _streamed(page_size):
+    count = 0
+    async for _ in repository.iter_user_ids(page_size):
+        count += 1
+    return count
+
+
+def _peak(coro_fn, page_size):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    count = asyncio.run(coro_fn(page_size))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"page_size={args.page_size}")
+    print(f"{'users':>8} {'list peak':>12} {'stream peak':>12}")
+    for size in args.sizes:
+        repository.db = FakeFirestore()
+        users = repository.db.collection(COLLECTION_USERS)
+        for uid in range(size):
+            users.document(f"{uid:09d}").set({'user_id': uid, 'balance': 0.0, 'first_name': 'user'})
+
+        listed, list_peak = _peak(_as_list, args.page_size)
+        streamed, stream_peak = _peak(_streamed, args.page_size)
+        assert listed == streamed == size
+        print(f"{size:>8} {list_peak / 1024:>10.0f}KB {stream_peak / 1024:>10.0f}KB")
+
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
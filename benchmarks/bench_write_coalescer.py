@@ -0,0 +1,103 @@
+"""ব্যালেন্স/কাউন্টার লেখা: WriteCoalescer চালু ও বন্ধ অবস্থায় কতগুলো রাইট RPC হয়।
+
+    python benchmarks/bench_write_coalescer.py --ops 5000 --concurrency 200 --latency 0.01
+
+প্রতিটি রাউন্ডে `ops` টি কাজ `concurrency` টি টাস্ক একসাথে চালায়: বেশিরভাগ
+update_balance (কিছু ইউজার বারবার, যেমন জনপ্রিয় রেফারার), বাকিগুলো নতুন ইউজার
+(রেফারেলসহ)। শেষে যাচাই হয় সব ইউজারের ব্যালেন্সের যোগফল আর ইউজার সংখ্যা
+system/stats এর সাথে মেলে।
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import repository
+from config import COLLECTION_USERS
+from fake_firestore import install
+
+
+async def _round(client, coalesce, ops, concurrency, users, seed):
+    if coalesce:
+        repository.write_coalescer.start()
+    rng = random.Random(seed)
+    next_user = [users + 1]
+
+    async def one():
+        if rng.random() < 0.2:
+            user_id = next_user[0]
+            next_user[0] += 1
+            await repository.get_or_create_user(user_id, f"u{user_id}", "U", rng.randint(1, 20))
+        else:
+            # কয়েকজন ইউজারে বেশি লেখা, যাতে একই ডকের লেখা মেশানোর সুযোগ থাকে
+            user_id = rng.randint(1, 20) if rng.random() < 0.5 else rng.randint(1, users)
+            assert await repository.update_balance(user_id, 1.0)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            await one()
+
+    writes = metrics.FIRESTORE_SECONDS.labels("write")
+    rpc_before, writes_before = client.rpc_count, writes.count
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(ops)))
+    await repository.write_coalescer.stop()
+    elapsed = time.perf_counter() - started
+    return client.rpc_count - rpc_before, writes.count - writes_before, elapsed
+
+
+async def _check(client):
+    users = client._docs(COLLECTION_USERS)
+    stats = (await repository.run_sync("read", repository._stats_ref().get)).to_dict()
+    total_balance = sum(d.get('balance', 0.0) for _, d in users)
+    assert stats['total_users'] == len(users), (stats['total_users'], len(users))
+    assert abs(stats['total_balance'] - total_balance) < 1e-6, (stats['total_balance'], total_balance)
+
+
+async def _seed(users):
+    client = install(repository, latency=0)
+    for user_id in range(1, users + 1):
+        await repository.get_or_create_user(user_id, f"u{user_id}", "U")
+    await repository.set_refer_bonus(2.0)
+    return client
+
+
+async def _run(args):
+    print(f"ops={args.ops} concurrency={args.concurrency} rpc_latency={args.latency * 1000:.0f}ms")
+    print(f"{'mode':>10} {'writes':>7} {'all rpcs':>9} {'seconds':>8} {'ops/sec':>8}")
+    results = {}
+    for coalesce in (False, True):
+        client = await _seed(args.users)
+        client.latency = args.latency
+        rpcs, writes, elapsed = await _round(client, coalesce, args.ops, args.concurrency, args.users, args.seed)
+        await _check(client)
+        mode = "coalesced" if coalesce else "direct"
+        results[mode] = writes
+        print(f"{mode:>10} {writes:>7} {rpcs:>9} {elapsed:>8.2f} {args.ops / elapsed:>8.0f}")
+    stats = repository.write_coalescer.stats()
+    print(f"\nwrite RPC reduction: x{results['direct'] / max(1, results['coalesced']):.1f} "
+          f"(merged writes: {stats['merged']}, fallbacks: {stats['fallbacks']})")
+    print("OK: balances and system/stats agree")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.01, help="প্রতি RPC এর সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""বেঞ্চমার্কের জন্য ইন-মেমরি ফায়ারস্টোর।
+
+সিঙ্ক `google.cloud.firestore.Client` এর যতটুকু বট ব্যবহার করে ততটুকুই আছে।
+`latency` দিলে প্রতিটি RPC সেই পরিমাণ সময় থ্রেড ব্লক করে, আসল নেটওয়ার্ক
+রাউন্ড ট্রিপের মতো। প্রতিটি লেখা একটি লজিক্যাল ঘড়ি বাড়ায় আর আগের ভার্সন রেখে দেয়,
+তাই snapshot.read_time দিয়ে আসল ক্লায়েন্টের মতো পুরোনো মুহূর্তের ডেটা পড়া যায়।
+"""
+import copy
+import time
+import bisect
+import threading
+import itertools
+from datetime import datetime, timezone
+
+from firebase_admin import firestore
+
+
+class FakeFirestore:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.rpc_count = 0
+        self._data = {}
+        self._index = {}
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        # path -> [(এই লেখার সময়, লেখার আগের ডেটা)]; read_time এ পড়ার জন্য
+        self._clock = 0
+        self._history = {}
+
+    def _rpc(self):
+        with self._lock:
+            self.rpc_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        if transaction is None:
+            self._rpc()
+        # আসল ক্লায়েন্টের মতো সব ডকুমেন্ট একটি RPC তে
+        for ref in references:
+            data = self._read(ref.path)
+            if data is not None and field_paths is not None:
+                data = {k: v for k, v in data.items() if k in field_paths}
+            yield FakeSnapshot(ref, data)
+
+    def run_transaction(self, fn):
+        # ফেক ক্লায়েন্টে ট্রানজ্যাকশন সম্পূর্ণ সিরিয়ালাইজড
+        with self._lock:
+            transaction = FakeBatch(self)
+            result = fn(transaction)
+            transaction.commit()
+            return result
+
+    # --- অভ্যন্তরীণ ---
+    def _read(self, path, read_time=None):
+        with self._lock:
+            data = self._data.get(path)
+            if read_time is not None:
+                for written_at, previous in self._history.get(path, ()):
+                    if written_at > read_time:
+                        data = previous
+                        break
+            return copy.deepcopy(data) if data is not None else None
+
+    def _record(self, path, current):
+        # _write/_delete পুরোনো ডিক্ট বদলায় না, নতুন বসায়; তাই কপি ছাড়াই রাখা যায়
+        self._clock += 1
+        self._history.setdefault(path, []).append((self._clock, current))
+
+    def _write(self, path, data, merge=False, must_exist=False):
+        with self._lock:
+            current = self._data.get(path)
+            if must_exist and current is None:
+                raise KeyError(f"No document to update: {path}")
+            base = copy.deepcopy(current) if (current is not None and (merge or must_exist)) else {}
+            for key, value in data.items():
+                _apply(base, key.split('.') if must_exist else [key], value)
+            if current is None:
+                collection, doc_id = path.rsplit('/', 1)
+                bisect.insort(self._index.setdefault(collection, []), doc_id)
+            self._record(path, current)
+            self._data[path] = base
+
+    def _delete(self, path):
+        with self._lock:
+            current = self._data.pop(path, None)
+            if current is not None:
+                self._record(path, current)
+                collection, doc_id = path.rsplit('/', 1)
+                ids = self._index[collection]
+                del ids[bisect.bisect_left(ids, doc_id)]
+
+    def _id_range(self, collection, after, limit):
+        # ডকুমেন্ট আইডি ক্রমের কুয়েরির জন্য পুরো কালেকশন কপি না করে ইনডেক্স থেকে স্লাইস
+        with self._lock:
+            ids = self._index.get(collection, [])
+            start = bisect.bisect_right(ids, after) if after is not None else 0
+            stop = len(ids) if limit is None else start + limit
+            return ids[start:stop]
+
+    def _docs(self, collection, read_time=None):
+        prefix = collection + '/'
+        with self._lock:
+            if read_time is None:
+                items = self._data.items()
+            else:
+                # এরপর মুছে যাওয়া ডকও তখন ছিল, তাই ইতিহাসের পাথগুলোও দেখা হয়
+                paths = self._data.keys() | self._history.keys()
+                items = ((path, self._read(path, read_time)) for path in paths)
+            return [
+                (path[len(prefix):], copy.deepcopy(data))
+                for path, data in items
+                if data is not None and path.startswith(prefix) and '/' not in path[len(prefix):]
+            ]
+
+
+def _apply(target, parts, value):
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    key = parts[-1]
+    if value is firestore.SERVER_TIMESTAMP:
+        target[key] = datetime.now(timezone.utc)
+    elif value is firestore.DELETE_FIELD:
+        target.pop(key, None)
+    elif isinstance(value, firestore.Increment):
+        target[key] = target.get(key, 0) + value.value
+    elif isinstance(value, dict) and len(parts) == 1 and isinstance(target.get(key), dict):
+        for k, v in value.items():
+            _apply(target[key], [k], v)
+    else:
+        target[key] = copy.deepcopy(value)
+
+
+class FakeSnapshot:
+    def __init__(self, ref, data, read_time=None):
+        self.reference = ref
+        self.id = ref.id
+        self._data = data
+        self.read_time = read_time
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field):
+        value = self._data
+        for part in field.split('.'):
+            value = value[part]
+        return value
+
+
+class FakeDocumentRef:
+    def __init__(self, client, collection, doc_id):
+        self._client = client
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    def get(self, field_paths=None, transaction=None, read_time=None):
+        if transaction is None:
+            self._client._rpc()
+        with self._client._lock:
+            snapshot_time = self._client._clock if read_time is None else read_time
+            data = self._client._read(self.path, read_time)
+        if data is not None and field_paths is not None:
+            data = {k: v for k, v in data.items() if k in field_paths}
+        return FakeSnapshot(self, data, snapshot_time)
+
+    def set(self, data, merge=False):
+        self._client._rpc()
+        self._client._write(self.path, data, merge=merge)
+
+    def update(self, data):
+        self._client._rpc()
+        self._client._write(self.path, data, must_exist=True)
+
+    def delete(self):
+        self._client._rpc()
+        self._client._delete(self.path)
+
+    def collection(self, name):
+        return FakeCollection(self._client, f"{self.path}/{name}")
+
+
+class FakeQuery:
+    def __init__(self, client, name, filters=(), orders=(), limit=None, after=None, fields=None):
+        self._client = client
+        self._name = name
+        self._filters = list(filters)
+        self._orders = list(orders)
+        self._limit = limit
+        self._after = after
+        self._fields = fields
+
+    def _copy(self, **kwargs):
+        params = dict(filters=self._filters, orders=self._orders, limit=self._limit, after=self._after, fields=self._fields)
+        params.update(kwargs)
+        return FakeQuery(self._client, self._name, **params)
+
+    def where(self, field, op, value):
+        return self._copy(filters=self._filters + [(field, op, value)])
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._copy(orders=self._orders + [(field, direction)])
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot_or_values):
+        return self._copy(after=snapshot_or_values)
+
+    def select(self, fields):
+        return self._copy(fields=list(fields))
+
+    def _sort_key(self, doc_id, data):
+        key = [data.get(field) if field != '__name__' else doc_id for field, _ in self._orders]
+        return tuple(key) + (doc_id,)
+
+    def _by_name_only(self):
+        return not self._filters and self._orders in ([], [('__name__', "ASCENDING")]) and (
+            self._after is None or isinstance(self._after, (dict, FakeSnapshot))
+        )
+
+    def stream(self, transaction=None, read_time=None):
+        if transaction is None:
+            self._client._rpc()
+        if self._by_name_only() and read_time is None:
+            after = self._after
+            if isinstance(after, FakeSnapshot):
+                after = after.id
+            elif isinstance(after, dict):
+                after = after.get('__name__')
+            for doc_id in self._client._id_range(self._name, after, self._limit):
+                data = self._client._read(f"{self._name}/{doc_id}")
+                if data is None:
+                    continue
+                if self._fields is not None:
+                    data = {k: v for k, v in data.items() if k in self._fields}
+                yield FakeSnapshot(FakeDocumentRef(self._client, self._name, doc_id), data)
+            return
+        docs = self._client._docs(self._name, read_time)
+        for field, op, value in self._filters:
+            docs = [(i, d) for i, d in docs if _match(d.get(field), op, value)]
+        descending = any(direction == "DESCENDING" for _, direction in self._orders)
+        docs.sort(key=lambda item: self._sort_key(*item), reverse=descending)
+        if self._after is not None:
+            if isinstance(self._after, FakeSnapshot):
+                bound = self._sort_key(self._after.id, self._after._data or {})
+                docs = [(i, d) for i, d in docs if (self._sort_key(i, d) < bound if descending else self._sort_key(i, d) > bound)]
+            else:
+                bound = tuple(self._after.get(field) for field, _ in self._orders)
+                docs = [(i, d) for i, d in docs if (self._sort_key(i, d)[:len(bound)] < bound if descending else self._sort_key(i, d)[:len(bound)] > bound)]
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        for doc_id, data in docs:
+            if self._fields is not None:
+                data = {k: v for k, v in data.items() if k in self._fields}
+            yield FakeSnapshot(FakeDocumentRef(self._client, self._name, doc_id), data)
+
+    def get(self, transaction=None):
+        return list(self.stream(transaction))
+
+    def count(self, alias=None):
+        return FakeAggregation(self)
+
+
+class FakeAggregation:
+    def __init__(self, query):
+        self._query = query
+
+    def get(self, transaction=None):
+        # আসল ক্লায়েন্টের মতো [[AggregationResult]]; একটি RPC
+        query = self._query._copy(fields=[])
+        value = len(query.get(transaction))
+        return [[FakeAggregationResult(value)]]
+
+
+class FakeAggregationResult:
+    def __init__(self, value):
+        self.value = value
+
+
+def _match(actual, op, value):
+    if op == '==': return actual == value
+    if op == '!=': return actual != value
+    if actual is None: return False
+    if op == '<': return actual < value
+    if op == '<=': return actual <= value
+    if op == '>': return actual > value
+    if op == '>=': return actual >= value
+    if op == 'in': return actual in value
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.id = name.rsplit('/', 1)[-1]
+
+    def document(self, doc_id=None):
+        if doc_id is None:
+            doc_id = f"auto{next(self._client._ids):012d}"
+        return FakeDocumentRef(self._client, self._name, doc_id)
+
+    def add(self, data):
+        ref = self.document()
+        ref.set(data)
+        return datetime.now(timezone.utc), ref
+
+
+class FakeBatch:
+    """WriteBatch এবং Transaction দুটোর কাজই করে: লেখাগুলো commit এ একসাথে প্রয়োগ হয়।"""
+
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append(('set', ref, data, merge))
+
+    def update(self, ref, data):
+        self._ops.append(('update', ref, data, False))
+
+    def delete(self, ref):
+        self._ops.append(('delete', ref, None, False))
+
+    def commit(self):
+        if not self._ops:
+            return []
+        self._client._rpc()
+        with self._client._lock:
+            # ব্যাচ অ্যাটমিক: আগে যাচাই, তারপর প্রয়োগ, যাতে একটি ব্যর্থ হলে কোনোটিই না বসে
+            exists = {}
+            for op, ref, data, merge in self._ops:
+                present = exists.get(ref.path, ref.path in self._client._data)
+                if op == 'update' and not present:
+                    raise KeyError(f"No document to update: {ref.path}")
+                exists[ref.path] = op != 'delete'
+            for op, ref, data, merge in self._ops:
+                if op == 'delete':
+                    self._client._delete(ref.path)
+                else:
+                    self._client._write(ref.path, data, merge=merge, must_exist=(op == 'update'))
+        self._ops = []
+        return []
+
+    def __len__(self):
+        return len(self._ops)
+
+
+def install(repository, latency=0.0):
+    """repository মডিউলকে এই ফেক ক্লায়েন্টে চালায়। ফেক ট্রানজ্যাকশন সিরিয়ালাইজড।"""
+    client = FakeFirestore(latency=latency)
+    repository.db = client
+    repository._run_transaction = client.run_transaction
+    return client
@@ -0,0 +1,77 @@
+"""বেঞ্চমার্কের জন্য নেটওয়ার্কহীন Bot API ট্রান্সপোর্ট।
+
+`Application.builder().request(...)` এ দিলে বট আসল টেলিগ্রাম সার্ভারের বদলে
+এখান থেকে উত্তর পায়। প্রতিটি মেথডের জন্য ন্যূনতম বৈধ JSON ফেরত দেয়, যাতে
+PTB সেটাকে Message/ChatMember ইত্যাদিতে পার্স করতে পারে। `latency` দিলে
+প্রতিটি কল সেই পরিমাণ সময় (async) অপেক্ষা করে।
+"""
+import json
+import time
+import asyncio
+import itertools
+from collections import Counter
+
+from telegram.request import BaseRequest
+
+from metrics import record_telegram
+
+BOT_USER = {"id": 777000111, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+
+
+def user_dict(user_id, first_name=None, username=None):
+    return {"id": user_id, "is_bot": False, "first_name": first_name or f"U{user_id}", "username": username or f"user{user_id}"}
+
+
+def chat_dict(chat_id):
+    chat_id = int(chat_id)
+    return {"id": chat_id, "type": "private" if chat_id > 0 else "supergroup"}
+
+
+class FakeRequest(BaseRequest):
+    def __init__(self, latency=0.0, admins=()):
+        self.latency = latency
+        self.admins = list(admins)
+        self.calls = Counter()
+        self._message_ids = itertools.count(1)
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _message(self, params):
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": chat_dict(params.get("chat_id", BOT_USER["id"])),
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+
+    def _result(self, method, params):
+        if method == "getMe":
+            return BOT_USER
+        if method in ("sendMessage", "editMessageText", "copyMessage", "forwardMessage"):
+            return self._message(params)
+        if method == "getChatAdministrators":
+            return [{"status": "creator", "user": user_dict(admin_id), "is_anonymous": False} for admin_id in self.admins]
+        if method == "getChatMember":
+            return {"status": "member", "user": user_dict(int(params["user_id"]))}
+        return True
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None, write_timeout=None,
+                         connect_timeout=None, pool_timeout=None):
+        started = time.perf_counter()
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        params = request_data.parameters if request_data is not None else {}
+        body = json.dumps({"ok": True, "result": self._result(api_method, params)}).encode()
+        record_telegram(api_method, time.perf_counter() - started)
+        return 200, body
@@ -0,0 +1,80 @@
+"""একটি সাবমিশনে একসাথে অনেক অ্যাডমিন ক্লিক: রিওয়ার্ড ঠিক একবার যায় কিনা।
+
+    python benchmarks/load_approvals.py --clicks 50 --rounds 20
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/load_approvals.py --emulator
+
+প্রতি রাউন্ডে একটি নতুন pending সাবমিশন তৈরি হয় এবং N টি approve/reject
+কল একসাথে ছাড়া হয়। যাচাই: ঠিক একটি কল সফল, ব্যালেন্স ও system/stats এ
+রিওয়ার্ড সর্বোচ্চ একবার যোগ হয়েছে।
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_admin import firestore
+
+import repository
+from models import Submission
+from config import COLLECTION_USERS
+from fake_firestore import install
+
+USER_ID = 515151
+REWARD = 5.0
+
+
+async def _round(clicks):
+    sub_id = await repository.add_submission(Submission(user_id=USER_ID, type='review_data', submitted_at=firestore.SERVER_TIMESTAMP))
+    before = await repository.get_balance(USER_ID)
+    calls = [repository.review_submission(sub_id, random.random() < 0.7, f"admin{i}") for i in range(clicks)]
+    outcomes = await asyncio.gather(*calls)
+    after = await repository.get_balance(USER_ID)
+
+    winners = [o for o in outcomes if o['status'] == 'ok']
+    assert len(winners) == 1, f"{len(winners)} clicks processed submission {sub_id}"
+    assert after - before == winners[0]['reward'], "reward credited more than once"
+    return winners[0]['reward']
+
+
+async def _load(clicks, rounds):
+    await repository.run_sync("write", 
+        repository.db.collection(COLLECTION_USERS).document(str(USER_ID)).set, {'user_id': USER_ID, 'balance': 0.0}
+    )
+    await repository.update_system_config('task_reward', REWARD)
+    stats_before = await repository.run_sync("read", repository._stats_ref().get)
+    stats_before = (stats_before.to_dict() or {}).get('total_balance', 0.0) if stats_before.exists else 0.0
+
+    started = time.perf_counter()
+    credited = 0.0
+    for _ in range(rounds):
+        credited += await _round(clicks)
+    elapsed = time.perf_counter() - started
+
+    stats_after = (await repository.run_sync("read", repository._stats_ref().get)).to_dict().get('total_balance', 0.0)
+    assert stats_after - stats_before == credited, "system/stats drifted from credited rewards"
+    print(f"rounds={rounds} clicks/round={clicks} credited={credited:.2f} elapsed={elapsed:.2f}s")
+    print("OK: exactly one reward per submission")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clicks", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--emulator", action="store_true", help="FIRESTORE_EMULATOR_HOST এ চলা আসল ফায়ারস্টোর এমুলেটর ব্যবহার")
+    args = parser.parse_args()
+
+    if args.emulator:
+        from google.cloud import firestore as gcf
+        repository.db = gcf.Client(project=os.getenv("GCLOUD_PROJECT", "demo-stress"))
+    else:
+        install(repository, latency=0.002)
+    asyncio.run(_load(args.clicks, args.rounds))
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""পুরো বট অফলাইনে: কৃত্রিম আপডেট process_update দিয়ে চালিয়ে থ্রুপুট ও লেটেন্সি।
+
+    python benchmarks/replay_updates.py --users 500 --concurrency 8
+    python benchmarks/replay_updates.py --users 200 --latency 0.005 --tg-latency 0.03
+
+`bot.build_application` দিয়ে আসল হ্যান্ডলারসহ অ্যাপ বানানো হয়, শুধু Bot API
+ট্রান্সপোর্ট (fake_telegram) আর ফায়ারস্টোর (fake_firestore) ইন-মেমরি। প্রতি
+ইউজারের সেশন: /start, মেনু callback, রিভিউ সাবমিশনের ৪ ধাপ, কিছু সাপোর্ট গ্রুপ
+মেসেজ; শেষে অ্যাডমিন সব pending সাবমিশন approve/reject করে।
+
+একই ইউজারের আপডেট সবসময় একই ওয়ার্কারে যায়, তাই উইজার্ডের ক্রম ঠিক থাকে।
+ফলাফল: মোট updates/sec আর প্রতি ধরনের p50/p95/p99।
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ADMIN_ID = 900000001
+os.environ.setdefault("BOT_TOKEN", "123456:BENCH")
+os.environ.setdefault("ADMIN_USER_ID", str(ADMIN_ID))
+os.environ.setdefault("SUPPORT_GROUP_ID", "-1001000000001")
+
+from telegram import Update
+
+import bot
+import metrics
+import repository
+from config import SUPPORT_GROUP_ID, COLLECTION_SUBMISSIONS
+from fake_firestore import install
+from fake_telegram import FakeRequest, user_dict, chat_dict, BOT_USER
+
+GROUP_ID = int(SUPPORT_GROUP_ID)
+
+
+class UpdateFactory:
+    def __init__(self, bot_instance):
+        self.bot = bot_instance
+        self._ids = iter(range(1, 1 << 62))
+
+    def _message(self, user_id, chat_id, text, entities=()):
+        update_id = next(self._ids)
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": chat_dict(chat_id),
+                "from": user_dict(user_id),
+                "text": text,
+                "entities": list(entities),
+            },
+        }
+
+    def command(self, user_id, text):
+        command = text.split()[0]
+        return self._message(user_id, user_id, text, [{"type": "bot_command", "offset": 0, "length": len(command)}])
+
+    def text(self, user_id, text, chat_id=None):
+        entities = []
+        if "https://" in text:
+            offset = text.index("https://")
+            entities.append({"type": "url", "offset": offset, "length": len(text) - offset})
+        return self._message(user_id, chat_id or user_id, text, entities)
+
+    def callback(self, user_id, data, message_text="menu"):
+        update_id = next(self._ids)
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": user_dict(user_id),
+                "chat_instance": "bench",
+                "data": data,
+                "message": {
+                    "message_id": update_id,
+                    "date": int(time.time()),
+                    "chat": chat_dict(user_id),
+                    "from": BOT_USER,
+                    "text": message_text,
+                },
+            },
+        }
+
+    def build(self, kind, raw):
+        return kind, Update.de_json(raw, self.bot)
+
+
+def user_session(factory, user_id, rng, group_messages):
+    """একজন ইউজারের আপডেট, যে ক্রমে আসল ইউজার পাঠায়।"""
+    f = factory
+    referrer = rng.randrange(1, user_id) if user_id > 1 and rng.random() < 0.3 else None
+    yield f.build("start", f.command(user_id, f"/start {referrer}" if referrer else "/start"))
+    for data in rng.sample(["show_account", "info_links_menu", "show_referral_link", "show_guide"], 2):
+        yield f.build("menu", f.callback(user_id, data))
+        yield f.build("menu", f.callback(user_id, "back_to_main"))
+
+    yield f.build("menu", f.callback(user_id, "submit_work"))
+    yield f.build("wizard", f.callback(user_id, "sub_review_data"))
+    for step in (f"https://img.example.com/{user_id}.png", f"u{user_id}@mail.test", f"Reviewer {user_id}", "Pixel 7"):
+        yield f.build("wizard", f.text(user_id, step))
+
+    for i in range(group_messages):
+        text = "https://spam.example.net/free" if rng.random() < 0.1 else f"ভাই কাজ কবে অ্যাপ্রুভ হবে? #{i}"
+        yield f.build("group", f.text(user_id, text, chat_id=GROUP_ID))
+
+
+async def _replay(app, batches, concurrency, latencies):
+    """ইউজার অনুযায়ী ভাগ করে `concurrency` টি ওয়ার্কারে চালায়।"""
+    lanes = [[] for _ in range(concurrency)]
+    for user_id, updates in batches:
+        lanes[hash(user_id) % concurrency].extend(updates)
+
+    async def worker(lane):
+        for kind, update in lane:
+            started = time.perf_counter()
+            await app.process_update(update)
+            latencies.setdefault(kind, []).append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(lane) for lane in lanes))
+    return time.perf_counter() - started, sum(len(lane) for lane in lanes)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _report(title, elapsed, total, latencies):
+    print(f"\n{title}: {total} updates in {elapsed:.2f}s -> {total / elapsed:.0f} updates/sec")
+    print(f"{'kind':>8} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    everything = []
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        everything.extend(values)
+        print(f"{kind:>8} {len(values):>7} {_percentile(values, 0.5) * 1000:>8.2f} "
+              f"{_percentile(values, 0.95) * 1000:>8.2f} {_percentile(values, 0.99) * 1000:>8.2f}")
+    everything.sort()
+    print(f"{'all':>8} {len(everything):>7} {_percentile(everything, 0.5) * 1000:>8.2f} "
+          f"{_percentile(everything, 0.95) * 1000:>8.2f} {_percentile(everything, 0.99) * 1000:>8.2f}")
+
+
+async def _run(args):
+    client = install(repository, latency=args.latency)
+    request = FakeRequest(latency=args.tg_latency, admins=[ADMIN_ID])
+    app = bot.build_application(os.environ["BOT_TOKEN"], request=request)
+    await app.initialize()
+    await bot.on_startup(app)
+
+    rng = random.Random(args.seed)
+    factory = UpdateFactory(app.bot)
+    batches = [
+        (user_id, list(user_session(factory, user_id, rng, args.group_messages)))
+        for user_id in range(1, args.users + 1)
+    ]
+    latencies = {}
+    elapsed, total = await _replay(app, batches, args.concurrency, latencies)
+    _report("users", elapsed, total, latencies)
+
+    pending = await repository.run_sync("read", 
+        lambda: [doc.id for doc in client.collection(COLLECTION_SUBMISSIONS).where("status", "==", "pending").stream()]
+    )
+    approvals = [
+        factory.build("approve", factory.callback(ADMIN_ID, f"adm_{'app' if rng.random() < 0.8 else 'rej'}_{sub_id}", "submission"))
+        for sub_id in pending
+    ]
+    approval_latencies = {}
+    elapsed, total = await _replay(app, [(ADMIN_ID, approvals)], 1, approval_latencies)
+    _report("admin", elapsed, total, approval_latencies)
+
+    summary = metrics.summary()
+    print(f"\nper update: firestore calls {summary['firestore_per_update']:.2f}, "
+          f"telegram calls {summary['telegram_per_update']:.2f}, errors {summary['errors']}")
+    print(f"firestore rpcs={client.rpc_count} telegram calls={sum(request.calls.values())}")
+
+    await bot.on_shutdown(app)
+    await app.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--group-messages", type=int, default=3, help="প্রতি ইউজারের সাপোর্ট গ্রুপ মেসেজ")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="প্রতি ফায়ারস্টোর RPC এর সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--tg-latency", type=float, default=0.0, help="প্রতি Bot API কলের সিমুলেটেড লেটেন্সি (সেকেন্ড)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # bot.py ইমপোর্টের সময় INFO লগিং চালু করে; বেঞ্চমার্কে শুধু সতর্কবার্তা
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""উইথড্র পাইপলাইনে ডাবল-স্পেন্ড হয় কিনা তার কনকারেন্সি স্ট্রেস টেস্ট।
+
+    python benchmarks/stress_withdrawals.py --requests 200
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python benchmarks/stress_withdrawals.py --emulator
+
+একজন ইউজারের ব্যালেন্সের চেয়ে অনেক বেশি উইথড্র একসাথে পাঠানো হয়, সাথে একই
+আইডেমপোটেন্সি কী দিয়ে ডুপ্লিকেট, এবং প্রতিটি উইথড্রতে একসাথে পে ও রিফান্ড
+ক্লিক। শেষে যাচাই করা হয় ব্যালেন্স কখনো ঋণাত্মক হয়নি, টাকার হিসাব মেলে এবং
+প্রতিটি উইথড্র ঠিক একবার প্রসেস হয়েছে।
+"""
+import os
+import sys
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from firebase_admin import firestore
+
+import repository
+from models import Withdrawal
+from config import COLLECTION_USERS
+from fake_firestore import install
+
+USER_ID = 424242
+START_BALANCE = 1000.0
+AMOUNT = 30.0
+
+
+def _use_emulator():
+    from google.cloud import firestore as gcf
+    repository.db = gcf.Client(project=os.getenv("GCLOUD_PROJECT", "demo-stress"))
+
+
+async def _stress(requests):
+    users = repository.db.collection(COLLECTION_USERS)
+    await repository.run_sync("write", users.document(str(USER_ID)).set, {'user_id': USER_ID, 'balance': START_BALANCE})
+
+    keys = [f"stress{i:05d}" for i in range(requests)]
+    w_data = lambda: Withdrawal(user_id=USER_ID, amount=AMOUNT, method='Bkash', target='01700000000', time=firestore.SERVER_TIMESTAMP)
+    # প্রতিটি কী দুবার: ডুপ্লিকেট মেসেজ/ওয়েবহুক রিট্রাই
+    results = await asyncio.gather(*(repository.create_withdrawal(key, w_data()) for key in keys + keys))
+
+    created = [r for r in results if r['status'] == 'created']
+    duplicates = [r for r in results if r['status'] == 'duplicate']
+    insufficient = [r for r in results if r['status'] == 'insufficient']
+    balance = await repository.get_balance(USER_ID)
+    print(f"created={len(created)} duplicate={len(duplicates)} insufficient={len(insufficient)} balance={balance:.2f}")
+
+    assert balance >= 0, "balance went negative"
+    assert len(created) == int(START_BALANCE // AMOUNT), "wrong number of withdrawals accepted"
+    assert balance == START_BALANCE - len(created) * AMOUNT, "balance does not match accepted withdrawals"
+
+    # প্রতিটি উইথড্রতে একসাথে দুই অ্যাডমিনের পে এবং রিফান্ড ক্লিক
+    accepted = []
+    for key in keys:
+        doc = await repository.get_withdrawal(key)
+        if doc is not None:
+            accepted.append(key)
+    clicks = []
+    for key in accepted:
+        clicks += [repository.mark_withdrawal_paid(key, 'a1'), repository.reject_withdrawal(key, 'a2'), repository.reject_withdrawal(key, 'a3')]
+    random.shuffle(clicks)
+    outcomes = await asyncio.gather(*clicks)
+    transitions = sum(1 for o in outcomes if o['status'] == 'ok')
+    refunds = sum(o['data'].get('amount', 0) for o in outcomes if o['status'] == 'ok' and o.get('refunded'))
+
+    final_balance = await repository.get_balance(USER_ID)
+    print(f"transitions={transitions}/{len(accepted)} refunded={refunds:.2f} final_balance={final_balance:.2f}")
+    assert transitions == len(accepted), "a withdrawal was processed more than once (or not at all)"
+    assert final_balance == balance + refunds, "refunds do not match balance"
+    print("OK: no double-spend")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--emulator", action="store_true", help="FIRESTORE_EMULATOR_HOST এ চলা আসল ফায়ারস্টোর এমুলেটর ব্যবহার")
+    args = parser.parse_args()
+
+    if args.emulator:
+        _use_emulator()
+    else:
+        install(repository)
+    asyncio.run(_stress(args.requests))
+    repository.shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import time
+import asyncio
+import logging
+
+from telegram.error import RetryAfter, Forbidden, BadRequest, TimedOut, NetworkError
+
+from config import BROADCAST_RATE, BROADCAST_CONCURRENCY, BROADCAST_PAGE_SIZE, CHAT_SEND_RATE, GROUP_SEND_RATE
+from repository import iter_user_pages, get_broadcast, update_broadcast, get_running_broadcast_ids, get_running_jobs
+from jobs import job_manager
+
+logger = logging.getLogger(__name__)
+
+MAX_SEND_ATTEMPTS = 3
+PROGRESS_INTERVAL = 5.0
+
+
+class TokenBucket:
+    """সেকেন্ডে `rate` টি টোকেন, সর্বোচ্চ `capacity` জমা থাকে।
+
+    টেলিগ্রাম RetryAfter দিলে pause() পুরো বাকেট থামিয়ে দেয়, কারণ ফ্লাড
+    লিমিট পুরো বটের উপর প্রযোজ্য, শুধু একটি চ্যাটের উপর নয়।
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ChatLimiter:
+    """প্রতি চ্যাটের আলাদা TokenBucket।
+
+    গ্লোবাল বাকেট পুরো বটের হার সামলায়, কিন্তু টেলিগ্রাম একই চ্যাটেও সীমা
+    রাখে: প্রাইভেট চ্যাটে সেকেন্ডে ~১টি, গ্রুপে (নেগেটিভ chat_id বা @username)
+    মিনিটে ২০টি। যে বাকেট আবার পুরো ভরে গেছে সেটা নতুন বাকেটের মতোই, তাই
+    চ্যাটের সংখ্যা max_chats ছাড়ালে সেগুলো মুছে ফেলা হয়; ব্রডকাস্টে লাখো
+    চ্যাট গেলেও ডিক্ট বড় হয় না।
+    """
+
+    def __init__(self, rate=CHAT_SEND_RATE, group_rate=GROUP_SEND_RATE, max_chats=1000):
+        self.rate = rate
+        self.group_rate = group_rate
+        self.max_chats = max_chats
+        self._prune_at = max_chats
+        self._buckets = {}
+
+    @staticmethod
+    def _key(chat_id):
+        try:
+            return int(chat_id)
+        except (TypeError, ValueError):
+            return chat_id
+
+    def _prune(self):
+        now = time.monotonic()
+        for key, bucket in list(self._buckets.items()):
+            idle = now - bucket._updated >= bucket.capacity / bucket.rate
+            if idle and not bucket._lock.locked():
+                del self._buckets[key]
+        # সব বাকেট ব্যস্ত থাকলে প্রতিটি নতুন চ্যাটে আবার পুরো স্ক্যান না করতে
+        self._prune_at = max(self.max_chats, 2 * len(self._buckets))
+
+    async def acquire(self, chat_id):
+        key = self._key(chat_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._prune_at:
+                self._prune()
+            is_group = not isinstance(key, int) or key < 0
+            # capacity=1: একই চ্যাটে বার্স্ট নয়, সমান ফাঁকে
+            bucket = self._buckets[key] = TokenBucket(self.group_rate if is_group else self.rate, capacity=1)
+        await bucket.acquire()
+
+
+# টেলিগ্রামের ফ্লাড লিমিট পুরো বটের জন্য, তাই ব্রডকাস্ট ও অ্যাডমিন নোটিফিকেশন একই বাকেট শেয়ার করে
+telegram_bucket = TokenBucket(BROADCAST_RATE)
+# একই চ্যাটে পরপর মেসেজ (যেমন একজন অ্যাডমিনকে অনেক নোটিফিকেশন) এর সীমা
+chat_limiter = ChatLimiter()
+
+
+def _retry_after_seconds(error):
+    delay = error.retry_after
+    return delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+
+
+async def send_with_retry(bot, bucket, chat_id, text, **kwargs):
+    """একটি মেসেজ পাঠায়। ফলাফল: 'sent', 'blocked' বা 'failed'।
+
+    আগে chat_id এর নিজের বাকেট, তারপর গ্লোবাল বাকেট; উল্টো হলে একটি ব্যস্ত
+    চ্যাটের অপেক্ষায় গ্লোবাল টোকেন নষ্ট হতো।
+    """
+    for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+        await chat_limiter.acquire(chat_id)
+        await bucket.acquire()
+        try:
+            await bot.send_message(chat_id, text, **kwargs)
+            return 'sent'
+        except RetryAfter as e:
+            delay = _retry_after_seconds(e)
+            logger.warning(f"Flood limit hit, pausing sends for {delay}s")
+            bucket.pause(delay)
+        except Forbidden:
+            return 'blocked'
+        except BadRequest as e:
+            logger.info(f"Send to {chat_id} rejected: {e}")
+            return 'failed'
+        except (TimedOut, NetworkError) as e:
+            logger.warning(f"Send to {chat_id} failed (attempt {attempt}): {e}")
+            await asyncio.sleep(2 ** attempt)
+    return 'failed'
+
+
+class _Progress:
+    def __init__(self, bot, chat_id, message_id):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self._last = 0.0
+
+    async def report(self, counts, final=False, failed=False):
+        if self.chat_id is None or self.message_id is None:
+            return
+        now = time.monotonic()
+        if not final and now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+        if failed:
+            header = "⚠️ ব্রডকাস্ট ত্রুটির কারণে থেমে গেছে"
+        else:
+            header = "✅ ব্রডকাস্ট সম্পন্ন" if final else "📢 ব্রডকাস্ট চলছে..."
+        text = (
+            f"{header}\n\n"
+            f"✉️ পাঠানো: {counts['sent']}\n"
+            f"🚫 ব্লক করেছে: {counts['blocked']}\n"
+            f"❌ ব্যর্থ: {counts['failed']}"
+        )
+        try:
+            await self.bot.edit_message_text(text, chat_id=self.chat_id, message_id=self.message_id)
+        except BadRequest:
+            # একই টেক্সট আবার এডিট করলে টেলিগ্রাম BadRequest দেয়
+            pass
+        except Exception as e:
+            logger.warning(f"Broadcast progress update failed: {e}")
+
+
+async def run_broadcast(bot, broadcast_id, on_page=None):
+    """ফায়ারস্টোরে সংরক্ষিত কার্সর থেকে ব্রডকাস্ট চালায়/আবার শুরু করে।
+
+    প্রতিটি পেজ পুরো পাঠানো হলে কার্সর ও কাউন্ট সেভ হয় এবং `on_page(counts)`
+    ডাকা হয়। প্রসেস মাঝপথে বন্ধ হলে শেষ অসম্পূর্ণ পেজটি আবার পাঠানো হয়
+    (at-least-once)। ফলাফল: শেষ কাউন্ট, অথবা চালানোর মতো না থাকলে None।
+    """
+    job = await get_broadcast(broadcast_id)
+    if job is None or job.get('status') != 'running':
+        return None
+
+    counts = {k: job.get(k, 0) for k in ('sent', 'failed', 'blocked')}
+    saved_counts = dict(counts)
+    cursor = job.get('cursor')
+    text = f"📢 <b>নোটিশ:</b>\n{job['text']}"
+    bucket = telegram_bucket
+    progress = _Progress(bot, job.get('progress_chat_id'), job.get('progress_message_id'))
+
+    async def worker(queue):
+        while True:
+            chat_id = await queue.get()
+            try:
+                result = await send_with_retry(bot, bucket, chat_id, text, parse_mode='HTML')
+            except Exception as e:
+                logger.error(f"Broadcast send to {chat_id} error: {e}")
+                result = 'failed'
+            try:
+                counts[result] += 1
+                await progress.report(counts)
+            finally:
+                queue.task_done()
+
+    queue = asyncio.Queue(maxsize=BROADCAST_CONCURRENCY * 2)
+    workers = [asyncio.create_task(worker(queue)) for _ in range(BROADCAST_CONCURRENCY)]
+    try:
+        async for page in iter_user_pages(('user_id',), BROADCAST_PAGE_SIZE, cursor):
+            for doc_id, data in page:
+                await queue.put(data.get('user_id', doc_id))
+            await queue.join()
+            cursor = page[-1][0]
+            saved_counts = dict(counts)
+            await update_broadcast(broadcast_id, {'cursor': cursor, **saved_counts})
+            if on_page is not None:
+                await on_page(saved_counts)
+
+        await update_broadcast(broadcast_id, {'status': 'done', **counts})
+        await progress.report(counts, final=True)
+        logger.info(f"Broadcast {broadcast_id} finished: {counts}")
+        return counts
+    except Exception as e:
+        # শেষ সম্পূর্ণ পেজের কার্সর ও কাউন্টই সঠিক; বাতিল (CancelledError) হলে স্ট্যাটাস running থাকে, তাই রিস্টার্টে আবার চলবে
+        logger.error(f"Broadcast {broadcast_id} error: {e}")
+        await update_broadcast(broadcast_id, {'status': 'failed', 'error': str(e), 'cursor': cursor, **saved_counts})
+        await progress.report(counts, final=True, failed=True)
+        raise
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+@job_manager.register("broadcast", resumable=True)
+async def broadcast_job(ctx):
+    broadcast_id = ctx.params['broadcast_id']
+    try:
+        counts = await run_broadcast(ctx.bot, broadcast_id, on_page=ctx.progress)
+    except asyncio.CancelledError:
+        if ctx.cancel_requested:
+            await update_broadcast(broadcast_id, {'status': 'cancelled'})
+        raise
+    return counts
+
+
+async def adopt_orphan_broadcasts():
+    """জব সিস্টেমের আগে শুরু হওয়া (জব ছাড়া) running ব্রডকাস্টগুলোকে জব হিসেবে চালু করে।"""
+    try:
+        owned = {job.get('params', {}).get('broadcast_id') for _, job in await get_running_jobs() if job.get('kind') == 'broadcast'}
+        for broadcast_id in await get_running_broadcast_ids():
+            if broadcast_id not in owned:
+                logger.info(f"Adopting broadcast {broadcast_id} as a job")
+                broadcast = await get_broadcast(broadcast_id) or {}
+                await job_manager.submit("broadcast", {'broadcast_id': broadcast_id}, broadcast.get('admin_id'))
+    except Exception as e:
+        logger.error(f"Broadcast resume error: {e}")
@@ -0,0 +1,75 @@
+import time
+import asyncio
+
+
+class TTLCache:
+    """ছোট ইন-প্রসেস ক্যাশ: প্রতিটি কী নির্দিষ্ট সময় (ttl) পর্যন্ত বৈধ থাকে।
+
+    `version` প্রতিবার invalidate হলে বাড়ে। প্রতিটি কী-এর নিজস্ব সংস্করণ
+    (version_of) নতুন মান বসলে বা মুছলে বাড়ে, তাই এর উপর নির্ভর করা অন্য
+    মেমোইজেশন (যেমন রেন্ডার করা কিবোর্ড) সহজেই পুরনো ডাটা চিনতে পারে।
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+        self._entries = {}
+        self._locks = {}
+        self._key_versions = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def _bump(self, key):
+        self._key_versions[key] = self._key_versions.get(key, 0) + 1
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._bump(key)
+
+    def invalidate(self, key=None):
+        if key is None:
+            for cached_key in list(self._entries):
+                self._bump(cached_key)
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+            self._bump(key)
+        self.version += 1
+
+    def version_of(self, key):
+        return self._key_versions.get(key, 0)
+
+    async def get_or_load(self, key, loader):
+        found, value = self.get(key)
+        if found:
+            return value
+        # একই কী-র জন্য একসাথে অনেক মিস হলে লোডার একবারই চলে
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            version = self.version
+            value = await loader()
+            # লোডের মাঝে invalidate হলে পুরনো মান ক্যাশে রাখা হবে না
+            if version == self.version:
+                self.set(key, value)
+            return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+            "size": len(self._entries),
+            "version": self.version,
+        }
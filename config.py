@@ -0,0 +1,145 @@
+import os
+
+# ==========================================
+# কনফিগারেশন এবং কনস্ট্যান্ট
+# ==========================================
+
+# এনভায়রনমেন্ট ভেরিয়েবল
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+ADMIN_USER_ID_STR = os.getenv("ADMIN_USER_ID")  # সুপার অ্যাডমিন
+SUPPORT_GROUP_ID = os.getenv("SUPPORT_GROUP_ID", "-1002337825231")
+FIREBASE_JSON = os.getenv("FIREBASE_SERVICE_ACCOUNT")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+PORT = int(os.environ.get('PORT', 8080))
+REALTIME_DATABASE_URL = "https://telegram-bot-skyzone-it-default-rtdb.firebaseio.com"
+
+# ফায়ারস্টোর থ্রেড পুল (সিঙ্ক ক্লায়েন্টের কল ইভেন্ট লুপের বাইরে চলে)
+FIRESTORE_MAX_WORKERS = int(os.getenv("FIRESTORE_MAX_WORKERS", 16))
+
+# users কালেকশন স্ক্যানের (ব্রডকাস্ট, রিকনসাইল) পেজ সাইজ
+USER_PAGE_SIZE = int(os.getenv("USER_PAGE_SIZE", 500))
+
+# system/config ও system/ui_config এর ইন-মেমরি ক্যাশ (সেকেন্ড)
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", 300))
+# অ্যাডমিন তালিকার ইন-মেমরি কপি কতক্ষণ পর ব্যাকগ্রাউন্ডে রিফ্রেশ হবে (সেকেন্ড)
+ADMIN_ROSTER_TTL = float(os.getenv("ADMIN_ROSTER_TTL", 300))
+# চালু থাকলে ফায়ারস্টোর স্ন্যাপশট লিসেনার দিয়ে অন্য রেপ্লিকার পরিবর্তন (কনফিগ, অ্যাডমিন) সাথে সাথে মেমরিতে আসে
+FIRESTORE_LISTENERS = os.getenv("FIRESTORE_LISTENERS", "0") == "1"
+
+# কথোপকথন স্টেট স্টোর: "firestore" (ডিফল্ট) বা লোকাল টেস্টের জন্য "sqlite"
+STATE_BACKEND = os.getenv("STATE_BACKEND", "firestore")
+STATE_SQLITE_PATH = os.getenv("STATE_SQLITE_PATH", "state.db")
+STATE_CACHE_SIZE = int(os.getenv("STATE_CACHE_SIZE", 10000))
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", 2.0))
+
+# সাপোর্ট গ্রুপে একই ইউজারকে আবার অটো-রিপ্লাই দেওয়ার আগে বিরতি (সেকেন্ড) ও মেমরিতে কতজন থাকবে
+GROUP_REPLY_COOLDOWN = float(os.getenv("GROUP_REPLY_COOLDOWN", 24 * 3600))
+GROUP_COOLDOWN_CACHE_SIZE = int(os.getenv("GROUP_COOLDOWN_CACHE_SIZE", 50000))
+
+# সাপোর্ট গ্রুপের অ্যাডমিন তালিকা কতক্ষণ পর পর টেলিগ্রাম থেকে রিফ্রেশ হবে (সেকেন্ড)
+GROUP_ADMIN_TTL = float(os.getenv("GROUP_ADMIN_TTL", 600))
+
+# একসাথে কতগুলো আপডেট প্রসেস হবে (একই ইউজারের আপডেট সবসময় ক্রমানুসারে) ও সর্বোচ্চ কতগুলো অপেক্ষায় থাকতে পারে
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", 32))
+UPDATE_MAX_PENDING = int(os.getenv("UPDATE_MAX_PENDING", 1024))
+
+# ব্যালেন্স/কাউন্টারের ছোট লেখাগুলো কতক্ষণ (সেকেন্ড) জমিয়ে একটি ব্যাচে কমিট হবে, আর এক ব্যাচে সর্বোচ্চ কতগুলো (ফায়ারস্টোরের সীমা ৫০০)
+WRITE_BATCH_INTERVAL = float(os.getenv("WRITE_BATCH_INTERVAL", 0.005))
+WRITE_BATCH_MAX_OPS = int(os.getenv("WRITE_BATCH_MAX_OPS", 400))
+
+# অ্যাডমিন রিভিউ কিউ: প্রতি স্ক্রিনে কতগুলো pending সাবমিশন, আর বাল্ক রিভিউয়ে প্রতি ট্রানজ্যাকশনে কতগুলো (প্রতিটিতে সর্বোচ্চ ২×চাঙ্ক+১ লেখা, সীমা ৫০০)
+REVIEW_QUEUE_PAGE_SIZE = int(os.getenv("REVIEW_QUEUE_PAGE_SIZE", 5))
+REVIEW_BULK_CHUNK = int(os.getenv("REVIEW_BULK_CHUNK", 100))
+
+# রেফারেল বোনাস: কতক্ষণ (সেকেন্ড) জমিয়ে একবারে কতগুলো প্রসেস হবে, আর অ্যাবিউজ রুল
+REFERRAL_BATCH_SIZE = int(os.getenv("REFERRAL_BATCH_SIZE", 50))
+REFERRAL_BATCH_INTERVAL = float(os.getenv("REFERRAL_BATCH_INTERVAL", 1.0))
+# একজন রেফারার REFERRAL_VELOCITY_WINDOW সেকেন্ডে সর্বোচ্চ কতগুলো বোনাস পাবে
+REFERRAL_VELOCITY_LIMIT = int(os.getenv("REFERRAL_VELOCITY_LIMIT", 20))
+REFERRAL_VELOCITY_WINDOW = float(os.getenv("REFERRAL_VELOCITY_WINDOW", 3600))
+# এর চেয়ে নতুন (সেকেন্ড) অ্যাকাউন্টের রেফারেলে বোনাস নেই
+REFERRAL_MIN_ACCOUNT_AGE = float(os.getenv("REFERRAL_MIN_ACCOUNT_AGE", 600))
+
+# ব্রডকাস্ট: টেলিগ্রামের গ্লোবাল সীমা ~৩০ মেসেজ/সেকেন্ড
+BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", 25))
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", 20))
+BROADCAST_PAGE_SIZE = int(os.getenv("BROADCAST_PAGE_SIZE", 200))
+# প্রতি চ্যাটের সীমা: একই চ্যাটে ~১ মেসেজ/সেকেন্ড, গ্রুপে ২০ মেসেজ/মিনিট
+CHAT_SEND_RATE = float(os.getenv("CHAT_SEND_RATE", 1))
+GROUP_SEND_RATE = float(os.getenv("GROUP_SEND_RATE", 20 / 60))
+
+# নতুন সাবমিশন/উইথড্রর অ্যাডমিন নোটিফিকেশন একসাথে কতজনকে পাঠানো হবে
+NOTIFY_CONCURRENCY = int(os.getenv("NOTIFY_CONCURRENCY", 10))
+
+# ডিফল্ট কনফিগারেশন (UI এবং টেক্সট)
+DEFAULT_UI_CONFIG = {
+    "btn_review_gen": {"text": "🌐 রিভিউ জেনারেটর", "url": "https://sites.google.com/view/review-generator/home", "show": True},
+    "btn_submit_work": {"text": "💰 কাজ জমা দিন", "show": True},
+    "btn_balance": {"text": "📈 ব্যালেন্স", "show": True},
+    "btn_withdraw": {"text": "💸 উত্তোলন (Withdraw)", "show": True},
+    "btn_info": {"text": "ℹ️ তথ্য দেখুন", "show": True},
+    "btn_refer": {"text": "👥 রেফার করুন", "show": True},
+    "btn_guide": {"text": "📚 ভিডিও দেখে কাজ শিখুন", "show": True},
+    "btn_support": {"text": "💬 সাপোর্ট", "show": True},
+    "custom_buttons": [],
+    "btn_sub_review": {"text": "📋 রিভিউ তথ্য জমা", "show": True},
+    "btn_sub_market": {"text": "🔗 মার্কেটিং লিংক জমা", "show": True},
+    "link_fb_group": {"text": "ফেসবুক গ্রুপ", "url": "https://www.facebook.com/groups/1853319645292519/?ref=share&mibextid=NSMWBT", "show": True},
+    "link_fb_page": {"text": "ফেসবুক পেজ", "url": "https://www.facebook.com/share/1BX4LQfrq9/", "show": True},
+    "link_yt": {"text": "ইউটিউব চ্যানেল", "url": "https://youtube.com/@af.mdshakil?si=QoHvBxpnY4-laCQi", "show": True},
+    "link_tg_channel": {"text": "টেলিগ্রাম চ্যানেল", "url": "https://t.me/Skyzone_IT", "show": True},
+    "link_tg_group": {"text": "টেলিগ্রাম গ্রুপ", "url": "https://t.me/Skyzone_IT_chat", "show": True},
+    "link_tg_payment": {"text": "পেমেন্ট চ্যানেল", "url": "https://t.me/brotheritltd", "show": True},
+    "link_website": {"text": "🌐 ওয়েবসাইট", "url": "https://brotheritltd.com", "show": True},
+    "link_support": {"text": "👨‍💻 সাপোর্ট (অ্যাডমিন)", "url": "https://t.me/AfMdshakil", "show": True},
+    "text_guide_content": {"text": "📚 <b>কাজের নিয়মাবলী:</b>\n\n১. লিংক থেকে কাজ সম্পন্ন করুন।\n২. সঠিক প্রমাণ জমা দিন।\n৩. অ্যাডমিন চেক করে পেমেন্ট করবে।", "show": True}
+}
+
+# কালেকশন নাম
+COLLECTION_USERS = "users"
+COLLECTION_SUBMISSIONS = "submissions"
+COLLECTION_WITHDRAWALS = "withdrawals"
+COLLECTION_ADMINS = "admins"
+COLLECTION_BROADCASTS = "broadcasts"
+COLLECTION_JOBS = "jobs"
+COLLECTION_REFERRALS = "referrals"
+COLLECTION_GROUP_ACTIVITY = "group_activity"
+DOC_SYSTEM_CONFIG = "config"
+DOC_UI_CONFIG = "ui_config"
+DOC_SYSTEM_STATS = "stats"
+
+# উইথড্র মাধ্যম: কলব্যাক/ফিল্টারের ছোট হাতের কী → উইথড্র ডকে সংরক্ষিত নাম
+WITHDRAW_METHODS = {"bkash": "Bkash", "nagad": "Nagad", "binance": "Binance"}
+
+# ফ্লো স্টেটস
+STATE_IDLE = 0
+STATE_SUB_SELECT_TYPE = 10
+STATE_SUB_MARKET_LINK = 11
+STATE_SUB_AWAITING_REVIEW_DATA = 12
+STATE_SUB_AWAITING_LINK = 13
+STATE_SUB_AWAITING_EMAIL = 14
+STATE_SUB_AWAITING_NAME = 15
+STATE_SUB_AWAITING_DEVICE = 16
+
+STATE_WITHDRAW_AWAITING_AMOUNT = 20
+STATE_WITHDRAW_AWAITING_METHOD = 21
+STATE_WITHDRAW_AWAITING_NUMBER = 22
+
+STATE_ADMIN_AWAITING_BALANCE_USER_ID = 30
+STATE_ADMIN_AWAITING_BALANCE_AMOUNT = 31
+STATE_ADMIN_AWAITING_REFER_BONUS = 40
+STATE_ADMIN_AWAITING_BROADCAST_MESSAGE = 50
+STATE_ADMIN_AWAITING_TASK_REWARD = 60
+STATE_ADMIN_ADD_ADMIN_ID = 70
+STATE_ADMIN_REMOVE_ADMIN_ID = 71
+STATE_ADMIN_USER_ACTION_ID = 80
+STATE_ADMIN_EDIT_UI_TEXT = 90
+STATE_ADMIN_EDIT_UI_URL = 91
+STATE_ADMIN_EDIT_GUIDE_TEXT = 92
+STATE_ADMIN_ADD_CUSTOM_BTN_TEXT = 100
+STATE_ADMIN_ADD_CUSTOM_BTN_URL = 101
+STATE_ADMIN_REPLY_ID = 110
+STATE_ADMIN_REPLY_MSG = 111
+STATE_ADMIN_EDIT_LINK_ALLOW = 120
+STATE_ADMIN_EDIT_LINK_BLOCK = 121
+STATE_ADMIN_BULK_INPUT = 130
@@ -0,0 +1,113 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class CooldownTracker:
+    """প্রতি ইউজারের শেষ অটো-রিপ্লাইয়ের সময় মেমরিতে রাখে (LRU, O(1) লুকআপ)।
+
+    কোনো ইউজারকে প্রথমবার দেখলে ব্যাকএন্ড থেকে একবার লোড হয় (lazy warm),
+    এরপর সব সিদ্ধান্ত মেমরি থেকে। নতুন রিপ্লাইয়ের সময় `flush_interval`
+    সেকেন্ড পর পর একসাথে ব্যাকএন্ডে লেখা হয়।
+    """
+
+    def __init__(self, backend, period, capacity=10000, flush_interval=2.0):
+        self.backend = backend
+        self.period = period
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        # user_id -> শেষ রিপ্লাইয়ের epoch সেকেন্ড (0 = কখনো না)
+        self._entries = OrderedDict()
+        self._dirty = {}
+        self._loading = {}
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    def _remember(self, user_id, replied_at):
+        self._entries[user_id] = replied_at
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    async def _last_reply(self, user_id):
+        replied_at = self._entries.get(user_id)
+        if replied_at is not None:
+            self.hits += 1
+            self._entries.move_to_end(user_id)
+            return replied_at
+        pending = self._dirty.get(user_id)
+        if pending is not None:
+            self.hits += 1
+            return pending[0]
+        self.misses += 1
+        # একই নতুন ইউজারের একসাথে কয়েকটি মেসেজ এলে লোড একবারই হয়
+        task = self._loading.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self.backend.load(user_id))
+            self._loading[user_id] = task
+        try:
+            loaded = await task
+        except Exception as e:
+            logger.warning(f"Cooldown load failed for {user_id}: {e}")
+            loaded = None
+        finally:
+            self._loading.pop(user_id, None)
+        # লোডের মাঝে অন্য মেসেজ রিপ্লাই পেয়ে থাকলে সেটাই নতুন
+        current = self._entries.get(user_id)
+        if current is None:
+            current = loaded or 0.0
+            self._remember(user_id, current)
+        return current
+
+    async def claim(self, user_id, username=None):
+        """রিপ্লাই দেওয়ার সময় হলে True দেয় এবং সাথে সাথে কুলডাউন শুরু করে।"""
+        user_id = str(user_id)
+        replied_at = await self._last_reply(user_id)
+        now = time.time()
+        if now - replied_at <= self.period:
+            return False
+        # চেক আর লেখার মাঝে কোনো await নেই, তাই দুটি মেসেজ একসাথে রিপ্লাই পায় না
+        self._remember(user_id, now)
+        self._dirty[user_id] = (now, username)
+        return True
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            pending, self._dirty = self._dirty, {}
+            try:
+                await self.backend.save_many(pending)
+            except Exception as e:
+                logger.error(f"Cooldown flush error ({len(pending)} users): {e}")
+                for user_id, entry in pending.items():
+                    self._dirty.setdefault(user_id, entry)
+                return 0
+            return len(pending)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "dirty": len(self._dirty)}
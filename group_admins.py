@@ -0,0 +1,64 @@
+import time
+import asyncio
+import logging
+
+from config import SUPPORT_GROUP_ID, GROUP_ADMIN_TTL
+
+logger = logging.getLogger(__name__)
+
+ADMIN_STATUSES = ('administrator', 'creator')
+
+
+class GroupAdminCache:
+    """একটি গ্রুপের অ্যাডমিন আইডিগুলো মেমরিতে রাখে।
+
+    get_chat_administrators দিয়ে পুরো তালিকা লোড হয়, `ttl` সেকেন্ড পর
+    ব্যাকগ্রাউন্ডে রিফ্রেশ হয়, আর ChatMemberUpdated ইভেন্ট এলে সাথে সাথে
+    আপডেট হয়। তাই প্রতি মেসেজে টেলিগ্রাম API কল লাগে না।
+    """
+
+    def __init__(self, chat_id, ttl):
+        self.chat_id = str(chat_id)
+        self.ttl = ttl
+        self._ids = frozenset()
+        self._loaded_at = None
+        self._refresh = None
+
+    async def refresh(self, bot):
+        try:
+            admins = await bot.get_chat_administrators(self.chat_id)
+        except Exception as e:
+            logger.error(f"Group admin fetch error: {e}")
+            return False
+        self._ids = frozenset(member.user.id for member in admins)
+        self._loaded_at = time.monotonic()
+        return True
+
+    def _refresh_in_background(self, bot):
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.get_running_loop().create_task(self.refresh(bot))
+        return self._refresh
+
+    async def is_admin(self, bot, user_id):
+        if self._loaded_at is None:
+            # প্রথম মেসেজ: তালিকা একবার লোড হওয়া পর্যন্ত অপেক্ষা
+            if not await self._refresh_in_background(bot):
+                # লোড ব্যর্থ হলে আগের মতো এই মেসেজের জন্য সরাসরি জিজ্ঞেস করা
+                member = await bot.get_chat_member(self.chat_id, user_id)
+                return member.status in ADMIN_STATUSES
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            self._refresh_in_background(bot)
+        return user_id in self._ids
+
+    def apply_member_update(self, chat_member):
+        """ChatMemberUpdated থেকে একজন সদস্যের অ্যাডমিন স্ট্যাটাস হালনাগাদ করে।"""
+        if str(chat_member.chat.id) != self.chat_id:
+            return
+        member = chat_member.new_chat_member
+        if member.status in ADMIN_STATUSES:
+            self._ids = self._ids | {member.user.id}
+        else:
+            self._ids = self._ids - {member.user.id}
+
+
+group_admins = GroupAdminCache(SUPPORT_GROUP_ID, GROUP_ADMIN_TTL)
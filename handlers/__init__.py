@@ -0,0 +1,2 @@
+# প্রতিটি মডিউল ইমপোর্টের সময় নিজের রুটগুলো router এ রেজিস্টার করে
+from handlers import admin, admin_ui, review, user, work, group
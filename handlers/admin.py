@@ -0,0 +1,583 @@
+import html
+import logging
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes
+
+from config import *
+from repository import (
+    get_cache_stats, get_system_config, get_ui_config, update_ui_element, update_system_config,
+    get_refer_bonus, set_refer_bonus, is_super_admin, is_admin, add_admin, remove_admin,
+    get_total_system_liability, reconcile_system_stats,
+    update_user_state, get_total_users_count, delete_user, toggle_block_user,
+    create_broadcast, review_submission, mark_withdrawal_paid, reject_withdrawal, get_recent_jobs
+)
+import metrics
+from router import router
+from jobs import job_manager
+from referrals import referral_processor
+from link_filter import parse_domain_list
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# অ্যাডমিন প্যানেল
+# ==========================================
+
+async def admin_reply_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user_id = update.effective_user.id
+    if not await is_admin(user_id): return
+    await update_user_state(user_id, STATE_ADMIN_REPLY_ID)
+    await update.message.reply_text("📝 কার সাথে কথা বলতে চান? তার **User ID** দিন:")
+
+async def show_admin_panel(update, context, user_id):
+    is_super = await is_super_admin(user_id)
+    total_users = await get_total_users_count()
+    text = f"👑 <b>অ্যাডমিন প্যানেল</b>\n\n📊 মোট ইউজার: {total_users} জন\nআপনার রোল: {'🔥 সুপার অ্যাডমিন' if is_super else '👮 অ্যাডমিন'}"
+
+    keyboard = [
+        [InlineKeyboardButton("📋 রিভিউ কিউ (Pending কাজ)", callback_data="rq_open")],
+        [InlineKeyboardButton("⚡ বাল্ক অ্যাপ্রুভ/রিজেক্ট", callback_data="bulk_menu")],
+        [InlineKeyboardButton("💰 ব্যালেন্স অ্যাড/রিমুভ & ইনফো", callback_data="admin_manage_balance")],
+        [InlineKeyboardButton("📢 ব্রডকাস্ট মেসেজ", callback_data="admin_broadcast")],
+        [InlineKeyboardButton("🛑 ইউজার কন্ট্রোল (ব্লক/ডিলিট)", callback_data="admin_user_control")],
+        [InlineKeyboardButton("📩 ইউজারকে মেসেজ দিন", callback_data="admin_msg_user")],
+        [InlineKeyboardButton("🗂️ ব্যাকগ্রাউন্ড জব", callback_data="admin_jobs")]
+    ]
+
+    if is_super:
+        keyboard.append([InlineKeyboardButton("💵 মোট সিস্টেম লায়াবিলিটি (Total Balance)", callback_data="admin_total_liability")])
+        keyboard.append([InlineKeyboardButton("🎨 UI ম্যানেজমেন্ট (Custom Buttons)", callback_data="admin_ui_menu")])
+        keyboard.append([InlineKeyboardButton("⚙️ সেটিংস ও বোনাস", callback_data="admin_settings_menu")])
+        keyboard.append([InlineKeyboardButton("👮 অ্যাডমিন ম্যানেজ করুন", callback_data="admin_manage_admins")])
+        keyboard.append([InlineKeyboardButton("📝 গাইড এডিট করুন", callback_data="admin_edit_guide")])
+
+    keyboard.append([InlineKeyboardButton("🔙 মেইন মেনু", callback_data="back_to_main")])
+
+    if update.callback_query:
+        await update.callback_query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+    else:
+        await update.message.reply_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='HTML')
+
+async def admin_command_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await show_admin_panel(update, context, update.effective_user.id)
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not await is_admin(update.effective_user.id): return
+    data = metrics.summary(top=8)
+    caches = get_cache_stats()
+
+    def table(title, rows):
+        if not rows:
+            return ""
+        body = "\n".join(
+            f"{'/'.join(str(v) for v in row['labels'])[:32]}: {row['count']}× avg {row['avg_ms']:.0f}ms p95 {row['p95_ms']:.0f}ms"
+            for row in rows
+        )
+        return f"\n\n<b>{title}</b>\n<code>{html.escape(body)}</code>"
+
+    uptime_min = int(data['uptime'] // 60)
+    text = (
+        f"📈 <b>বট মেট্রিক্স</b> (আপটাইম {uptime_min // 60}h {uptime_min % 60}m)\n\n"
+        f"আপডেট: {data['updates']} | p50 {data['update_p50_ms']:.0f}ms | p95 {data['update_p95_ms']:.0f}ms\n"
+        f"প্রতি আপডেটে ফায়ারস্টোর কল: {data['firestore_per_update']:.2f} | টেলিগ্রাম কল: {data['telegram_per_update']:.2f}\n"
+        f"ত্রুটি: {data['errors']} | ধরে লগ করা: {data['caught_errors']} | ব্যর্থ ফায়ারস্টোর কল: {data['firestore_errors']}\n"
+        f"কনফিগ ক্যাশ: {caches['config']['hits']} hit / {caches['config']['misses']} miss\n"
+        f"রাইট ব্যাচ: {caches['writes']['writes']} লেখা → {caches['writes']['flushes']} কমিট ({caches['writes']['merged']} মার্জড)"
+    )
+    referrals = referral_processor.stats()
+    rejected = ", ".join(f"{k}: {v}" for k, v in referrals['rejected'].items())
+    text += f"\nরেফারেল: {referrals['credited']} বোনাস, {sum(referrals['rejected'].values())} রিজেক্ট" + (f" ({rejected})" if rejected else "") + f", {referrals['queued']} অপেক্ষায়"
+    processor = context.application.update_processor
+    if hasattr(processor, "stats"):
+        p = processor.stats()
+        text += f"\nকনকারেন্সি: {p['active']}/{p['concurrency']} চলমান (সর্বোচ্চ {p['peak']}), {p['users_in_flight']} ইউজার"
+    text += table("হ্যান্ডলার", data['handlers'])
+    text += table("ফায়ারস্টোর", data['firestore'])
+    text += table("টেলিগ্রাম API", data['telegram'])
+    await update.message.reply_text(text, parse_mode='HTML')
+
+@job_manager.register("reconcile_stats", exclusive=True)
+async def reconcile_stats_job(ctx):
+    try:
+        result = await reconcile_system_stats()
+        drift = result['drift']
+        if not ctx.admin_id:
+            return result
+        await ctx.bot.send_message(
+            ctx.admin_id,
+            f"✅ <b>রিকনসাইল সম্পন্ন</b>\n\n"
+            f"📊 মোট ইউজার: {result['total_users']} (ড্রিফট: {drift['total_users']:+d})\n"
+            f"💵 মোট ব্যালেন্স: {result['total_balance']:.2f} BDT (ড্রিফট: {drift['total_balance']:+.2f})",
+            parse_mode='HTML'
+        )
+        return result
+    except Exception as e:
+        logger.error(f"Stats Reconcile Error: {e}")
+        if ctx.admin_id:
+            await ctx.bot.send_message(ctx.admin_id, f"❌ রিকনসাইল ব্যর্থ: {e}")
+        raise
+
+
+# ==========================================
+# ব্যাকগ্রাউন্ড জব (/jobs)
+# ==========================================
+
+_JOB_STATUS_ICONS = {'running': '⏳', 'done': '✅', 'failed': '❌', 'cancelled': '🛑', 'interrupted': '⚠️'}
+
+async def _jobs_view():
+    jobs = await get_recent_jobs(10)
+    if not jobs:
+        return "🗂️ কোনো ব্যাকগ্রাউন্ড জব নেই।", None
+
+    lines = ["🗂️ <b>সাম্প্রতিক ব্যাকগ্রাউন্ড জব</b>\n"]
+    kb = []
+    for job_id, job in jobs:
+        status = job.get('status', '?')
+        progress = (job.get('result') if status == 'done' else None) or job.get('progress') or {}
+        detail = ", ".join(f"{k}: {v}" for k, v in progress.items() if not isinstance(v, dict))
+        if status == 'failed' and job.get('error'):
+            detail = job['error'][:60]
+        created = job.get('created_at')
+        when = created.strftime('%d/%m %H:%M') if hasattr(created, 'strftime') else ''
+        lines.append(f"{_JOB_STATUS_ICONS.get(status, '•')} <code>{job_id[:8]}</code> {job.get('kind')} — {status} {when}")
+        if detail:
+            lines.append(f"    {html.escape(detail)}")
+        if job_manager.is_running(job_id):
+            kb.append([InlineKeyboardButton(f"🛑 বাতিল: {job.get('kind')} {job_id[:8]}", callback_data=f"job_cancel_{job_id}")])
+    kb.append([InlineKeyboardButton("🔄 রিফ্রেশ", callback_data="admin_jobs")])
+    return "\n".join(lines), InlineKeyboardMarkup(kb)
+
+async def jobs_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not await is_admin(update.effective_user.id): return
+    text, markup = await _jobs_view()
+    await update.message.reply_text(text, reply_markup=markup, parse_mode='HTML')
+
+@router.callback("admin_jobs", guard=is_admin)
+async def admin_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    text, markup = await _jobs_view()
+    try:
+        await update.callback_query.edit_message_text(text, reply_markup=markup, parse_mode='HTML')
+    except BadRequest:
+        # কিছু না বদলালে টেলিগ্রাম একই টেক্সট এডিট করতে দেয় না
+        pass
+
+@router.callback("job_cancel_", prefix=True, guard=is_admin, answer=False)
+async def cancel_job(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    job_id = query.data.replace("job_cancel_", "")
+    if job_manager.cancel(job_id):
+        await query.answer("🛑 বাতিল করা হচ্ছে...")
+    else:
+        await query.answer("জবটি আর চলছে না", show_alert=True)
+    await admin_jobs(update, context)
+
+
+# ==========================================
+# বেসিক অ্যাডমিন অ্যাকশন
+# ==========================================
+
+@router.callback("admin_manage_balance", guard=is_admin)
+async def admin_manage_balance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_AWAITING_BALANCE_USER_ID, temp_data={})
+    await query.edit_message_text("💰 যার ইনফো দেখবেন বা ব্যালেন্স পরিবর্তন করবেন তার **User ID** দিন:")
+
+@router.state(STATE_ADMIN_AWAITING_BALANCE_USER_ID)
+async def balance_user_id_input(update, context, state, temp_data):
+    text = update.message.text
+    if text.isdigit():
+        target_uid = text
+        # ব্যালেন্স আর রেফার সংখ্যা একই ডকের: একটি রিড
+        target_doc = context.user_doc(target_uid)
+        curr_bal = await target_doc.get('balance', 0.0)
+        ref_count = await target_doc.get('referral_count', 0)
+        temp_data['target_uid'] = int(text)
+        await update_user_state(update.effective_user.id, STATE_ADMIN_AWAITING_BALANCE_AMOUNT, temp_data)
+        await update.message.reply_text(
+            f"👤 User: {target_uid}\n💰 বর্তমান ব্যালেন্স: {curr_bal} BDT\n👥 রেফার: {ref_count} জন\n\nব্যালেন্স যোগ/বিয়োগ করতে পরিমাণ লিখুন (যেমন: +10 বা -10):"
+        )
+    else:
+        await update.message.reply_text("❌ শুধু সংখ্যায় ID দিন।")
+
+@router.state(STATE_ADMIN_AWAITING_BALANCE_AMOUNT)
+async def balance_amount_input(update, context, state, temp_data):
+    text = update.message.text
+    try:
+        op = text[0]
+        amt = float(text[1:])
+    except (IndexError, ValueError):
+        await update.message.reply_text("❌ ফরম্যাট: +10 বা -10")
+        return
+    try:
+        target = temp_data['target_uid']
+        final_amt = amt if op == '+' else -amt
+
+        target_doc = context.user_doc(target)
+        target_doc.add_balance(final_amt)
+        # ফলাফল জানাতে হবে বলে আপডেট শেষের অপেক্ষা না করে এখনই কমিট
+        if await target_doc.commit():
+            await update_user_state(update.effective_user.id, STATE_IDLE)
+            await update.message.reply_text("✅ ব্যালেন্স আপডেট সফল!")
+            try:
+                await context.bot.send_message(target, f"🔔 অ্যাডমিন আপনার ব্যালেন্স আপডেট করেছে: {text} BDT")
+            except Exception as e:
+                logger.warning(f"Balance notify failed for {target}: {e}")
+                metrics.record_error("balance_notify")
+        else:
+            await update.message.reply_text("❌ ব্যর্থ হয়েছে।")
+    except Exception as e:
+        logger.exception(f"Balance Update Error: {e}")
+        metrics.record_error("balance_amount_input")
+        await update.message.reply_text("❌ ব্যর্থ হয়েছে।")
+
+@router.callback("admin_broadcast", guard=is_admin)
+async def admin_broadcast(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_AWAITING_BROADCAST_MESSAGE)
+    await query.edit_message_text("📢 ব্রডকাস্ট মেসেজটি লিখুন:")
+
+@router.state(STATE_ADMIN_AWAITING_BROADCAST_MESSAGE)
+async def broadcast_message_input(update, context, state, temp_data):
+    user_id = update.effective_user.id
+    await update_user_state(user_id, STATE_IDLE)
+    progress_msg = await update.message.reply_text("📢 ব্রডকাস্ট শুরু হচ্ছে... (/jobs থেকে বাতিল করা যাবে)")
+    broadcast_id = await create_broadcast({
+        'text': update.message.text,
+        'admin_id': user_id,
+        'progress_chat_id': progress_msg.chat_id,
+        'progress_message_id': progress_msg.message_id
+    })
+    await job_manager.submit("broadcast", {'broadcast_id': broadcast_id}, user_id)
+
+@router.callback("admin_msg_user", guard=is_admin)
+async def admin_msg_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_REPLY_ID)
+    await query.edit_message_text("📝 যার কাছে বার্তা পাঠাবেন তার **User ID** দিন:")
+
+@router.state(STATE_ADMIN_REPLY_ID)
+async def reply_id_input(update, context, state, temp_data):
+    text = update.message.text
+    if text.isdigit():
+        temp_data['reply_uid'] = text
+        await update_user_state(update.effective_user.id, STATE_ADMIN_REPLY_MSG, temp_data)
+        await update.message.reply_text(f"📝 User {text} কে কী বার্তা পাঠাতে চান লিখুন:")
+    else:
+        await update.message.reply_text("❌ সঠিক User ID দিন।")
+
+@router.state(STATE_ADMIN_REPLY_MSG)
+async def reply_msg_input(update, context, state, temp_data):
+    target_uid = temp_data.get('reply_uid')
+    try:
+        await context.bot.send_message(chat_id=target_uid, text=f"📩 <b>অ্যাডমিন বার্তা:</b>\n\n{update.message.text}", parse_mode='HTML')
+        await update.message.reply_text("✅ বার্তা পাঠানো হয়েছে!")
+    except Exception as e:
+        await update.message.reply_text(f"❌ বার্তা যায়নি: {e}")
+    await update_user_state(update.effective_user.id, STATE_IDLE)
+
+@router.callback("admin_total_liability", guard=is_super_admin)
+async def admin_total_liability(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    total = await get_total_system_liability()
+    kb = [
+        [InlineKeyboardButton("🔄 রিকনসাইল (পুনরায় গণনা)", callback_data="admin_reconcile_stats")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]
+    ]
+    await query.edit_message_text(
+        f"💵 <b>সিস্টেম রিপোর্ট:</b>\n\nসকল ইউজারের মোট ব্যালেন্স: <b>{total:.2f} BDT</b>",
+        reply_markup=InlineKeyboardMarkup(kb)
+    , parse_mode='HTML')
+
+@router.callback("admin_reconcile_stats", guard=is_super_admin)
+async def admin_reconcile_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    # দুটি রিকনসাইল একসাথে চললে একই ড্রিফট দুবার যোগ হতো
+    job_id = await job_manager.submit("reconcile_stats", {}, query.from_user.id)
+    text = (
+        "🔄 ব্যাকগ্রাউন্ডে সব ইউজার পুনরায় গণনা করা হচ্ছে। শেষ হলে রিপোর্ট পাঠানো হবে। (/jobs)"
+        if job_id else "⏳ একটি রিকনসাইল আগে থেকেই চলছে। শেষ হলে রিপোর্ট আসবে। (/jobs)"
+    )
+    await query.edit_message_text(
+        text,
+        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]])
+    )
+
+
+# ==========================================
+# ইউজার কন্ট্রোল
+# ==========================================
+
+@router.callback("admin_user_control", guard=is_admin)
+async def admin_user_control(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    kb = [
+        [InlineKeyboardButton("ব্লক ইউজার", callback_data="adm_usr_block"), InlineKeyboardButton("আনব্লক ইউজার", callback_data="adm_usr_unblock")],
+        [InlineKeyboardButton("ডিলিট ইউজার", callback_data="adm_usr_delete")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]
+    ]
+    await update.callback_query.edit_message_text("🛑 কি করতে চান?", reply_markup=InlineKeyboardMarkup(kb))
+
+@router.callback("adm_usr_", prefix=True, guard=is_admin)
+async def admin_user_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    action = query.data.split('_')[-1]
+    if action not in ('block', 'unblock', 'delete'):
+        return
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_USER_ACTION_ID, temp_data={'action': action})
+    await query.edit_message_text(f"🛑 টার্গেট ইউজারের **ID** দিন ({action} করার জন্য):")
+
+@router.state(STATE_ADMIN_USER_ACTION_ID)
+async def user_action_id_input(update, context, state, temp_data):
+    text = update.message.text
+    if text.isdigit():
+        target_uid = text
+        action = temp_data.get('action')
+
+        if action == 'delete':
+            if await delete_user(target_uid):
+                await update.message.reply_text(f"✅ ইউজার {target_uid} ডিলিট করা হয়েছে।")
+            else:
+                await update.message.reply_text("❌ ইউজার পাওয়া যায়নি।")
+        elif action == 'block':
+            if await toggle_block_user(target_uid, True):
+                await update.message.reply_text(f"✅ ইউজার {target_uid} ব্লক করা হয়েছে।")
+            else:
+                await update.message.reply_text("❌ ব্যর্থ।")
+        elif action == 'unblock':
+            if await toggle_block_user(target_uid, False):
+                await update.message.reply_text(f"✅ ইউজার {target_uid} আনব্লক করা হয়েছে।")
+            else:
+                await update.message.reply_text("❌ ব্যর্থ।")
+
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+    else:
+        await update.message.reply_text("❌ সঠিক আইডি দিন।")
+
+
+# ==========================================
+# সুপার অ্যাডমিন সেটিংস
+# ==========================================
+
+@router.callback("admin_settings_menu", guard=is_super_admin)
+async def admin_settings_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    config = await get_system_config()
+    ref_bonus = await get_refer_bonus()
+    cache = get_cache_stats()["config"]
+
+    kb = [
+        [InlineKeyboardButton(f"💰 টাস্ক রেট: {config.get('task_reward', 5)} TK", callback_data="set_task_reward")],
+        [InlineKeyboardButton(f"🎁 রেফার বোনাস: {ref_bonus} TK", callback_data="set_refer_bonus")],
+        [InlineKeyboardButton(f"🔗 অনুমোদিত লিংক: {len(config.get('link_allow_domains', []))} টি", callback_data="set_link_allow")],
+        [InlineKeyboardButton(f"⛔ ব্লক করা ডোমেইন: {len(config.get('link_block_domains', []))} টি", callback_data="set_link_block")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]
+    ]
+    await update.callback_query.edit_message_text(f"⚙️ **সিস্টেম সেটিংস:**\n(পরিবর্তন করতে বাটনে ক্লিক করুন)\n\n🗄️ কনফিগ ক্যাশ: {cache['hits']} hit / {cache['misses']} miss", reply_markup=InlineKeyboardMarkup(kb), parse_mode='Markdown')
+
+@router.callback("set_task_reward", guard=is_super_admin)
+async def set_task_reward(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_AWAITING_TASK_REWARD)
+    await query.edit_message_text("💰 কাজের রেট (টাকা) কত হবে? (সংখ্যা লিখুন):")
+
+@router.state(STATE_ADMIN_AWAITING_TASK_REWARD)
+async def task_reward_input(update, context, state, temp_data):
+    try:
+        val = float(update.message.text)
+    except ValueError:
+        await update.message.reply_text("❌ সংখ্যা দিন।")
+        return
+    try:
+        await update_system_config('task_reward', val)
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+        await update.message.reply_text("✅ কাজের রেট আপডেট হয়েছে।")
+    except Exception as e:
+        logger.exception(f"Task Reward Error: {e}")
+        metrics.record_error("task_reward_input")
+        await update.message.reply_text("❌ ব্যর্থ হয়েছে।")
+
+@router.callback("set_refer_bonus", guard=is_super_admin)
+async def set_refer_bonus_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_AWAITING_REFER_BONUS)
+    await query.edit_message_text("🎁 নতুন বোনাস কত দিতে চান? (সংখ্যা লিখুন):")
+
+@router.state(STATE_ADMIN_AWAITING_REFER_BONUS)
+async def refer_bonus_input(update, context, state, temp_data):
+    try:
+        val = float(update.message.text)
+    except ValueError:
+        await update.message.reply_text("❌ সংখ্যা দিন।")
+        return
+    try:
+        await set_refer_bonus(val)
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+        await update.message.reply_text(f"✅ রেফার বোনাস আপডেট হয়েছে: {val} TK")
+    except Exception as e:
+        logger.exception(f"Refer Bonus Error: {e}")
+        metrics.record_error("refer_bonus_input")
+        await update.message.reply_text("❌ ব্যর্থ হয়েছে।")
+
+@router.callback("set_link_allow", guard=is_super_admin)
+@router.callback("set_link_block", guard=is_super_admin)
+async def set_link_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    is_allow = query.data == "set_link_allow"
+    current = (await get_system_config()).get('link_allow_domains' if is_allow else 'link_block_domains', [])
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_EDIT_LINK_ALLOW if is_allow else STATE_ADMIN_EDIT_LINK_BLOCK)
+    title = "🔗 সাপোর্ট গ্রুপে যেসব লিংক অনুমোদিত" if is_allow else "⛔ যেসব ডোমেইন টেক্সটে থাকলেই মেসেজ ডিলিট হবে"
+    await query.edit_message_text(
+        f"{title}\n\nবর্তমান:\n" + ("\n".join(current) or "খালি") +
+        "\n\nনতুন তালিকা কমা বা লাইন দিয়ে আলাদা করে লিখুন (যেমন: google.com, t.me/skyzone)। খালি করতে - লিখুন।"
+    )
+
+@router.state(STATE_ADMIN_EDIT_LINK_ALLOW, STATE_ADMIN_EDIT_LINK_BLOCK)
+async def link_list_input(update, context, state, temp_data):
+    key = 'link_allow_domains' if state == STATE_ADMIN_EDIT_LINK_ALLOW else 'link_block_domains'
+    entries = parse_domain_list(update.message.text)
+    await update_system_config(key, entries)
+    await update_user_state(update.effective_user.id, STATE_IDLE)
+    await update.message.reply_text(f"✅ তালিকা আপডেট হয়েছে ({len(entries)} টি):\n" + ("\n".join(entries) or "খালি"))
+
+@router.callback("admin_edit_guide", guard=is_super_admin)
+async def admin_edit_guide(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_EDIT_GUIDE_TEXT)
+    curr_text = (await get_ui_config()).get('text_guide_content', {}).get('text', 'N/A')
+    await query.edit_message_text(f"📚 **নতুন গাইড কন্টেন্ট লিখুন:**\n\nবর্তমান:\n{curr_text[:50]}...", parse_mode='HTML')
+
+@router.state(STATE_ADMIN_EDIT_GUIDE_TEXT)
+async def guide_text_input(update, context, state, temp_data):
+    await update_ui_element('text_guide_content', 'text', update.message.text)
+    await update_user_state(update.effective_user.id, STATE_IDLE)
+    await update.message.reply_text("✅ গাইড কন্টেন্ট আপডেট হয়েছে!")
+
+
+# ==========================================
+# অ্যাডমিন ম্যানেজমেন্ট
+# ==========================================
+
+@router.callback("admin_manage_admins", guard=is_super_admin)
+async def admin_manage_admins(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    kb = [
+        [InlineKeyboardButton("➕ নতুন অ্যাডমিন যোগ করুন", callback_data="adm_add_new")],
+        [InlineKeyboardButton("🗑️ অ্যাডমিন রিমুভ করুন", callback_data="adm_rem_exist")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]
+    ]
+    await update.callback_query.edit_message_text("👮 **অ্যাডমিন ম্যানেজমেন্ট**", reply_markup=InlineKeyboardMarkup(kb))
+
+@router.callback("adm_add_new", guard=is_super_admin)
+async def adm_add_new(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_ADD_ADMIN_ID)
+    await query.edit_message_text("➕ যাকে অ্যাডমিন বানাতে চান তার **User ID** দিন:")
+
+@router.state(STATE_ADMIN_ADD_ADMIN_ID)
+async def add_admin_id_input(update, context, state, temp_data):
+    text = update.message.text
+    user_id = update.effective_user.id
+    if text.isdigit():
+        new_admin_id = text
+        await add_admin(new_admin_id, user_id)
+        await update_user_state(user_id, STATE_IDLE)
+        await update.message.reply_text(f"✅ নতুন অ্যাডমিন (ID: {new_admin_id}) যুক্ত হয়েছে।")
+    else:
+        await update.message.reply_text("❌ সঠিক ইউজার আইডি দিন।")
+
+@router.callback("adm_rem_exist", guard=is_super_admin)
+async def adm_rem_exist(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_REMOVE_ADMIN_ID)
+    await query.edit_message_text("🗑️ যাকে রিমুভ করতে চান তার **User ID** দিন:")
+
+@router.state(STATE_ADMIN_REMOVE_ADMIN_ID)
+async def remove_admin_id_input(update, context, state, temp_data):
+    text = update.message.text
+    if text.isdigit():
+        target_id = text
+        if await remove_admin(target_id):
+            await update.message.reply_text(f"✅ অ্যাডমিন {target_id} রিমুভ করা হয়েছে।")
+        else:
+            await update.message.reply_text("❌ ব্যর্থ! হয়তো আইডি ভুল বা সুপার অ্যাডমিনকে রিমুভ করার চেষ্টা করছেন।")
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+    else:
+        await update.message.reply_text("❌ সঠিক আইডি দিন।")
+
+
+# ==========================================
+# কাজ অ্যাপ্রুভাল ও পেমেন্ট
+# ==========================================
+# এই রুটগুলো নিজেরাই query.answer() করে, যাতে ব্যর্থ হলে অ্যালার্ট দেখানো যায়
+
+@router.callback("adm_app_", prefix=True, guard=is_admin, answer=False)
+@router.callback("adm_rej_", prefix=True, guard=is_admin, answer=False)
+async def review_submission_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    data = query.data
+    sub_id = data.split('_')[-1]
+    is_approve = data.startswith("adm_app_")
+
+    try:
+        result = await review_submission(sub_id, is_approve, str(query.from_user.id))
+        if result['status'] == 'not_found':
+            await query.answer("পাওয়া যায়নি", show_alert=True)
+            return
+
+        if result['status'] != 'ok':
+            await query.answer("আগেই প্রসেস করা হয়েছে", show_alert=True)
+            return
+
+        await query.answer()
+        status = 'approved' if is_approve else 'rejected'
+        s_data = result['data']
+
+        if is_approve:
+            reward = result['reward']
+            await context.bot.send_message(s_data['user_id'], f"✅ আপনার জমা দেওয়া কাজ অ্যাপ্রুভ হয়েছে! +{reward} BDT")
+        else:
+            await context.bot.send_message(s_data['user_id'], "❌ আপনার জমা দেওয়া কাজ রিজেক্ট হয়েছে।")
+
+        await query.edit_message_text(f"{query.message.text}\n\n{status.upper()} by {query.from_user.first_name}")
+    except Exception as e:
+        logger.exception(f"Submission Review Error: {e}")
+        metrics.record_error("submission_review_action")
+
+@router.callback("adm_pay_", prefix=True, guard=is_admin, answer=False)
+async def withdrawal_paid_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    w_id = query.data.split('_')[-1]
+
+    try:
+        result = await mark_withdrawal_paid(w_id, str(query.from_user.id))
+        if result['status'] != 'ok':
+            await query.answer("ভুল রিকোয়েস্ট বা ইতিমধ্যে প্রসেস করা হয়েছে", show_alert=True)
+            return
+
+        await query.answer()
+        uid = result['data']['user_id']
+        await context.bot.send_message(uid, "💸 আপনার পেমেন্ট পাঠানো হয়েছে! চেক করুন।")
+        await query.edit_message_text(f"{query.message.text}\n\n✅ PAID by {query.from_user.first_name}")
+    except Exception as e:
+        logger.exception(f"Withdrawal Pay Error: {e}")
+        metrics.record_error("withdrawal_paid_action")
+
+@router.callback("adm_wrej_", prefix=True, guard=is_admin, answer=False)
+async def withdrawal_reject_action(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    w_id = query.data.split('_')[-1]
+    try:
+        result = await reject_withdrawal(w_id, str(query.from_user.id))
+
+        if result['status'] != 'ok':
+            await query.answer("ভুল রিকোয়েস্ট বা ইতিমধ্যে প্রসেস করা হয়েছে", show_alert=True)
+            return
+
+        await query.answer()
+        amount = result['data'].get('amount', 0)
+        uid = result['data']['user_id']
+
+        await context.bot.send_message(uid, f"⚠️ আপনার উইথড্র রিকোয়েস্ট রিজেক্ট করা হয়েছে।\n💰 {amount} BDT আপনার ব্যালেন্সে ফেরত দেওয়া হয়েছে।")
+        await query.edit_message_text(f"{query.message.text}\n\n❌ REJECTED & REFUNDED by {query.from_user.first_name}")
+    except Exception as e:
+        logger.exception(f"Refund Error: {e}")
+        metrics.record_error("withdrawal_reject_action")
@@ -0,0 +1,171 @@
+import logging
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import ContextTypes
+
+from config import *
+from repository import (
+    get_ui_config, add_custom_button, remove_custom_button, update_ui_element,
+    is_super_admin, is_admin, update_user_state
+)
+from router import router
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# UI ম্যানেজমেন্ট মেনু
+# ==========================================
+
+@router.callback("admin_ui_menu", guard=is_super_admin)
+async def admin_ui_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    kb = [
+        [InlineKeyboardButton("➕ নতুন কাস্টম বাটন যোগ করুন", callback_data="aui_add_custom")],
+        [InlineKeyboardButton("🗑️ কাস্টম বাটন রিমুভ করুন", callback_data="aui_rem_custom_list")],
+        [InlineKeyboardButton("মেনু বাটন (Home)", callback_data="aui_cat_home")],
+        [InlineKeyboardButton("সাব-মেনু বাটন (Work)", callback_data="aui_cat_sub")],
+        [InlineKeyboardButton("ইনফো লিংক (Info)", callback_data="aui_cat_info")],
+        [InlineKeyboardButton("অন্যান্য (Misc)", callback_data="aui_cat_misc")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")]
+    ]
+    await update.callback_query.edit_message_text("🎨 **বাটন এবং UI ম্যানেজমেন্ট:**", reply_markup=InlineKeyboardMarkup(kb), parse_mode='Markdown')
+
+
+# ==========================================
+# কাস্টম বাটন
+# ==========================================
+
+@router.callback("aui_add_custom", guard=is_super_admin)
+async def aui_add_custom(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_ADD_CUSTOM_BTN_TEXT)
+    await query.edit_message_text("➕ বাটনের নাম (Title) লিখুন:")
+
+@router.state(STATE_ADMIN_ADD_CUSTOM_BTN_TEXT)
+async def custom_btn_text_input(update, context, state, temp_data):
+    temp_data['btn_text'] = update.message.text
+    await update_user_state(update.effective_user.id, STATE_ADMIN_ADD_CUSTOM_BTN_URL, temp_data)
+    await update.message.reply_text("🔗 বাটনের লিংক (URL) দিন:")
+
+@router.state(STATE_ADMIN_ADD_CUSTOM_BTN_URL)
+async def custom_btn_url_input(update, context, state, temp_data):
+    text = update.message.text
+    if 'http' in text:
+        btn_text = temp_data.get('btn_text')
+        await add_custom_button(btn_text, text)
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+        await update.message.reply_text(f"✅ বাটন '{btn_text}' যুক্ত হয়েছে!")
+    else:
+        await update.message.reply_text("❌ সঠিক https লিংক দিন।")
+
+@router.callback("aui_rem_custom_list", guard=is_super_admin)
+async def aui_rem_custom_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    ui_config = await get_ui_config()
+    btns = ui_config.get("custom_buttons", [])
+    kb = []
+    for idx, btn in enumerate(btns):
+        kb.append([InlineKeyboardButton(f"🗑️ {btn['text']}", callback_data=f"aui_delc_{idx}")])
+    kb.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="admin_ui_menu")])
+    await update.callback_query.edit_message_text("🗑️ কোন বাটনটি ডিলিট করতে চান?", reply_markup=InlineKeyboardMarkup(kb))
+
+@router.callback("aui_delc_", prefix=True, guard=is_admin)
+async def aui_delete_custom(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    idx = int(query.data.split('_')[-1])
+    await remove_custom_button(idx)
+    await query.edit_message_text("✅ বাটন রিমুভ হয়েছে!", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 ব্যাক", callback_data="admin_ui_menu")]]))
+
+
+# ==========================================
+# বিল্ট-ইন বাটন ও লিংক এডিট
+# ==========================================
+
+@router.callback("aui_cat_", prefix=True, guard=is_super_admin)
+async def aui_category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    cat = query.data.split('_')[-1]
+    ui_config = await get_ui_config()
+    kb = []
+
+    for key, val in ui_config.items():
+        if key == "custom_buttons": continue
+        is_match = False
+
+        if cat == "home" and key.startswith("btn_") and not key.startswith("btn_sub_"):
+            is_match = True
+        elif cat == "sub" and key.startswith("btn_sub_"):
+            is_match = True
+        elif cat == "info" and key.startswith("link_"):
+            is_match = True
+        elif cat == "misc" and not (key.startswith("btn_") or key.startswith("link_")):
+            is_match = True
+
+        if is_match:
+            status = "👁️" if val.get("show", True) else "🚫"
+            btn_name = val.get('text', key)[:25]
+            kb.append([InlineKeyboardButton(f"{status} {btn_name}", callback_data=f"aui_sel_{key}")])
+
+    kb.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="admin_ui_menu")])
+    await query.edit_message_text(f"🔘 **{cat.upper()} সেকশন বাটন:**", reply_markup=InlineKeyboardMarkup(kb), parse_mode='Markdown')
+
+@router.callback("aui_sel_", prefix=True, guard=is_super_admin)
+async def aui_select(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    key = query.data.replace("aui_sel_", "")
+    ui_config = await get_ui_config()
+    item = ui_config.get(key, {})
+    status_text = "Visible" if item.get("show", True) else "Hidden"
+    toggle_action = "Hide" if item.get("show", True) else "Show"
+
+    text = f"🔧 **Edit Item:** `{key}`\n\n📝 Text: {item.get('text')}\n🔗 Link: {item.get('url', 'N/A')}\n👀 Status: {status_text}"
+    kb = [
+        [InlineKeyboardButton("✏️ নাম পরিবর্তন (Text)", callback_data=f"aui_ren_{key}")],
+        [InlineKeyboardButton(f"👁️ {toggle_action}", callback_data=f"aui_tog_{key}")],
+        [InlineKeyboardButton("🔙 ব্যাক", callback_data="admin_ui_menu")]
+    ]
+
+    if "url" in item or key.startswith("link_") or key == "btn_review_gen":
+        kb.insert(1, [InlineKeyboardButton("🔗 লিংক পরিবর্তন", callback_data=f"aui_url_{key}")])
+
+    await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(kb), parse_mode='Markdown')
+
+@router.callback("aui_ren_", prefix=True, guard=is_admin)
+async def aui_rename(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    key = query.data.replace("aui_ren_", "")
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_EDIT_UI_TEXT, temp_data={'target_key': key})
+    await query.edit_message_text(f"📝 `{key}` এর জন্য নতুন নাম লিখুন:", parse_mode='Markdown')
+
+@router.state(STATE_ADMIN_EDIT_UI_TEXT)
+async def ui_text_input(update, context, state, temp_data):
+    target_key = temp_data.get('target_key')
+    await update_ui_element(target_key, 'text', update.message.text)
+    await update_user_state(update.effective_user.id, STATE_IDLE)
+    await update.message.reply_text("✅ টেক্সট পরিবর্তন হয়েছে।")
+
+@router.callback("aui_url_", prefix=True, guard=is_admin)
+async def aui_change_url(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    key = query.data.replace("aui_url_", "")
+    await update_user_state(str(query.from_user.id), STATE_ADMIN_EDIT_UI_URL, temp_data={'target_key': key})
+    await query.edit_message_text(f"🔗 `{key}` এর জন্য নতুন লিংক লিখুন:", parse_mode='Markdown')
+
+@router.state(STATE_ADMIN_EDIT_UI_URL)
+async def ui_url_input(update, context, state, temp_data):
+    text = update.message.text
+    target_key = temp_data.get('target_key')
+    if 'http' in text:
+        await update_ui_element(target_key, 'url', text)
+        await update_user_state(update.effective_user.id, STATE_IDLE)
+        await update.message.reply_text("✅ লিংক পরিবর্তন হয়েছে।")
+    else:
+        await update.message.reply_text("❌ সঠিক লিংক দিন (https://...)")
+
+@router.callback("aui_tog_", prefix=True, guard=is_admin)
+async def aui_toggle(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    key = query.data.replace("aui_tog_", "")
+    ui_config = await get_ui_config()
+    curr_show = ui_config.get(key, {}).get("show", True)
+    await update_ui_element(key, 'show', not curr_show)
+    new_status = "Hidden" if curr_show else "Visible"
+    await query.edit_message_text(f"✅ Status updated to {new_status}!", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 লিস্টে ফিরে যান", callback_data="admin_ui_menu")]]))
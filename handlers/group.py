@@ -0,0 +1,48 @@
+import logging
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import ContextTypes
+
+from repository import get_system_config, group_cooldown
+from group_admins import group_admins
+from link_filter import get_link_filter, message_links, SPAM
+
+logger = logging.getLogger(__name__)
+
+
+async def track_group_admins(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    group_admins.apply_member_update(update.chat_member)
+
+async def handle_support_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user_id = update.effective_user.id
+    text = update.message.text
+    try:
+        if await group_admins.is_admin(context.bot, user_id):
+            return
+
+        config = await get_system_config()
+        link_filter = get_link_filter(config.get('link_allow_domains'), config.get('link_block_domains'))
+        if link_filter.classify(text, message_links(update.message)) == SPAM:
+            try:
+                await update.message.delete()
+            except Exception as e:
+                logger.error(f"Failed to delete link: {e}")
+            return
+
+        if await group_cooldown.claim(user_id, update.effective_user.username):
+            await update.message.reply_text(
+                "✋ অপেক্ষা করুন, অ্যাডমিন ফ্রি হয়ে আপনার মেসেজের রিপ্লাই দিবে।",
+                reply_to_message_id=update.message.message_id
+            )
+            try:
+                bot_username = context.bot.username
+                dm_text = (
+                    f"আসসালামু আলাইকুম, <b>{update.effective_user.first_name}</b>!\n\n"
+                    "আপনি সাপোর্ট গ্রুপে মেসেজ দিয়েছেন। দয়া করে অ্যাডমিনের রিপ্লাইয়ের জন্য অপেক্ষা করুন।\n\n"
+                    "অথবা আপনি চাইলে সরাসরি এই বটের মাধ্যমে আমাদের সাথে যুক্ত থাকতে পারেন।"
+                )
+                kb = [[InlineKeyboardButton("🤖 বটের সাথে যুক্ত হোন", url=f"https://t.me/{bot_username}")]]
+                await context.bot.send_message(chat_id=user_id, text=dm_text, reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
+            except:
+                pass
+    except Exception as e:
+        logger.error(f"Group Logic Error: {e}")
@@ -0,0 +1,119 @@
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from repository import get_ui_config, get_ui_config_version
+
+# ইউজার মেনুর কিবোর্ড শুধু ui_config এর উপর নির্ভর করে (আর মেইন মেনুতে
+# অ্যাডমিন কিনা), তাই প্রতি কনফিগ সংস্করণে একবারই বানানো হয়।
+_rendered = {}
+
+# কনফিগের উপর নির্ভর করে না, তাই একবারই তৈরি
+BACK_TO_MAIN = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 ব্যাক", callback_data="back_to_main")]])
+
+
+def _main_menu(ui_config, with_admin):
+    keyboard = []
+
+    if ui_config.get("btn_review_gen", {}).get("show", True):
+        cfg = ui_config["btn_review_gen"]
+        keyboard.append([InlineKeyboardButton(cfg.get("text", "🌐 রিভিউ জেনারেটর"), url=cfg.get("url"))])
+
+    custom_btns = ui_config.get("custom_buttons", [])
+    for btn in custom_btns:
+        keyboard.append([InlineKeyboardButton(btn['text'], url=btn['url'])])
+
+    row2 = []
+    if ui_config.get("btn_submit_work", {}).get("show", True):
+        row2.append(InlineKeyboardButton(ui_config["btn_submit_work"].get("text", "💰 কাজ জমা দিন"), callback_data="submit_work"))
+    if ui_config.get("btn_balance", {}).get("show", True):
+        row2.append(InlineKeyboardButton(ui_config["btn_balance"].get("text", "📈 ব্যালেন্স"), callback_data="show_account"))
+    if row2: keyboard.append(row2)
+
+    row3 = []
+    if ui_config.get("btn_withdraw", {}).get("show", True):
+        row3.append(InlineKeyboardButton(ui_config["btn_withdraw"].get("text", "💸 উত্তোলন"), callback_data="start_withdraw"))
+    if ui_config.get("btn_info", {}).get("show", True):
+        row3.append(InlineKeyboardButton(ui_config["btn_info"].get("text", "ℹ️ তথ্য দেখুন"), callback_data="info_links_menu"))
+    if row3: keyboard.append(row3)
+
+    row4 = []
+    if ui_config.get("btn_refer", {}).get("show", True):
+        row4.append(InlineKeyboardButton(ui_config["btn_refer"].get("text", "👥 রেফার করুন"), callback_data="show_referral_link"))
+    if ui_config.get("btn_guide", {}).get("show", True):
+        row4.append(InlineKeyboardButton(ui_config["btn_guide"].get("text", "📚 ভিডিও দেখে কাজ শিখুন"), callback_data="show_guide"))
+    if row4: keyboard.append(row4)
+
+    if ui_config.get("btn_support", {}).get("show", True):
+        keyboard.append([InlineKeyboardButton(ui_config["btn_support"].get("text", "💬 সাপোর্ট"), url=ui_config.get("link_support", {}).get("url", "https://t.me/AfMdshakil"))])
+
+    if with_admin:
+        keyboard.append([InlineKeyboardButton("👑 অ্যাডমিন প্যানেল", callback_data="open_admin_panel")])
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+def _info_links(ui_config):
+    link_keyboard = []
+
+    def get_link_btn(key):
+        cfg = ui_config.get(key, {})
+        if cfg.get("show", True):
+            return InlineKeyboardButton(cfg.get("text", "Link"), url=cfg.get("url"))
+        return None
+
+    r1 = []
+    b1 = get_link_btn("link_fb_group")
+    b2 = get_link_btn("link_fb_page")
+    if b1: r1.append(b1)
+    if b2: r1.append(b2)
+    if r1: link_keyboard.append(r1)
+
+    r2 = []
+    b3 = get_link_btn("link_yt")
+    b4 = get_link_btn("link_tg_channel")
+    if b3: r2.append(b3)
+    if b4: r2.append(b4)
+    if r2: link_keyboard.append(r2)
+
+    r3 = []
+    b5 = get_link_btn("link_tg_group")
+    b6 = get_link_btn("link_tg_payment")
+    if b5: r3.append(b5)
+    if b6: r3.append(b6)
+    if r3: link_keyboard.append(r3)
+
+    b7 = get_link_btn("link_website")
+    if b7: link_keyboard.append([b7])
+
+    link_keyboard.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="back_to_main")])
+    return InlineKeyboardMarkup(link_keyboard)
+
+
+def _submit_work(ui_config):
+    keyboard = []
+    if ui_config.get("btn_sub_review", {}).get("show", True):
+        keyboard.append([InlineKeyboardButton(ui_config["btn_sub_review"].get("text", "📋 রিভিউ তথ্য জমা"), callback_data="sub_review_data")])
+    if ui_config.get("btn_sub_market", {}).get("show", True):
+        keyboard.append([InlineKeyboardButton(ui_config["btn_sub_market"].get("text", "🔗 মার্কেটিং লিংক জমা"), callback_data="sub_market_link")])
+
+    keyboard.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="back_to_main")])
+    return InlineKeyboardMarkup(keyboard)
+
+
+_BUILDERS = {
+    "main": lambda ui_config, with_admin: _main_menu(ui_config, with_admin),
+    "info_links": lambda ui_config, with_admin: _info_links(ui_config),
+    "submit_work": lambda ui_config, with_admin: _submit_work(ui_config),
+}
+
+
+async def get_keyboard(name, with_admin=False):
+    """মেমোইজ করা কিবোর্ড; UI কনফিগ বদলালে (সংস্করণ বাড়লে) নতুন করে বানায়।"""
+    ui_config = await get_ui_config()
+    version = get_ui_config_version()
+    key = (name, with_admin)
+    entry = _rendered.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    markup = _BUILDERS[name](ui_config, with_admin)
+    _rendered[key] = (version, markup)
+    return markup
@@ -0,0 +1,381 @@
+import html
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes
+
+from config import *
+from repository import (
+    is_admin, update_user_state, get_user_state_and_data,
+    get_pending_submissions_page, get_pending_page, count_pending,
+    review_submission, review_submissions_bulk, process_withdrawals_bulk
+)
+from router import router
+from jobs import job_manager
+from broadcast import send_with_retry, telegram_bucket
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# রিভিউ কিউ (pending সাবমিশন পেজ ধরে)
+# ==========================================
+# অ্যাডমিনের temp_data তে থাকে: rq_cursors (প্রতিটি খোলা পেজের start_after,
+# শেষটি বর্তমান পেজ) আর rq_ids (স্ক্রিনে দেখানো সাবমিশন আইডি, বাল্ক অ্যাকশনের জন্য)।
+
+def _describe(index, sub_id, data):
+    name = html.escape(str(data.get('first_name') or data.get('username') or ''))
+    lines = [f"{index}. <b>{html.escape(str(data.get('type', '?')))}</b> — {name} (<code>{data.get('user_id')}</code>)"]
+    details = dict(data.get('data') or {})
+    if data.get('link'):
+        details['link'] = data['link']
+    for key, icon in (('link', '🔗'), ('email', '📧'), ('review_name', '👤'), ('device_name', '📱')):
+        if details.get(key):
+            lines.append(f"    {icon} {html.escape(str(details[key]))[:120]}")
+    submitted = data.get('submitted_at')
+    if hasattr(submitted, 'strftime'):
+        lines.append(f"    🕒 {submitted.strftime('%d/%m %H:%M')}")
+    return "\n".join(lines)
+
+async def _show_queue(update, admin_id, cursors):
+    page = await get_pending_submissions_page(REVIEW_QUEUE_PAGE_SIZE + 1, cursors[-1])
+    has_next = len(page) > REVIEW_QUEUE_PAGE_SIZE
+    page = page[:REVIEW_QUEUE_PAGE_SIZE]
+    ids = [sub_id for sub_id, _ in page]
+    await update_user_state(admin_id, STATE_IDLE, {'rq_cursors': cursors, 'rq_ids': ids})
+
+    kb = []
+    if page:
+        text = f"📋 <b>রিভিউ কিউ</b> — পেজ {len(cursors)}\n\n" + "\n\n".join(
+            _describe(n, sub_id, data) for n, (sub_id, data) in enumerate(page, 1)
+        )
+        for n, sub_id in enumerate(ids, 1):
+            kb.append([
+                InlineKeyboardButton(f"✅ {n}", callback_data=f"rq_app_{sub_id}"),
+                InlineKeyboardButton(f"❌ {n}", callback_data=f"rq_rej_{sub_id}")
+            ])
+        kb.append([
+            InlineKeyboardButton("✅ সব অ্যাপ্রুভ", callback_data="rq_all_app"),
+            InlineKeyboardButton("❌ সব রিজেক্ট", callback_data="rq_all_rej")
+        ])
+    else:
+        text = "📋 <b>রিভিউ কিউ</b>\n\n✅ কোনো pending কাজ নেই।" if len(cursors) == 1 else "📋 এই পেজে আর কিছু নেই।"
+
+    nav = []
+    if len(cursors) > 1:
+        nav.append(InlineKeyboardButton("⬅️ আগের", callback_data="rq_prev"))
+    nav.append(InlineKeyboardButton("🔄", callback_data="rq_refresh"))
+    if has_next:
+        nav.append(InlineKeyboardButton("পরের ➡️", callback_data="rq_next"))
+    kb.append(nav)
+    kb.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")])
+
+    try:
+        await update.callback_query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
+    except BadRequest:
+        # কিছু না বদলালে টেলিগ্রাম একই টেক্সট এডিট করতে দেয় না
+        pass
+
+async def _queue_position(admin_id):
+    _, temp_data = await get_user_state_and_data(admin_id)
+    return temp_data.get('rq_cursors') or [None], temp_data.get('rq_ids') or []
+
+def _user_notice(target, approve, data, credit):
+    if target == 'submissions':
+        return f"✅ আপনার জমা দেওয়া কাজ অ্যাপ্রুভ হয়েছে! +{credit} BDT" if approve else "❌ আপনার জমা দেওয়া কাজ রিজেক্ট হয়েছে।"
+    if approve:
+        return "💸 আপনার পেমেন্ট পাঠানো হয়েছে! চেক করুন।"
+    return f"⚠️ আপনার উইথড্র রিকোয়েস্ট রিজেক্ট করা হয়েছে।\n💰 {data.get('amount', 0)} BDT আপনার ব্যালেন্সে ফেরত দেওয়া হয়েছে।"
+
+async def _notify_user(bot, target, approve, data, credit):
+    try:
+        return await send_with_retry(bot, telegram_bucket, data['user_id'], _user_notice(target, approve, data, credit))
+    except Exception as e:
+        logger.warning(f"Review notify to {data.get('user_id')} failed: {e}")
+        return 'failed'
+
+async def _notify_reviewed(bot, approve, processed):
+    await asyncio.gather(*(_notify_user(bot, 'submissions', approve, data, reward) for _, data, reward in processed))
+
+@router.callback("rq_open", guard=is_admin)
+@router.callback("rq_refresh", guard=is_admin)
+async def review_queue_open(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    admin_id = update.callback_query.from_user.id
+    if update.callback_query.data == "rq_open":
+        cursors = [None]
+    else:
+        cursors, _ = await _queue_position(admin_id)
+    await _show_queue(update, admin_id, cursors)
+
+@router.callback("rq_next", guard=is_admin)
+async def review_queue_next(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    admin_id = update.callback_query.from_user.id
+    cursors, ids = await _queue_position(admin_id)
+    if ids:
+        cursors = cursors + [ids[-1]]
+    await _show_queue(update, admin_id, cursors)
+
+@router.callback("rq_prev", guard=is_admin)
+async def review_queue_prev(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    admin_id = update.callback_query.from_user.id
+    cursors, _ = await _queue_position(admin_id)
+    await _show_queue(update, admin_id, cursors[:-1] or [None])
+
+@router.callback("rq_app_", prefix=True, guard=is_admin, answer=False)
+@router.callback("rq_rej_", prefix=True, guard=is_admin, answer=False)
+async def review_queue_single(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    approve = query.data.startswith("rq_app_")
+    sub_id = query.data[len("rq_app_"):]
+    result = await review_submission(sub_id, approve, str(query.from_user.id))
+    if result['status'] != 'ok':
+        await query.answer("আগেই প্রসেস করা হয়েছে" if result['status'] == 'already' else "পাওয়া যায়নি", show_alert=True)
+    else:
+        await query.answer("✅ অ্যাপ্রুভড" if approve else "❌ রিজেক্টেড")
+    cursors, _ = await _queue_position(query.from_user.id)
+    await _show_queue(update, query.from_user.id, cursors)
+    if result['status'] == 'ok':
+        await _notify_reviewed(context.bot, approve, [(sub_id, result['data'], result['reward'])])
+
+@router.callback("rq_all_app", guard=is_admin, answer=False)
+@router.callback("rq_all_rej", guard=is_admin, answer=False)
+async def review_queue_bulk(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    approve = query.data == "rq_all_app"
+    cursors, ids = await _queue_position(query.from_user.id)
+    if not ids:
+        await query.answer("এই পেজে কিছু নেই", show_alert=True)
+        return
+    try:
+        result = await review_submissions_bulk(ids, approve, str(query.from_user.id))
+    except Exception as e:
+        logger.error(f"Bulk review error: {e}")
+        await query.answer("❌ বাল্ক রিভিউ ব্যর্থ, আবার চেষ্টা করুন", show_alert=True)
+        return
+    done = len(result['processed'])
+    await query.answer(f"{'✅ অ্যাপ্রুভড' if approve else '❌ রিজেক্টেড'}: {done}" + (f", আগেই প্রসেসড: {result['skipped']}" if result['skipped'] else ""))
+    await _show_queue(update, query.from_user.id, cursors)
+    await _notify_reviewed(context.bot, approve, result['processed'])
+
+
+# ==========================================
+# বাল্ক প্রসেসিং (ফিল্টার বা আইডি তালিকা, ব্যাকগ্রাউন্ড জব)
+# ==========================================
+# action: approve/reject (সাবমিশন), pay/reject (উইথড্র)
+
+_BULK_ACTIONS = {
+    'sub_approve': ('submissions', 'approve', "✅ কাজ অ্যাপ্রুভ"),
+    'sub_reject': ('submissions', 'reject', "❌ কাজ রিজেক্ট"),
+    'wd_pay': ('withdrawals', 'pay', "💸 উইথড্র পেইড"),
+    'wd_reject': ('withdrawals', 'reject', "↩️ উইথড্র রিজেক্ট (রিফান্ড)"),
+}
+BULK_NOTIFY_CONCURRENCY = 5
+BULK_PROGRESS_INTERVAL = 5.0
+
+def parse_bulk_spec(text, target='submissions'):
+    """অ্যাডমিনের ইনপুট → (ids, filters)। একটি সবসময় None।
+
+    আইডি তালিকা: স্পেস/কমা/নতুন লাইনে আলাদা। ফিল্টার: type=.. user=.. from=YYYY-MM-DD
+    to=YYYY-MM-DD (দুটোই দিনসহ, UTC), অথবা সব pending এর জন্য all। উইথড্রতে type
+    হলো মাধ্যম, যেকোনো কেসে লেখা যায় (ডকে যেভাবে আছে সেভাবে বদলে নেওয়া হয়)।
+    ভুল হলে ValueError।
+    """
+    tokens = text.replace(',', ' ').split()
+    if not tokens:
+        raise ValueError("empty")
+    if tokens != ['all'] and not all('=' in t for t in tokens):
+        if any('=' in t for t in tokens):
+            raise ValueError("mixed ids and filters")
+        return list(dict.fromkeys(tokens)), None
+
+    filters = {}
+    for token in tokens:
+        if token == 'all':
+            continue
+        key, _, value = token.partition('=')
+        if key == 'type' and target == 'withdrawals':
+            if value.lower() not in WITHDRAW_METHODS:
+                raise ValueError(f"unknown method: {value}")
+            filters['type'] = WITHDRAW_METHODS[value.lower()]
+        elif key == 'type':
+            filters['type'] = value
+        elif key == 'user':
+            filters['user_id'] = int(value)
+        elif key in ('from', 'to'):
+            datetime.strptime(value, '%Y-%m-%d')
+            filters[key] = value
+        else:
+            raise ValueError(f"unknown filter: {key}")
+    return None, filters
+
+def _query_filters(filters):
+    """জবের প্যারামিটারে সংরক্ষিত ফিল্টার (তারিখ স্ট্রিং) → repository এর ফিল্টার (datetime)।"""
+    query = {k: v for k, v in filters.items() if k in ('type', 'user_id')}
+    if filters.get('from'):
+        query['since'] = datetime.strptime(filters['from'], '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    if filters.get('to'):
+        query['until'] = datetime.strptime(filters['to'], '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+    return query
+
+def _describe_spec(params):
+    if params.get('ids') is not None:
+        return f"{len(params['ids'])} টি আইডি"
+    filters = params.get('filters') or {}
+    return " ".join(f"{k}={v}" for k, v in filters.items()) or "সব pending"
+
+async def _bulk_chunks(target, ids, filters):
+    """প্রসেস করার আইডি চাঙ্ক ধরে; ফিল্টার হলে pending কুয়েরি কার্সর দিয়ে পেজ ধরে।"""
+    if ids is not None:
+        for start in range(0, len(ids), REVIEW_BULK_CHUNK):
+            yield ids[start:start + REVIEW_BULK_CHUNK]
+        return
+    cursor = None
+    query_filters = _query_filters(filters or {})
+    while True:
+        page = await get_pending_page(target, query_filters, REVIEW_BULK_CHUNK, cursor)
+        if not page:
+            return
+        yield [doc_id for doc_id, _ in page]
+        if len(page) < REVIEW_BULK_CHUNK:
+            return
+        cursor = page[-1][0]
+
+@job_manager.register("bulk_review", resumable=True)
+async def bulk_review_job(ctx):
+    """স্ট্যাটাস পরিবর্তন ও টাকা চাঙ্ক ধরে ট্রানজ্যাকশনে, ইউজার নোটিফিকেশন রেট-লিমিটেড কিউতে।
+
+    কমিট হওয়া প্রতিটি ডকুমেন্ট আর pending থাকে না, তাই রিস্টার্টে জব আবার চললে
+    শুধু বাকিগুলো প্রসেস হয়; তবে আগের প্রসেসের পাঠানো-বাকি নোটিফিকেশন হারায়।
+    """
+    p = ctx.params
+    target, action = p['target'], p['action']
+    approve = action in ('approve', 'pay')
+    by = str(ctx.admin_id)
+    counts = {'processed': 0, 'skipped': 0, 'credited': 0.0, 'sent': 0, 'blocked': 0, 'failed': 0}
+    title = f"{_BULK_ACTIONS[p['key']][2]} — {_describe_spec(p)}"
+    last_report = 0.0
+
+    async def report(header, force=False):
+        nonlocal last_report
+        now = time.monotonic()
+        if not force and now - last_report < BULK_PROGRESS_INTERVAL:
+            return
+        last_report = now
+        text = (
+            f"{header}\n{html.escape(title)}\n\n"
+            f"✔️ প্রসেসড: {counts['processed']} | আগেই প্রসেসড/নেই: {counts['skipped']}\n"
+            f"💵 ব্যালেন্সে যোগ: {counts['credited']:.2f} BDT\n"
+            f"✉️ নোটিফাই: {counts['sent']} | 🚫 {counts['blocked']} | ❌ {counts['failed']}"
+        )
+        try:
+            await ctx.bot.edit_message_text(text, chat_id=p['chat_id'], message_id=p['message_id'], parse_mode='HTML')
+        except BadRequest:
+            pass
+        except Exception as e:
+            logger.warning(f"Bulk progress update failed: {e}")
+        await ctx.progress({k: counts[k] for k in ('processed', 'skipped', 'sent')}, force=force)
+
+    async def notifier(queue):
+        while True:
+            data, credit = await queue.get()
+            try:
+                counts[await _notify_user(ctx.bot, target, approve, data, credit)] += 1
+            finally:
+                queue.task_done()
+
+    queue = asyncio.Queue(maxsize=BULK_NOTIFY_CONCURRENCY * 20)
+    workers = [asyncio.create_task(notifier(queue)) for _ in range(BULK_NOTIFY_CONCURRENCY)]
+    try:
+        async for chunk in _bulk_chunks(target, p.get('ids'), p.get('filters')):
+            if target == 'submissions':
+                result = await review_submissions_bulk(chunk, approve, by)
+            else:
+                result = await process_withdrawals_bulk(chunk, approve, by)
+            counts['processed'] += len(result['processed'])
+            counts['skipped'] += result['skipped']
+            for _, data, credit in result['processed']:
+                counts['credited'] += credit
+                await queue.put((data, credit))
+            await report("⏳ বাল্ক প্রসেস চলছে...")
+        await queue.join()
+        await report("✅ বাল্ক প্রসেস সম্পন্ন", force=True)
+    except asyncio.CancelledError:
+        if ctx.cancel_requested:
+            await report("🛑 বাল্ক প্রসেস বাতিল", force=True)
+        raise
+    except Exception as e:
+        logger.error(f"Bulk review {ctx.id} error: {e}")
+        await report(f"⚠️ ত্রুটির কারণে থেমে গেছে: {html.escape(str(e))[:100]}", force=True)
+        raise
+    finally:
+        for task in workers:
+            task.cancel()
+    return {k: round(v, 2) if isinstance(v, float) else v for k, v in counts.items()}
+
+@router.callback("bulk_menu", guard=is_admin)
+async def bulk_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    kb = [[InlineKeyboardButton(label, callback_data=f"bulk_sel_{key}")] for key, (_, _, label) in _BULK_ACTIONS.items()]
+    kb.append([InlineKeyboardButton("🔙 ব্যাক", callback_data="open_admin_panel")])
+    await update.callback_query.edit_message_text("⚡ <b>বাল্ক প্রসেসিং</b>\n\nকী করতে চান?", reply_markup=InlineKeyboardMarkup(kb), parse_mode='HTML')
+
+@router.callback("bulk_sel_", prefix=True, guard=is_admin)
+async def bulk_select(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    key = query.data.replace("bulk_sel_", "")
+    if key not in _BULK_ACTIONS:
+        return
+    type_hint = "review_data / marketing_sheet" if _BULK_ACTIONS[key][0] == 'submissions' else " / ".join(WITHDRAW_METHODS.values())
+    await update_user_state(query.from_user.id, STATE_ADMIN_BULK_INPUT, {'bulk_key': key})
+    await query.edit_message_text(
+        f"{_BULK_ACTIONS[key][2]}\n\n"
+        "আইডি তালিকা দিন (স্পেস, কমা বা নতুন লাইনে আলাদা), অথবা ফিল্টার:\n"
+        f"<code>type=..</code> ({type_hint})\n"
+        "<code>user=123456</code>\n"
+        "<code>from=2024-01-01 to=2024-01-31</code> (UTC, দুটো দিনসহ)\n"
+        "সব pending এর জন্য <code>all</code>",
+        parse_mode='HTML'
+    )
+
+@router.state(STATE_ADMIN_BULK_INPUT)
+async def bulk_spec_input(update, context, state, temp_data):
+    user_id = update.effective_user.id
+    key = temp_data.get('bulk_key')
+    if key not in _BULK_ACTIONS:
+        await update_user_state(user_id, STATE_IDLE)
+        return
+    target = _BULK_ACTIONS[key][0]
+    try:
+        ids, filters = parse_bulk_spec(update.message.text or "", target)
+    except ValueError:
+        await update.message.reply_text("❌ ইনপুট বোঝা যায়নি। আইডি তালিকা বা type=.. user=.. from=.. to=.. দিন।")
+        return
+    params = {'key': key, 'target': target, 'action': _BULK_ACTIONS[key][1], 'ids': ids, 'filters': filters}
+    if ids is None:
+        matched = await count_pending(target, _query_filters(filters))
+        summary = f"🔎 ফিল্টারে মিলেছে: <b>{matched}</b> টি pending"
+    else:
+        matched = len(ids)
+        summary = f"🆔 আইডি: <b>{matched}</b> টি (pending নয় এমনগুলো বাদ পড়বে)"
+    await update_user_state(user_id, STATE_IDLE, {'bulk': params})
+    kb = [[InlineKeyboardButton("▶️ শুরু করুন", callback_data="bulk_go")], [InlineKeyboardButton("🔙 বাতিল", callback_data="open_admin_panel")]]
+    await update.message.reply_text(
+        f"{_BULK_ACTIONS[key][2]} — {html.escape(_describe_spec(params))}\n\n{summary}",
+        reply_markup=InlineKeyboardMarkup(kb) if matched else None, parse_mode='HTML'
+    )
+
+@router.callback("bulk_go", guard=is_admin, answer=False)
+async def bulk_go(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    _, temp_data = await get_user_state_and_data(query.from_user.id)
+    params = temp_data.get('bulk')
+    if not params:
+        await query.answer("আগেই শুরু হয়েছে বা মেয়াদ শেষ", show_alert=True)
+        return
+    await update_user_state(query.from_user.id, STATE_IDLE, {})
+    await query.answer()
+    await query.edit_message_text("⏳ বাল্ক প্রসেস শুরু হচ্ছে... (/jobs থেকে বাতিল করা যাবে)")
+    params = {**params, 'chat_id': query.message.chat_id, 'message_id': query.message.message_id}
+    await job_manager.submit("bulk_review", params, query.from_user.id)
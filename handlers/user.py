@@ -0,0 +1,186 @@
+import logging
+from telegram import Update
+from telegram.constants import ChatType
+from telegram.ext import ContextTypes
+
+from config import *
+from repository import (
+    get_ui_config, get_refer_bonus, is_admin,
+    get_or_create_user, update_user_state
+)
+from router import router
+from referrals import referral_processor
+from handlers.admin import show_admin_panel
+from handlers.keyboards import get_keyboard, BACK_TO_MAIN
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# কমান্ড
+# ==========================================
+
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    text = """
+🔰 <b>কমান্ড লিস্ট:</b>
+/start - বট চালু করুন
+/admin - অ্যাডমিন প্যানেল (শুধুমাত্র অ্যাডমিন)
+/stats - বটের পারফরম্যান্স মেট্রিক্স (শুধুমাত্র অ্যাডমিন)
+/jobs - ব্যাকগ্রাউন্ড জবের অবস্থা ও বাতিল (শুধুমাত্র অ্যাডমিন)
+/help - কমান্ড লিস্ট দেখুন
+
+💬 <b>সাপোর্ট:</b> কোনো সমস্যা হলে সরাসরি মেসেজ দিন, অ্যাডমিন রিপ্লাই দিবে।
+"""
+    await update.message.reply_text(text, parse_mode='HTML')
+
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if update.effective_chat.type in [ChatType.GROUP, ChatType.SUPERGROUP]:
+        return
+
+    user = update.effective_user
+    user_id = user.id
+    referred_by = None
+
+    if context.args and context.args[0].isdigit():
+        referred_by = int(context.args[0])
+
+    result = await get_or_create_user(user_id, user.username or 'N/A', user.first_name, referred_by)
+
+    if result.get("status") == "blocked":
+        text = "🚫 দুঃখিত! আপনাকে ব্লক করা হয়েছে।"
+        if update.callback_query:
+            await update.callback_query.edit_message_text(text)
+        else:
+            await update.message.reply_text(text)
+        return
+
+    # এই আপডেটে ইউজার ডক আবার লাগলে আর পড়তে হবে না
+    context.user_doc().prime(result.get('data'))
+    await update_user_state(user_id, STATE_IDLE)
+
+    reply_markup = await get_keyboard("main", with_admin=await is_admin(user_id))
+
+    welcome_text = f"আসসালামু আলাইকুম, <b>{user.first_name}</b>! 👋\n\nSkyzone IT বট-এ আপনাকে স্বাগতম।"
+    if result.get("status") == "created" and result['data'].get('referred_by') and str(referred_by) != str(user_id):
+        referral_processor.submit(user_id, referred_by)
+        welcome_text += "\n🎉 রেফারেল লিংকে যোগ দেওয়ার জন্য ধন্যবাদ!"
+
+    if update.callback_query:
+        try:
+            await update.callback_query.edit_message_text(welcome_text, reply_markup=reply_markup, parse_mode='HTML')
+        except:
+            await context.bot.send_message(chat_id=user_id, text=welcome_text, reply_markup=reply_markup, parse_mode='HTML')
+    else:
+        await update.message.reply_text(welcome_text, reply_markup=reply_markup, parse_mode='HTML')
+
+
+# ==========================================
+# মেনু বাটন
+# ==========================================
+
+@router.callback("back_to_main")
+async def back_to_main(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await update_user_state(update.callback_query.from_user.id, STATE_IDLE)
+    await start_command(update, context)
+
+@router.callback("info_links_menu")
+async def info_links_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await query.edit_message_text(
+        "ℹ️ <b>সকল তথ্য ও লিংকসমূহ:</b>\n\nনিচের বাটনগুলো ব্যবহার করে আমাদের সাথে যুক্ত হন।",
+        reply_markup=await get_keyboard("info_links"),
+        parse_mode='HTML'
+    )
+
+@router.callback("submit_work")
+async def submit_work(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(query.from_user.id, STATE_SUB_SELECT_TYPE)
+    await query.edit_message_text("কাজের ধরন নির্বাচন করুন:", reply_markup=await get_keyboard("submit_work"))
+
+@router.callback("sub_market_link")
+async def sub_market_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(query.from_user.id, STATE_SUB_MARKET_LINK)
+    await query.edit_message_text("মার্কেটিং গুগল সিট লিংক দিন:\n(বাতিল করতে /start)")
+
+@router.callback("sub_review_data")
+async def sub_review_data(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await update_user_state(query.from_user.id, STATE_SUB_AWAITING_LINK, temp_data={})
+    await query.edit_message_text("১/৪: স্ক্রিনশট লিংক দিন:\n(বাতিল করতে /start)")
+
+@router.callback("show_account")
+async def show_account(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    user_id = query.from_user.id
+    balance = await context.user_doc().get('balance', 0.0)
+    text = f"👤 <b>অ্যাকাউন্ট</b>\n\nনাম: {query.from_user.first_name}\nID: <code>{user_id}</code>\n💰 ব্যালেন্স: {balance:.2f} BDT"
+    await query.edit_message_text(text, reply_markup=BACK_TO_MAIN, parse_mode='HTML')
+
+@router.callback("start_withdraw")
+async def start_withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    user_id = query.from_user.id
+    balance = await context.user_doc().get('balance', 0.0)
+    if balance < 20.0:
+        await query.edit_message_text(f"❌ সর্বনিম্ন ২০ টাকা ব্যালেন্স প্রয়োজন। আপনার আছে: {balance:.2f} BDT", reply_markup=BACK_TO_MAIN)
+        return
+    await update_user_state(user_id, STATE_WITHDRAW_AWAITING_AMOUNT)
+    await query.edit_message_text(f"উত্তোলনের পরিমাণ লিখুন (বর্তমান: {balance:.2f} BDT):")
+
+@router.callback("show_referral_link")
+async def show_referral_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    user_id = query.from_user.id
+    bonus = await get_refer_bonus()
+    ref_count = await context.user_doc().get('referral_count', 0)
+    ref_link = f"https://t.me/{context.bot.username}?start={user_id}"
+    await query.edit_message_text(
+        f"👥 <b>রেফারেল প্রোগ্রাম</b>\n\nপ্রতি রেফারে বোনাস: <b>{bonus:.2f} BDT</b>\nআপনার মোট রেফার: <b>{ref_count}</b> জন\n\nআপনার লিংক:\n<code>{ref_link}</code>\n\nকপি করে শেয়ার করুন!",
+        reply_markup=BACK_TO_MAIN,
+        parse_mode='HTML'
+    )
+
+@router.callback("show_guide")
+async def show_guide(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    ui_config = await get_ui_config()
+    content = ui_config.get("text_guide_content", {}).get("text", "No guide available.")
+    try:
+        await query.edit_message_text(
+            content,
+            reply_markup=BACK_TO_MAIN,
+            parse_mode='HTML'
+        )
+    except Exception as e:
+        logger.error(f"HTML Parse Error in Guide: {e}")
+        await query.edit_message_text(
+            content,
+            reply_markup=BACK_TO_MAIN
+        )
+
+@router.callback("open_admin_panel", guard=is_admin)
+async def open_admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    await show_admin_panel(update, context, update.callback_query.from_user.id)
+
+
+# ==========================================
+# সাপোর্ট মেসেজ (IDLE স্টেট)
+# ==========================================
+
+@router.state(STATE_IDLE)
+async def forward_support_message(update, context, state, temp_data):
+    text = update.message.text
+    if text.startswith('/'):
+        return
+    user_id = update.effective_user.id
+    msg_header = f"📩 <b>New Support Message</b>\nUser: {update.effective_user.first_name} (ID: <code>{user_id}</code>)\n\nMsg: {text}"
+    target_chat = SUPPORT_GROUP_ID if SUPPORT_GROUP_ID else ADMIN_USER_ID_STR
+
+    if target_chat:
+        try:
+            await context.bot.send_message(chat_id=target_chat, text=msg_header, parse_mode='HTML')
+            await update.message.reply_text("✅ আপনার বার্তা পাঠানো হয়েছে। শীঘ্রই অ্যাডমিন রিপ্লাই দিবে।")
+        except Exception as e:
+            logger.error(f"Chat Forward Error: {e}")
@@ -0,0 +1,157 @@
+import uuid
+import logging
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import ContextTypes
+from firebase_admin import firestore
+
+from config import *
+from repository import update_user_state, get_user_state_and_data, add_submission, create_withdrawal
+from router import router
+from notifier import admin_notifier
+from models import Submission, Withdrawal
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# সাবমিশন ফ্লো
+# ==========================================
+
+@router.state(STATE_SUB_MARKET_LINK)
+async def sub_market_link_input(update, context, state, temp_data):
+    text = update.message.text
+    if 'http' in text:
+        await save_submission(update, context, update.effective_user.id, 'marketing_sheet', link=text)
+    else:
+        await update.message.reply_text("❌ বৈধ লিংক দিন।")
+
+@router.state(STATE_SUB_AWAITING_LINK)
+async def sub_link_input(update, context, state, temp_data):
+    text = update.message.text
+    if 'http' in text:
+        temp_data['link'] = text
+        await update_user_state(update.effective_user.id, STATE_SUB_AWAITING_EMAIL, temp_data)
+        await update.message.reply_text("২/৪: রিভিউ ইমেইল লিখুন:")
+    else:
+        await update.message.reply_text("❌ বৈধ লিংক দিন।")
+
+@router.state(STATE_SUB_AWAITING_EMAIL)
+async def sub_email_input(update, context, state, temp_data):
+    temp_data['email'] = update.message.text
+    await update_user_state(update.effective_user.id, STATE_SUB_AWAITING_NAME, temp_data)
+    await update.message.reply_text("৩/৪: প্রোফাইল নাম লিখুন:")
+
+@router.state(STATE_SUB_AWAITING_NAME)
+async def sub_name_input(update, context, state, temp_data):
+    temp_data['review_name'] = update.message.text
+    await update_user_state(update.effective_user.id, STATE_SUB_AWAITING_DEVICE, temp_data)
+    await update.message.reply_text("৪/৪: ডিভাইস নাম লিখুন:")
+
+@router.state(STATE_SUB_AWAITING_DEVICE)
+async def sub_device_input(update, context, state, temp_data):
+    temp_data['device_name'] = update.message.text
+    await save_submission(update, context, update.effective_user.id, 'review_data', data=temp_data)
+
+# হেল্পার সাবমিশন ফাংশন
+async def save_submission(update, context, user_id, s_type, link=None, data=None):
+    submission = Submission(
+        user_id=user_id,
+        username=update.effective_user.username,
+        first_name=update.effective_user.first_name,
+        type=s_type,
+        submitted_at=firestore.SERVER_TIMESTAMP,
+        link=link or None,
+        data=data or None
+    )
+
+    details_str = ""
+    if link:
+        details_str += f"🔗 Link: {link}\n"
+    if data:
+        if 'link' in data: details_str += f"📸 SS: {data['link']}\n"
+        if 'email' in data: details_str += f"📧 Email: {data['email']}\n"
+        if 'review_name' in data: details_str += f"👤 Name: {data['review_name']}\n"
+        if 'device_name' in data: details_str += f"📱 Device: {data['device_name']}\n"
+
+    sub_id = await add_submission(submission)
+
+    await update_user_state(user_id, STATE_IDLE)
+    await update.message.reply_text("✅ কাজ জমা হয়েছে! অ্যাডমিন চেক করবে।")
+
+    msg = f"🔔 <b>নতুন কাজ জমা!</b>\n\n🆔 User ID: <code>{user_id}</code>\n📂 Type: {s_type}\n\n📝 <b>Details:</b>\n{details_str}"
+    kb = [[InlineKeyboardButton("✅ Approve", callback_data=f"adm_app_{sub_id}"), InlineKeyboardButton("❌ Reject", callback_data=f"adm_rej_{sub_id}")]]
+
+    admin_notifier.notify(msg, parse_mode='HTML', reply_markup=InlineKeyboardMarkup(kb))
+
+
+# ==========================================
+# উইথড্র ফ্লো
+# ==========================================
+
+@router.state(STATE_WITHDRAW_AWAITING_AMOUNT)
+async def withdraw_amount_input(update, context, state, temp_data):
+    user_id = update.effective_user.id
+    try:
+        amt = float(update.message.text)
+        bal = await context.user_doc().get('balance', 0.0)
+        if 20 <= amt <= bal:
+            temp_data['amount'] = amt
+            # আইডেমপোটেন্সি কী: একই উইজার্ড থেকে দুবার সাবমিট হলেও একটিই উইথড্র হবে
+            temp_data['withdraw_id'] = uuid.uuid4().hex
+            await update_user_state(user_id, STATE_WITHDRAW_AWAITING_METHOD, temp_data)
+            kb = [
+                [InlineKeyboardButton("বিকাশ", callback_data="wd_method_bkash"), InlineKeyboardButton("নগদ", callback_data="wd_method_nagad")],
+                [InlineKeyboardButton("বাইনান্স", callback_data="wd_method_binance")]
+            ]
+            await update.message.reply_text("মাধ্যম নির্বাচন করুন:", reply_markup=InlineKeyboardMarkup(kb))
+        else:
+            await update.message.reply_text("❌ পরিমাণ সঠিক নয় বা অপর্যাপ্ত ব্যালেন্স।")
+    except:
+        await update.message.reply_text("❌ সংখ্যা লিখুন।")
+
+@router.callback("wd_method_", prefix=True)
+async def withdraw_method_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    user_id = query.from_user.id
+    _, temp = await get_user_state_and_data(user_id)
+
+    method = WITHDRAW_METHODS.get(query.data.replace("wd_method_", ""))
+    if method:
+        temp['method'] = method
+        await update_user_state(user_id, STATE_WITHDRAW_AWAITING_NUMBER, temp)
+        await query.edit_message_text(f"আপনার {method} নাম্বার/আইডি দিন:")
+
+@router.state(STATE_WITHDRAW_AWAITING_NUMBER)
+async def withdraw_number_input(update, context, state, temp_data):
+    temp_data['target'] = update.message.text
+    await save_withdrawal(update, context, update.effective_user.id, temp_data)
+
+async def save_withdrawal(update, context, user_id, temp_data):
+    withdrawal = Withdrawal(
+        user_id=user_id,
+        amount=temp_data['amount'],
+        method=temp_data['method'],
+        target=temp_data['target'],
+        time=firestore.SERVER_TIMESTAMP
+    )
+
+    w_id = temp_data.get('withdraw_id') or uuid.uuid4().hex
+    result = await create_withdrawal(w_id, withdrawal)
+    await update_user_state(user_id, STATE_IDLE)
+    if result['status'] == 'duplicate':
+        return
+    if result['status'] == 'insufficient':
+        await update.message.reply_text("❌ অপর্যাপ্ত ব্যালেন্স। উইথড্র রিকোয়েস্ট বাতিল হয়েছে।")
+        return
+    if result['status'] != 'created':
+        await update.message.reply_text("❌ ব্যর্থ হয়েছে। আবার চেষ্টা করুন।")
+        return
+    await update.message.reply_text("✅ উইথড্র রিকোয়েস্ট জমা হয়েছে! স্ট্যাটাস: পেন্ডিং।")
+
+    msg = f"💸 <b>উইথড্র!</b>\nID: <code>{user_id}</code>\nAmount: {temp_data['amount']}\nTo: {temp_data['target']} ({temp_data['method']})"
+    kb = [
+        [InlineKeyboardButton("✅ Approve (Paid)", callback_data=f"adm_pay_{w_id}")],
+        [InlineKeyboardButton("❌ Reject (Refund)", callback_data=f"adm_wrej_{w_id}")]
+    ]
+
+    admin_notifier.notify(msg, parse_mode='HTML', reply_markup=InlineKeyboardMarkup(kb))
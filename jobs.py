@@ -0,0 +1,159 @@
+import time
+import asyncio
+import logging
+
+from repository import create_job, update_job, get_running_jobs
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_SAVE_INTERVAL = 5.0
+
+# ফায়ারস্টোরে জবের স্ট্যাটাস
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'
+
+
+class JobContext:
+    """রানার যা পায়: জবের আইডি, প্যারামিটার, বট আর প্রগ্রেস সেভ করার উপায়।"""
+
+    def __init__(self, manager, job_id, kind, params, admin_id):
+        self._manager = manager
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.admin_id = admin_id
+        self.bot = manager.bot
+        self._saved_at = 0.0
+
+    @property
+    def cancel_requested(self):
+        return self.id in self._manager._cancel_requested
+
+    async def progress(self, fields, force=False):
+        """প্রগ্রেস ফায়ারস্টোরে লেখে, তবে PROGRESS_SAVE_INTERVAL এর চেয়ে ঘন ঘন নয়।"""
+        now = time.monotonic()
+        if not force and now - self._saved_at < PROGRESS_SAVE_INTERVAL:
+            return
+        self._saved_at = now
+        try:
+            await update_job(self.id, {'progress': fields})
+        except Exception as e:
+            logger.warning(f"Job {self.id} progress save failed: {e}")
+
+
+class JobManager:
+    """লম্বা অ্যাডমিন কাজ আপডেট হ্যান্ডলারের বাইরে asyncio টাস্কে চালায়।
+
+    প্রতিটি জবের একটি ফায়ারস্টোর ডকুমেন্ট (COLLECTION_JOBS) থাকে যাতে স্ট্যাটাস,
+    প্রগ্রেস আর ফলাফল সংরক্ষিত হয়, তাই /jobs রিস্টার্টের পরও ইতিহাস দেখায়।
+    রিস্টার্টে running জবগুলোর মধ্যে `resumable` গুলো আবার চালু হয়, বাকিগুলো
+    interrupted হিসেবে চিহ্নিত হয়। `exclusive` ধরনের জব একসাথে একটিই চলে।
+    """
+
+    def __init__(self):
+        self.bot = None
+        self._runners = {}
+        self._exclusive = set()
+        self._tasks = {}
+        self._kinds = {}
+        self._submitting = set()
+        self._cancel_requested = set()
+
+    def register(self, kind, resumable=False, exclusive=False):
+        """ডেকোরেটর: runner(ctx: JobContext) -> ফলাফল dict বা None"""
+        def decorator(runner):
+            self._runners[kind] = (runner, resumable)
+            if exclusive:
+                self._exclusive.add(kind)
+            return runner
+        return decorator
+
+    def running_of(self, kind):
+        return [job_id for job_id, job_kind in self._kinds.items() if job_kind == kind]
+
+    async def submit(self, kind, params, admin_id):
+        """নতুন জব চালু করে job_id দেয়; exclusive ধরনের একটি আগে থেকেই চললে None।"""
+        if kind in self._exclusive:
+            if kind in self._submitting or self.running_of(kind):
+                return None
+            # create_job এর await চলাকালীন আরেকটি submit যেন ঢুকে না পড়ে
+            self._submitting.add(kind)
+        try:
+            job_id = await create_job(kind, params, admin_id)
+            self._spawn(job_id, kind, params, admin_id)
+        finally:
+            self._submitting.discard(kind)
+        return job_id
+
+    def _spawn(self, job_id, kind, params, admin_id):
+        ctx = JobContext(self, job_id, kind, params, admin_id)
+        self._kinds[job_id] = kind
+        self._tasks[job_id] = asyncio.create_task(self._run(ctx), name=f"job:{kind}:{job_id}")
+
+    async def _run(self, ctx):
+        runner, _ = self._runners[ctx.kind]
+        started = time.monotonic()
+        try:
+            result = await runner(ctx)
+            await update_job(ctx.id, {'status': DONE, 'result': result or {}})
+            logger.info(f"Job {ctx.kind}/{ctx.id} done in {time.monotonic() - started:.1f}s")
+        except asyncio.CancelledError:
+            # বন্ধ হওয়ার সময় বাতিল হলে স্ট্যাটাস running থাকে, যাতে রিস্টার্টে আবার চলে
+            if ctx.cancel_requested:
+                await update_job(ctx.id, {'status': CANCELLED})
+                logger.info(f"Job {ctx.kind}/{ctx.id} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Job {ctx.kind}/{ctx.id} failed: {e}")
+            try:
+                await update_job(ctx.id, {'status': FAILED, 'error': str(e)})
+            except Exception as save_error:
+                logger.error(f"Job {ctx.id} status save failed: {save_error}")
+        finally:
+            self._tasks.pop(ctx.id, None)
+            self._kinds.pop(ctx.id, None)
+            self._cancel_requested.discard(ctx.id)
+
+    def is_running(self, job_id):
+        return job_id in self._tasks
+
+    def cancel(self, job_id):
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        self._cancel_requested.add(job_id)
+        task.cancel()
+        return True
+
+    async def start(self, bot):
+        """বট চালুর সময়: আগের প্রসেসের অসমাপ্ত জবগুলো আবার চালু বা interrupted করা।"""
+        self.bot = bot
+        try:
+            running = await get_running_jobs()
+        except Exception as e:
+            logger.error(f"Job resume error: {e}")
+            return
+        for job_id, job in running:
+            if job_id in self._tasks:
+                continue
+            runner = self._runners.get(job.get('kind'))
+            if runner is not None and runner[1]:
+                logger.info(f"Resuming job {job['kind']}/{job_id}")
+                self._spawn(job_id, job['kind'], job.get('params', {}), job.get('admin_id'))
+            else:
+                await update_job(job_id, {'status': INTERRUPTED})
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        return {"running": len(self._tasks), "kinds": sorted(self._runners)}
+
+
+job_manager = JobManager()
@@ -0,0 +1,147 @@
+import re
+
+# টেলিগ্রাম নিজেই যেসব লিংক চিনে এন্টিটি বানায়
+LINK_ENTITY_TYPES = ('url', 'text_link')
+
+# এন্টিটি জানা না থাকলে (যেমন বেঞ্চমার্ক বা সাধারণ টেক্সট) ব্যাকআপ হিসেবে টেক্সট থেকে লিংক খোঁজা
+_COMMON_TLDS = (
+    'com', 'net', 'org', 'info', 'biz', 'xyz', 'top', 'site', 'online', 'club', 'shop', 'store',
+    'io', 'me', 'co', 'ly', 'gl', 'gg', 'link', 'click', 'live', 'app', 'dev', 'ru', 'in', 'bd'
+)
+_LINK_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>\"']+"
+    r"|\b(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+(?:" + "|".join(_COMMON_TLDS) + r")\b(?:/[^\s<>\"']*)?",
+    re.IGNORECASE
+)
+_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://", re.IGNORECASE)
+
+CLEAN = 'clean'
+ALLOWED = 'allowed'
+SPAM = 'spam'
+
+
+def normalize_link(link):
+    """'https://www.Example.com/a?b' -> 'example.com/a?b' (তুলনার জন্য)।"""
+    link = _SCHEME_RE.sub('', link.strip().lower())
+    if link.startswith('www.'):
+        link = link[4:]
+    return link
+
+
+# ছোট হাতের টেক্সটে চলে, তাই IGNORECASE লাগে না
+_DOMAIN_RE = re.compile(r"(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}")
+_HOST_END_RE = re.compile(r"[/:?#]")
+
+
+def _host(link):
+    match = _HOST_END_RE.search(link)
+    return link[:match.start()] if match else link
+
+
+def _domain_suffixes(host):
+    """'a.b.com' -> 'a.b.com', 'b.com', 'com' (সাবডোমেইন মেলানোর জন্য)।"""
+    suffixes = [host]
+    dot = host.find('.')
+    while dot != -1:
+        suffixes.append(host[dot + 1:])
+        dot = host.find('.', dot + 1)
+    return suffixes
+
+
+class _Rules:
+    """ডোমেইন এন্ট্রি সেটে (O(1) লুকআপ), পাথসহ এন্ট্রি (যেমন t.me/ourchannel) একটি রেজেক্সে।"""
+
+    def __init__(self, entries):
+        hosts, paths = set(), []
+        for entry in entries:
+            entry = normalize_link(entry).rstrip('/')
+            if not entry:
+                continue
+            if '/' in entry:
+                paths.append(re.escape(entry) + r"(?:[/?#]|$)")
+            else:
+                hosts.add(entry)
+        self.hosts = frozenset(hosts)
+        self.paths = re.compile("^(?:" + "|".join(paths) + ")") if paths else None
+        self.paths_anywhere = re.compile("|".join(paths)) if paths else None
+
+    def __bool__(self):
+        return bool(self.hosts) or self.paths is not None
+
+    def _host_listed(self, host):
+        return any(suffix in self.hosts for suffix in _domain_suffixes(host))
+
+    def match_link(self, link):
+        if self._host_listed(_host(link)):
+            return True
+        return self.paths is not None and self.paths.match(link) is not None
+
+    def search_text(self, lower_text):
+        if self.hosts and '.' in lower_text:
+            for domain in _DOMAIN_RE.findall(lower_text):
+                if self._host_listed(domain):
+                    return True
+        return self.paths_anywhere is not None and self.paths_anywhere.search(lower_text) is not None
+
+
+class LinkFilter:
+    """অনুমতি (allow) ও ব্লক তালিকা একবার কম্পাইল করে রাখে।
+
+    নীতি: ব্লক তালিকার ডোমেইন টেক্সটের যেকোনো জায়গায় থাকলে স্প্যাম; অন্য
+    সব লিংক স্প্যাম, যদি না সেটা অনুমতি তালিকায় থাকে। তালিকা যত বড়ই হোক,
+    প্রতি মেসেজের খরচ শুধু টেক্সটের দৈর্ঘ্যের উপর নির্ভর করে।
+    """
+
+    def __init__(self, allow=(), block=()):
+        self.allow = tuple(allow)
+        self.block = tuple(block)
+        self._allow = _Rules(self.allow)
+        self._block = _Rules(self.block)
+
+    def classify(self, text, links=None):
+        """`links` হলো মেসেজ এন্টিটি থেকে পাওয়া লিংক; None হলে টেক্সট থেকে খোঁজা হয়।"""
+        if self._block and self._block.search_text(text.lower()):
+            return SPAM
+        if links is None:
+            # ডট ছাড়া কোনো লিংক হয় না; বেশিরভাগ চ্যাট মেসেজ এখানেই শেষ
+            links = _LINK_RE.findall(text) if '.' in text else ()
+        if not links:
+            return CLEAN
+        for link in links:
+            link = normalize_link(link)
+            if self._block and self._block.match_link(link):
+                return SPAM
+            if not self._allow.match_link(link):
+                return SPAM
+        return ALLOWED
+
+
+def message_links(message):
+    """মেসেজের url ও text_link এন্টিটি থেকে লিংকগুলো (UTF-16 অফসেট ঠিক রেখে)।"""
+    entities = message.parse_entities(list(LINK_ENTITY_TYPES))
+    return [entity.url if entity.type == 'text_link' else text for entity, text in entities.items()]
+
+
+_compiled = {}
+
+
+def get_link_filter(allow, block):
+    """কনফিগের তালিকা না বদলালে আগের কম্পাইল করা ফিল্টারই ফেরত দেয়।"""
+    key = (tuple(allow or ()), tuple(block or ()))
+    link_filter = _compiled.get(key)
+    if link_filter is None:
+        _compiled.clear()
+        link_filter = _compiled[key] = LinkFilter(*key)
+    return link_filter
+
+
+def parse_domain_list(text):
+    """অ্যাডমিনের লেখা কমা/লাইন আলাদা তালিকা -> পরিষ্কার এন্ট্রির লিস্ট ('-' = খালি)।"""
+    if text.strip() == '-':
+        return []
+    entries = []
+    for item in re.split(r"[,\s]+", text):
+        item = normalize_link(item).rstrip('/')
+        if item and item not in entries:
+            entries.append(item)
+    return entries
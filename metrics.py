@@ -0,0 +1,249 @@
+import time
+import logging
+import contextvars
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+started_at = time.time()
+
+
+# ==========================================
+# হিস্টোগ্রাম ও কাউন্টার (Prometheus টেক্সট ফরম্যাট)
+# ==========================================
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """বাকেটের ভেতরে লিনিয়ার ধরে আনুমানিক কোয়ান্টাইল।"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            if i < len(self.buckets):
+                lower = self.buckets[i]
+        return self.buckets[-1]
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class _Family:
+    def __init__(self, name, help_text, labelnames, factory):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._factory = factory
+        self.children = {}
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self._factory()
+        return child
+
+
+_registry = []
+
+
+def histogram(name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+    family = _Family(name, help_text, labelnames, lambda: Histogram(buckets))
+    family.kind = "histogram"
+    _registry.append(family)
+    return family
+
+
+def counter(name, help_text, labelnames=()):
+    family = _Family(name, help_text, labelnames, Counter)
+    family.kind = "counter"
+    _registry.append(family)
+    return family
+
+
+HANDLER_SECONDS = histogram("bot_handler_seconds", "Handler latency", ("handler", "route"))
+HANDLER_ERRORS = counter("bot_handler_errors", "Handler exceptions", ("handler", "route"))
+UPDATE_SECONDS = histogram("bot_update_seconds", "Total time to process one update")
+UPDATE_FIRESTORE_CALLS = histogram("bot_update_firestore_calls", "Firestore calls per update", buckets=CALL_COUNT_BUCKETS)
+UPDATE_TELEGRAM_CALLS = histogram("bot_update_telegram_calls", "Telegram API calls per update", buckets=CALL_COUNT_BUCKETS)
+FIRESTORE_SECONDS = histogram("firestore_call_seconds", "Firestore call latency", ("op",))
+FIRESTORE_ERRORS = counter("firestore_call_errors", "Failed Firestore calls", ("op",))
+TELEGRAM_SECONDS = histogram("telegram_api_seconds", "Telegram Bot API call latency", ("method",))
+ERRORS = counter("bot_errors", "Unhandled errors reported to the error handler")
+CAUGHT_ERRORS = counter("bot_caught_errors", "Exceptions caught, logged and handled in place", ("where",))
+WRITE_FLUSH_SECONDS = histogram("firestore_write_flush_seconds", "Coalesced write batch commit latency")
+WRITE_FLUSH_OPS = histogram("firestore_write_flush_ops", "Writes per coalesced batch", buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500))
+WRITE_COALESCED = counter("firestore_writes_coalesced", "Writes merged into an earlier write to the same document")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+_INF = 'le="+Inf"'
+
+
+def render_prometheus():
+    lines = []
+    for family in _registry:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for values, child in list(family.children.items()):
+            labels = _labels(family.labelnames, values)
+            if family.kind == "counter":
+                lines.append(f"{family.name}_total{labels} {child.value}")
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip(child.buckets, child.counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{family.name}_bucket{_labels(family.labelnames, values, [le])} {cumulative}")
+            lines.append(f"{family.name}_bucket{_labels(family.labelnames, values, [_INF])} {child.count}")
+            lines.append(f"{family.name}_sum{labels} {child.sum}")
+            lines.append(f"{family.name}_count{labels} {child.count}")
+    return "\n".join(lines) + "\n"
+
+
+# ==========================================
+# প্রতি আপডেটের হিসাব
+# ==========================================
+# একটি আপডেট প্রসেস করার সময় কতগুলো ফায়ারস্টোর ও টেলিগ্রাম কল হলো তা
+# contextvar এ জমা হয়; আপডেট শেষে হিস্টোগ্রামে যায়।
+
+class UpdateScope:
+    __slots__ = ("firestore", "telegram")
+
+    def __init__(self):
+        self.firestore = 0
+        self.telegram = 0
+
+
+_scope = contextvars.ContextVar("update_scope", default=None)
+
+
+def begin_update():
+    scope = UpdateScope()
+    return scope, _scope.set(scope)
+
+
+def end_update(scope, token, seconds):
+    UPDATE_SECONDS.labels().observe(seconds)
+    UPDATE_FIRESTORE_CALLS.labels().observe(scope.firestore)
+    UPDATE_TELEGRAM_CALLS.labels().observe(scope.telegram)
+    _scope.reset(token)
+
+
+def record_firestore(op, seconds, failed=False):
+    FIRESTORE_SECONDS.labels(op).observe(seconds)
+    if failed:
+        FIRESTORE_ERRORS.labels(op).inc()
+    scope = _scope.get()
+    if scope is not None:
+        scope.firestore += 1
+
+
+def record_telegram(method, seconds):
+    TELEGRAM_SECONDS.labels(method).observe(seconds)
+    scope = _scope.get()
+    if scope is not None:
+        scope.telegram += 1
+
+
+def record_handler(handler, route, seconds, failed):
+    HANDLER_SECONDS.labels(handler, route).observe(seconds)
+    if failed:
+        HANDLER_ERRORS.labels(handler, route).inc()
+
+
+def record_error(where):
+    """যে এক্সেপশন ধরে লগ করে চালিয়ে যাওয়া হয় (এরর হ্যান্ডলারে পৌঁছায় না), সেটা গোনে।"""
+    CAUGHT_ERRORS.labels(where).inc()
+
+
+def timed(handler, route="command"):
+    """CommandHandler এর মতো সরাসরি রেজিস্টার করা (router এর বাইরের) হ্যান্ডলারের সময় মাপে।"""
+    name = handler.__name__
+
+    async def wrapper(update, context):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await handler(update, context)
+            failed = False
+            return result
+        finally:
+            record_handler(name, route, time.perf_counter() - started, failed)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+# ==========================================
+# অ্যাডমিন /stats এর জন্য সারাংশ
+# ==========================================
+
+def summary(top=10):
+    def rows(family, limit):
+        items = [(values, child) for values, child in family.children.items() if child.count]
+        items.sort(key=lambda item: item[1].count, reverse=True)
+        return [
+            {
+                "labels": values,
+                "count": child.count,
+                "avg_ms": child.sum / child.count * 1000,
+                "p95_ms": child.quantile(0.95) * 1000,
+            }
+            for values, child in items[:limit]
+        ]
+
+    update_seconds = UPDATE_SECONDS.labels()
+    firestore_calls = UPDATE_FIRESTORE_CALLS.labels()
+    telegram_calls = UPDATE_TELEGRAM_CALLS.labels()
+    return {
+        "uptime": time.time() - started_at,
+        "updates": update_seconds.count,
+        "update_p50_ms": update_seconds.quantile(0.5) * 1000,
+        "update_p95_ms": update_seconds.quantile(0.95) * 1000,
+        "firestore_per_update": (firestore_calls.sum / firestore_calls.count) if firestore_calls.count else 0.0,
+        "telegram_per_update": (telegram_calls.sum / telegram_calls.count) if telegram_calls.count else 0.0,
+        "errors": ERRORS.labels().value,
+        "caught_errors": sum(child.value for child in CAUGHT_ERRORS.children.values()),
+        "firestore_errors": sum(child.value for child in FIRESTORE_ERRORS.children.values()),
+        "handlers": rows(HANDLER_SECONDS, top),
+        "firestore": rows(FIRESTORE_SECONDS, top),
+        "telegram": rows(TELEGRAM_SECONDS, top),
+    }
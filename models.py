@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field, fields as dataclass_fields
+
+from config import DEFAULT_UI_CONFIG, STATE_IDLE
+
+
+# ==========================================
+# বেস: __slots__ ডেটাক্লাস ও ফায়ারস্টোর কনভার্টার
+# ==========================================
+
+class _Document:
+    """ফায়ারস্টোর ডকের টাইপড রূপ।
+
+    __slots__ থাকায় প্রতিটি অবজেক্টে __dict__ নেই, তাই অনেক ইউজার একসাথে
+    মেমরিতে রাখলে ডিক্টের চেয়ে কম জায়গা লাগে। ফায়ারস্টোরে যা যায় তা আগের
+    ডিক্টের মতোই: to_dict() একই কী দেয়, ঐচ্ছিক ফিল্ড None হলে বাদ যায়।
+    টাইমস্টাম্প ফিল্ডের ডিফল্ট None; SERVER_TIMESTAMP শুধু তৈরির জায়গায় বসে,
+    যাতে পড়া অবজেক্টে কখনো রাইট সেন্টিনেল না থাকে।
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data, fields=None):
+        """doc.to_dict() থেকে অবজেক্ট (data None হলে None)।
+
+        অজানা কী বাদ যায় আর না থাকা ফিল্ড ডিফল্ট পায়। fields দিলে শুধু
+        সেগুলো নেওয়া হয়, যেমন projection() দিয়ে পড়া ডকে।
+        """
+        if data is None:
+            return None
+        names = cls.FIELDS if fields is None else [name for name in cls.FIELDS if name in fields]
+        return cls(**{name: data[name] for name in names if name in data})
+
+    @classmethod
+    def from_snapshot(cls, doc, fields=None):
+        return cls.from_dict(doc.to_dict(), fields) if doc.exists else None
+
+    @classmethod
+    def projection(cls, fields=None):
+        """select() / get(field_paths=) এর ফিল্ড লিস্ট; মডেলে নেই এমন নাম হলে ValueError।"""
+        if fields is None:
+            return list(cls.FIELDS)
+        unknown = set(fields) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"{cls.__name__} has no fields {sorted(unknown)}")
+        return list(fields)
+
+    def to_dict(self):
+        """ফায়ারস্টোরে লেখার ডিক্ট।"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None or name not in self._OPTIONAL:
+                data[name] = value
+        return data
+
+
+def _document(*optional):
+    """ডেকোরেটর: slots=True ডেটাক্লাস; FIELDS আর None হলে বাদ যাওয়া ঐচ্ছিক ফিল্ডগুলো ক্লাসে রাখে।"""
+    def wrap(cls):
+        cls = dataclass(slots=True)(cls)
+        cls.FIELDS = tuple(f.name for f in dataclass_fields(cls))
+        cls._OPTIONAL = frozenset(optional)
+        return cls
+    return wrap
+
+
+# ==========================================
+# মডেল
+# ==========================================
+
+@_document('referral_window_start', 'referral_window_count')
+class User(_Document):
+    user_id: int = None
+    username: str = None
+    first_name: str = None
+    balance: float = 0.0
+    referred_by: int = None
+    referral_count: int = 0
+    joined_at: object = None
+    is_blocked: bool = False
+    state: int = STATE_IDLE
+    temp_data: dict = field(default_factory=dict)
+    # রেফারেল ভেলোসিটি রুলের কাউন্টার (referrals.py), প্রথম রেফারেলের পর আসে
+    referral_window_start: object = None
+    referral_window_count: int = None
+
+
+@_document('link', 'data', 'by', 'reward', 'processed_at')
+class Submission(_Document):
+    user_id: int = None
+    username: str = None
+    first_name: str = None
+    type: str = None
+    status: str = 'pending'
+    submitted_at: object = None
+    link: str = None
+    data: dict = None
+    # রিভিউয়ের পর
+    by: str = None
+    reward: float = None
+    processed_at: object = None
+
+
+@_document('by', 'processed_at')
+class Withdrawal(_Document):
+    user_id: int = None
+    amount: float = 0.0
+    method: str = None
+    target: str = None
+    status: str = 'pending'
+    time: object = None
+    # পে/রিজেক্টের পর
+    by: str = None
+    processed_at: object = None
+
+
+@_document()
+class UiConfig(_Document):
+    """system/ui_config: বাটন/লিংক এলিমেন্ট আর কাস্টম বাটন।
+
+    হ্যান্ডলারগুলো কী ধরে পড়ে, তাই ক্যাশে to_dict() এর ডিক্টটাই থাকে।
+    """
+    elements: dict = field(default_factory=dict)
+    custom_buttons: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data, fields=None):
+        """সেভ করা কনফিগ DEFAULT_UI_CONFIG এর উপর মেশায়; এলিমেন্টের যে ফিল্ড সেভ নেই তা ডিফল্ট থেকে।"""
+        elements = {k: (v.copy() if isinstance(v, dict) else v) for k, v in DEFAULT_UI_CONFIG.items() if k != "custom_buttons"}
+        custom_buttons = list(DEFAULT_UI_CONFIG.get("custom_buttons", []))
+        for k, v in (data or {}).items():
+            if k == "custom_buttons":
+                custom_buttons = v
+            elif isinstance(elements.get(k), dict) and isinstance(v, dict):
+                elements[k].update(v)
+            else:
+                elements[k] = v
+        return cls(elements, custom_buttons)
+
+    def to_dict(self):
+        data = dict(self.elements)
+        data["custom_buttons"] = self.custom_buttons
+        return data
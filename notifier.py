@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from collections import deque
+
+from config import NOTIFY_CONCURRENCY
+from repository import get_all_admin_ids
+from broadcast import telegram_bucket, send_with_retry
+
+logger = logging.getLogger(__name__)
+
+
+class AdminNotifier:
+    """অ্যাডমিনদের কাছে নোটিফিকেশন পাঠানোর ব্যাকগ্রাউন্ড কিউ।
+
+    হ্যান্ডলার শুধু notify() করে ফিরে যায়; ওয়ার্কার প্রতিটি নোটিফিকেশন সব
+    অ্যাডমিনকে একসাথে (NOTIFY_CONCURRENCY সীমার মধ্যে) পাঠায়। বারবার চেষ্টার পরও
+    ব্যর্থ হলে ডেড-লেটার হিসেবে লগ হয় এবং `dead_letters` এ থাকে।
+    """
+
+    def __init__(self, concurrency=NOTIFY_CONCURRENCY, dead_letter_size=100):
+        self.concurrency = concurrency
+        self.dead_letters = deque(maxlen=dead_letter_size)
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._task = None
+        self._bot = None
+
+    def notify(self, text, **kwargs):
+        self._queue.put_nowait((text, kwargs))
+
+    async def _send(self, admin_id, text, kwargs):
+        async with self._semaphore:
+            result = await send_with_retry(self._bot, telegram_bucket, admin_id, text, **kwargs)
+        if result != 'sent':
+            self.dead_letters.append({'admin_id': admin_id, 'text': text, 'result': result})
+            logger.error(f"DEAD-LETTER admin notification to {admin_id} ({result}): {text[:80]!r}")
+
+    async def _deliver(self, text, kwargs):
+        admin_ids = await get_all_admin_ids()
+        results = await asyncio.gather(
+            *(self._send(admin_id, text, kwargs) for admin_id in admin_ids),
+            return_exceptions=True
+        )
+        for admin_id, result in zip(admin_ids, results):
+            if isinstance(result, Exception):
+                self.dead_letters.append({'admin_id': admin_id, 'text': text, 'result': repr(result)})
+                logger.error(f"DEAD-LETTER admin notification to {admin_id}: {result}")
+
+    async def _worker(self):
+        while True:
+            text, kwargs = await self._queue.get()
+            try:
+                await self._deliver(text, kwargs)
+            except Exception as e:
+                logger.error(f"Admin notify error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self, bot):
+        self._bot = bot
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._worker())
+
+    async def stop(self, timeout=10):
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._queue.qsize()} admin notifications dropped on shutdown")
+        self._task.cancel()
+        self._task = None
+
+
+admin_notifier = AdminNotifier()
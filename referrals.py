@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from firebase_admin import firestore
+
+from config import (
+    REFERRAL_BATCH_SIZE, REFERRAL_BATCH_INTERVAL,
+    REFERRAL_VELOCITY_LIMIT, REFERRAL_VELOCITY_WINDOW, REFERRAL_MIN_ACCOUNT_AGE
+)
+from repository import get_refer_bonus, apply_referral, get_pending_referrals
+
+logger = logging.getLogger(__name__)
+
+
+class ReferralProcessor:
+    """রেফারেল বোনাস /start এর বাইরে, ব্যাচে দেয়।
+
+    /start শুধু referrals কালেকশনে pending ইভেন্ট লেখে (ইউজার ডকের সাথে একই
+    ব্যাচে) আর submit() করে। ওয়ার্কার `interval` সেকেন্ডে জমা ইভেন্টগুলো
+    (সর্বোচ্চ `batch_size`) একসাথে নেয়, বোনাসের পরিমাণ একবার পড়ে, আর প্রতিটি
+    রেফারেল একটি ট্রানজ্যাকশনে রুলগুলো যাচাই করে credited/rejected করে। একই
+    রেফারারের ইভেন্টগুলো ক্রমানুসারে চলে যাতে ট্রানজ্যাকশন কনটেনশন না হয়।
+    রিস্টার্টে pending ইভেন্টগুলো ফায়ারস্টোর থেকে আবার কিউতে আসে।
+    """
+
+    def __init__(self, batch_size=REFERRAL_BATCH_SIZE, interval=REFERRAL_BATCH_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._rules = []
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.batches = 0
+        self.credited = 0
+        self.rejected = Counter()
+
+    def rule(self, fn):
+        """ডেকোরেটর: fn(referral, referrer, now) -> রিজেক্টের কারণ (str) বা None।
+
+        referrer হলো রেফারারের ইউজার ডক (না থাকলে None), ট্রানজ্যাকশনের ভেতরে পড়া।
+        """
+        self._rules.append(fn)
+        return fn
+
+    def submit(self, referred_id, referrer_id):
+        self._queue.put_nowait((referred_id, referrer_id))
+
+    def _check(self, now):
+        def check(referral, referrer):
+            for rule in self._rules:
+                reason = rule(referral, referrer, now)
+                if reason:
+                    return reason
+            return None
+        return check
+
+    def _referrer_fields(self, now):
+        # ভেলোসিটি রুলের জন্য ফিক্সড-উইন্ডো কাউন্টার, বোনাসের সাথে একই ট্রানজ্যাকশনে
+        def fields(referrer):
+            start = referrer.get('referral_window_start')
+            if start is None or now - start >= timedelta(seconds=REFERRAL_VELOCITY_WINDOW):
+                return {'referral_window_start': now, 'referral_window_count': 1}
+            return {'referral_window_count': firestore.Increment(1)}
+        return fields
+
+    async def _process_one(self, referred_id, bonus, now):
+        try:
+            result = await apply_referral(referred_id, bonus, self._check(now), self._referrer_fields(now))
+        except Exception as e:
+            # ইভেন্ট pending থাকে; পরের রিস্টার্টে আবার চেষ্টা হবে
+            logger.error(f"Referral {referred_id} error: {e}")
+            return
+        if result['status'] == 'credited':
+            self.credited += 1
+            logger.info(f"Referral bonus {bonus} given to {result['referrer']}")
+        elif result['status'] == 'rejected':
+            self.rejected[result['reason']] += 1
+            logger.info(f"Referral {referred_id} by {result['referrer']} rejected: {result['reason']}")
+
+    async def _process_batch(self, events):
+        bonus = await get_refer_bonus()
+        now = datetime.now(timezone.utc)
+        by_referrer = {}
+        for referred_id, referrer_id in events:
+            by_referrer.setdefault(str(referrer_id), []).append(referred_id)
+
+        async def lane(referred_ids):
+            for referred_id in referred_ids:
+                await self._process_one(referred_id, bonus, now)
+
+        await asyncio.gather(*(lane(ids) for ids in by_referrer.values()))
+        self.batches += 1
+
+    async def _worker(self):
+        while True:
+            events = [await self._queue.get()]
+            if self._queue.qsize() < self.batch_size - 1:
+                # ব্যাকলগ থাকলে অপেক্ষা নয়; নইলে আরও ইভেন্ট জমার সুযোগ
+                await asyncio.sleep(self.interval)
+            while len(events) < self.batch_size and not self._queue.empty():
+                events.append(self._queue.get_nowait())
+            try:
+                await self._process_batch(events)
+            except Exception as e:
+                logger.error(f"Referral batch error: {e}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+
+    async def start(self):
+        try:
+            for referred_id, referrer_id in await get_pending_referrals():
+                self.submit(referred_id, referrer_id)
+        except Exception as e:
+            logger.error(f"Pending referral load error: {e}")
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._worker())
+
+    async def stop(self, timeout=10):
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            # ইভেন্টগুলো ফায়ারস্টোরে pending থাকে, পরের চালুতে প্রসেস হবে
+            logger.warning(f"{self._queue.qsize()} referrals left pending on shutdown")
+        self._task.cancel()
+        self._task = None
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "credited": self.credited,
+            "rejected": dict(self.rejected),
+            "queued": self._queue.qsize(),
+        }
+
+
+referral_processor = ReferralProcessor()
+
+
+# ==========================================
+# অ্যাবিউজ রুল (ক্রমানুসারে, প্রথম কারণেই রিজেক্ট)
+# ==========================================
+
+@referral_processor.rule
+def self_referral(referral, referrer, now):
+    if str(referral['referrer']) == str(referral['referred']):
+        return "self_referral"
+
+@referral_processor.rule
+def referrer_missing_or_blocked(referral, referrer, now):
+    if referrer is None:
+        return "referrer_missing"
+    if referrer.get('is_blocked', False):
+        return "referrer_blocked"
+
+@referral_processor.rule
+def circular_referral(referral, referrer, now):
+    # A→B এর পর B→A: দুই অ্যাকাউন্ট একে অপরকে রেফার করে বোনাস তোলা
+    if str(referrer.get('referred_by')) == str(referral['referred']):
+        return "circular"
+
+@referral_processor.rule
+def referrer_account_age(referral, referrer, now):
+    joined = referrer.get('joined_at')
+    if hasattr(joined, 'tzinfo') and now - joined < timedelta(seconds=REFERRAL_MIN_ACCOUNT_AGE):
+        return "referrer_too_new"
+
+@referral_processor.rule
+def referrer_velocity(referral, referrer, now):
+    start = referrer.get('referral_window_start')
+    if start is None or now - start >= timedelta(seconds=REFERRAL_VELOCITY_WINDOW):
+        return None
+    if referrer.get('referral_window_count', 0) >= REFERRAL_VELOCITY_LIMIT:
+        return "velocity"
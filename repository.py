@@ -0,0 +1,1104 @@
+import json
+import time
+import asyncio
+import logging
+import functools
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+# Firebase Imports
+import firebase_admin
+from firebase_admin import credentials, firestore, db as realtime_db
+
+from cache import TTLCache
+from state_store import StateStore, SQLiteStateBackend
+from cooldown import CooldownTracker
+from metrics import record_firestore, record_error
+from write_coalescer import WriteCoalescer
+from models import User, Submission, Withdrawal, UiConfig
+from config import (
+    FIREBASE_JSON, REALTIME_DATABASE_URL, FIRESTORE_MAX_WORKERS, ADMIN_USER_ID_STR,
+    CONFIG_CACHE_TTL, FIRESTORE_LISTENERS, ADMIN_ROSTER_TTL,
+    USER_PAGE_SIZE, STATE_BACKEND, STATE_SQLITE_PATH, STATE_CACHE_SIZE, STATE_FLUSH_INTERVAL,
+    GROUP_REPLY_COOLDOWN, GROUP_COOLDOWN_CACHE_SIZE, WRITE_BATCH_INTERVAL, WRITE_BATCH_MAX_OPS,
+    REVIEW_QUEUE_PAGE_SIZE, REVIEW_BULK_CHUNK,
+    DEFAULT_UI_CONFIG, COLLECTION_USERS, COLLECTION_SUBMISSIONS, COLLECTION_WITHDRAWALS,
+    COLLECTION_ADMINS, COLLECTION_BROADCASTS, COLLECTION_JOBS, COLLECTION_REFERRALS, COLLECTION_GROUP_ACTIVITY, DOC_SYSTEM_CONFIG, DOC_UI_CONFIG, DOC_SYSTEM_STATS, STATE_IDLE
+)
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# ফায়ারবেস ইনিশিয়ালাইজেশন
+# ==========================================
+db = None
+rtdb = None
+
+# সিঙ্ক ফায়ারস্টোর ক্লায়েন্টের প্রতিটি কল এই সীমিত থ্রেড পুলে চলে,
+# যাতে একটি স্লো রিড পুরো asyncio লুপ আটকে না রাখে।
+_executor = ThreadPoolExecutor(max_workers=FIRESTORE_MAX_WORKERS, thread_name_prefix="firestore")
+
+
+def init_firebase():
+    global db, rtdb
+    try:
+        if FIREBASE_JSON:
+            try:
+                cred_info = json.loads(FIREBASE_JSON)
+                cred = credentials.Certificate(cred_info)
+                if not firebase_admin._apps:
+                    firebase_admin.initialize_app(cred, {
+                        'databaseURL': REALTIME_DATABASE_URL
+                    })
+                db = firestore.client()
+                rtdb = realtime_db.reference()
+                logger.info("✅ Firebase Connected Successfully!")
+            except Exception as e:
+                logger.error(f"❌ Firebase Init Error: {e}")
+        else:
+            logger.warning("⚠️ FIREBASE_SERVICE_ACCOUNT missing!")
+    except Exception as e:
+        logger.error(f"❌ Critical setup error: {e}")
+
+
+def db_ready():
+    return db is not None
+
+
+# মেট্রিক্সে প্রতিটি কলের ধরন; কলার নিজেই বলে দেয়, ফাংশনের নাম থেকে আন্দাজ নয়
+FIRESTORE_OPS = frozenset(("read", "write", "transaction"))
+
+
+async def run_sync(op, fn, *args, **kwargs):
+    """ব্লকিং ফায়ারস্টোর কল থ্রেড পুলে চালিয়ে ফলাফল await করে।
+
+    op: "read", "write" বা "transaction" (মেট্রিক্সের লেবেল)। একই fn এ রিড আর
+    রাইট দুটোই থাকলে সেটা ট্রানজ্যাকশন, নয়তো আলাদা দুটি কল।
+    """
+    if op not in FIRESTORE_OPS:
+        raise ValueError(f"Unknown Firestore op: {op}")
+    if op == "transaction":
+        # ট্রানজ্যাকশন যেন এই প্রসেসের আগের (জমে থাকা) ব্যালেন্স লেখাগুলো দেখে
+        await write_coalescer.flush()
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    failed = True
+    try:
+        result = await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+        failed = False
+        return result
+    finally:
+        record_firestore(op, time.perf_counter() - started, failed)
+
+
+def shutdown_executor():
+    _executor.shutdown(wait=True)
+
+
+def _run_transaction(fn):
+    """fn(transaction) কে ফায়ারস্টোর ট্রানজ্যাকশনে চালায় (কনটেনশনে অটো রিট্রাই)। থ্রেড পুলে কল করতে হবে।"""
+    return firestore.transactional(fn)(db.transaction())
+
+
+def _stats_ref():
+    return db.collection("system").document(DOC_SYSTEM_STATS)
+
+
+# ==========================================
+# ব্যাচ করা লেখা
+# ==========================================
+# ব্যালেন্স আর system/stats এর কাউন্টারের লেখা প্রতিটি আলাদা RPC না হয়ে
+# কয়েক মিলিসেকেন্ড জমে একটি WriteBatch এ যায়; stats ডকের Increment গুলো মিশে একটি।
+
+async def _commit_writes(mutations):
+    batch = db.batch()
+    for kind, ref, fields in mutations:
+        if kind == 'update':
+            batch.update(ref, fields)
+        else:
+            batch.set(ref, fields, merge=(kind == 'merge'))
+    await run_sync("write", batch.commit)
+
+
+write_coalescer = WriteCoalescer(_commit_writes, WRITE_BATCH_MAX_OPS, WRITE_BATCH_INTERVAL)
+
+
+# ==========================================
+# কনফিগ (system/config, system/ui_config)
+# ==========================================
+# প্রতিটি মেনু রেন্ডারে ui_config পড়া লাগত; এখন TTL ক্যাশ থেকে আসে এবং
+# নিচের যেকোনো রাইটের পর invalidate হয়।
+config_cache = TTLCache(CONFIG_CACHE_TTL)
+_config_watches = []
+
+
+def invalidate_config(doc_name=None):
+    config_cache.invalidate(doc_name)
+
+
+def start_config_listeners():
+    """অন্য রেপ্লিকা থেকে কনফিগ বদলালে স্ন্যাপশট লিসেনার ক্যাশ মুছে দেয়।"""
+    if db is None or not FIRESTORE_LISTENERS or _config_watches:
+        return
+
+    def _make_callback(doc_name):
+        def _on_snapshot(doc_snapshots, changes, read_time):
+            config_cache.invalidate(doc_name)
+        return _on_snapshot
+
+    for doc_name in (DOC_SYSTEM_CONFIG, DOC_UI_CONFIG):
+        watch = db.collection("system").document(doc_name).on_snapshot(_make_callback(doc_name))
+        _config_watches.append(watch)
+    logger.info("Config snapshot listeners started")
+
+
+def stop_config_listeners():
+    while _config_watches:
+        try:
+            _config_watches.pop().unsubscribe()
+        except Exception as e:
+            logger.error(f"Config listener stop error: {e}")
+
+
+def get_cache_stats():
+    return {
+        "config": config_cache.stats(), "state": state_store.stats(), "cooldown": group_cooldown.stats(),
+        "writes": write_coalescer.stats()
+    }
+
+
+def _merge_ui_config(saved_config):
+    return UiConfig.from_dict(saved_config).to_dict()
+
+
+async def get_system_config():
+    if db is None: return {}
+
+    def _op():
+        doc = db.collection("system").document(DOC_SYSTEM_CONFIG).get()
+        return doc.to_dict() if doc.exists else {}
+
+    try:
+        return await config_cache.get_or_load(DOC_SYSTEM_CONFIG, lambda: run_sync("read", _op))
+    except Exception as e:
+        logger.exception(f"System Config Error: {e}")
+        record_error("get_system_config")
+        return {}
+
+async def get_ui_config():
+    if db is None: return DEFAULT_UI_CONFIG
+
+    async def _load():
+        ref = db.collection("system").document(DOC_UI_CONFIG)
+        doc = await run_sync("read", ref.get)
+        if doc.exists:
+            return _merge_ui_config(doc.to_dict())
+        await run_sync("write", ref.set, DEFAULT_UI_CONFIG)
+        return DEFAULT_UI_CONFIG
+
+    try:
+        return await config_cache.get_or_load(DOC_UI_CONFIG, _load)
+    except Exception as e:
+        logger.error(f"UI Config Error: {e}")
+        return DEFAULT_UI_CONFIG
+
+def get_ui_config_version():
+    """কিবোর্ড মেমোইজেশনের কী: UI কনফিগ নতুন করে লোড বা মুছলে বদলায়।"""
+    return config_cache.version_of(DOC_UI_CONFIG)
+
+async def add_custom_button(text, url):
+    try:
+        current_config = await get_ui_config()
+        buttons = list(current_config.get("custom_buttons", []))
+        buttons.append({"text": text, "url": url})
+        await run_sync("write", db.collection("system").document(DOC_UI_CONFIG).update, {"custom_buttons": buttons})
+        invalidate_config(DOC_UI_CONFIG)
+        return True
+    except Exception as e:
+        logger.error(f"Add Btn Error: {e}")
+        return False
+
+async def remove_custom_button(index):
+    try:
+        current_config = await get_ui_config()
+        buttons = list(current_config.get("custom_buttons", []))
+        if 0 <= index < len(buttons):
+            buttons.pop(index)
+            await run_sync("write", db.collection("system").document(DOC_UI_CONFIG).update, {"custom_buttons": buttons})
+            invalidate_config(DOC_UI_CONFIG)
+            return True
+        return False
+    except Exception as e:
+        logger.exception(f"Remove Button Error: {e}")
+        record_error("remove_custom_button")
+        return False
+
+async def update_ui_element(key, field, value):
+    if db is None: return False
+    ref = db.collection("system").document(DOC_UI_CONFIG)
+    try:
+        await run_sync("write", ref.update, {f"{key}.{field}": value})
+        invalidate_config(DOC_UI_CONFIG)
+        return True
+    except Exception as e:
+        # ডক না থাকলে update ব্যর্থ হয়, তখন পুরো কনফিগ set
+        logger.warning(f"UI element update failed, rewriting config: {e}")
+        record_error("update_ui_element")
+        full_config = await get_ui_config()
+        full_config = {k: (v.copy() if isinstance(v, dict) else v) for k, v in full_config.items()}
+        if key in full_config:
+            full_config[key][field] = value
+        else:
+            full_config[key] = {field: value, "show": True}
+        await run_sync("write", ref.set, full_config)
+        invalidate_config(DOC_UI_CONFIG)
+        return True
+
+async def update_system_config(key, value):
+    if db is None: return False
+    ref = db.collection("system").document(DOC_SYSTEM_CONFIG)
+    try:
+        await run_sync("write", ref.update, {key: value})
+    except Exception as e:
+        # ডক না থাকলে update ব্যর্থ হয়, তখন merge দিয়ে set
+        logger.warning(f"System config update failed, merging instead: {e}")
+        record_error("update_system_config")
+        await run_sync("write", ref.set, {key: value}, merge=True)
+    invalidate_config(DOC_SYSTEM_CONFIG)
+    return True
+
+async def get_refer_bonus():
+    sys_conf = await get_system_config()
+    if 'refer_bonus' in sys_conf:
+        return float(sys_conf['refer_bonus'])
+    return 3.00
+
+async def set_refer_bonus(amount):
+    await update_system_config('refer_bonus', amount)
+    return True
+
+
+# ==========================================
+# অ্যাডমিন
+# ==========================================
+
+# অ্যাডমিন তালিকা মেমরিতে থাকে: স্টার্টআপে লোড হয়, ADMIN_ROSTER_TTL পর পর
+# ব্যাকগ্রাউন্ডে রিফ্রেশ হয় (বা লিসেনার চালু থাকলে সাথে সাথে), আর এই বটের
+# add/remove সাথে সাথেই সেটে প্রতিফলিত হয়। তাই অথরাইজেশন চেকে কোনো I/O নেই।
+_admin_ids = frozenset()
+_admin_roster_loaded_at = None
+_admin_roster_refresh = None
+_admin_watch = None
+
+
+async def load_admin_roster():
+    global _admin_ids, _admin_roster_loaded_at
+    if db is None: return
+    try:
+        ids = await run_sync("read", lambda: [doc.id for doc in db.collection(COLLECTION_ADMINS).stream()])
+        _admin_ids = frozenset(ids)
+        _admin_roster_loaded_at = time.monotonic()
+    except Exception as e:
+        logger.error(f"Error fetching admin IDs: {e}")
+
+
+def _refresh_admin_roster_if_stale():
+    global _admin_roster_refresh
+    if db is None or _admin_watch is not None:
+        return
+    if _admin_roster_loaded_at is not None and time.monotonic() - _admin_roster_loaded_at < ADMIN_ROSTER_TTL:
+        return
+    if _admin_roster_refresh is None or _admin_roster_refresh.done():
+        _admin_roster_refresh = asyncio.get_running_loop().create_task(load_admin_roster())
+
+
+def start_admin_listener():
+    global _admin_watch
+    if db is None or not FIRESTORE_LISTENERS or _admin_watch is not None:
+        return
+
+    def _on_snapshot(doc_snapshots, changes, read_time):
+        global _admin_ids, _admin_roster_loaded_at
+        _admin_ids = frozenset(doc.id for doc in doc_snapshots)
+        _admin_roster_loaded_at = time.monotonic()
+
+    _admin_watch = db.collection(COLLECTION_ADMINS).on_snapshot(_on_snapshot)
+    logger.info("Admin roster listener started")
+
+
+def stop_admin_listener():
+    global _admin_watch
+    if _admin_watch is not None:
+        try:
+            _admin_watch.unsubscribe()
+        except Exception as e:
+            logger.error(f"Admin listener stop error: {e}")
+        _admin_watch = None
+
+
+async def is_super_admin(user_id):
+    return str(user_id) == str(ADMIN_USER_ID_STR)
+
+async def is_admin(user_id):
+    if str(user_id) == str(ADMIN_USER_ID_STR):
+        return True
+    if db:
+        if _admin_roster_loaded_at is None:
+            await load_admin_roster()
+        else:
+            _refresh_admin_roster_if_stale()
+        return str(user_id) in _admin_ids
+    return False
+
+async def get_all_admin_ids():
+    admin_ids = set()
+    if ADMIN_USER_ID_STR:
+        admin_ids.add(str(ADMIN_USER_ID_STR))
+    if db:
+        if _admin_roster_loaded_at is None:
+            await load_admin_roster()
+        else:
+            _refresh_admin_roster_if_stale()
+        admin_ids.update(_admin_ids)
+    return list(admin_ids)
+
+async def add_admin(admin_id, added_by):
+    global _admin_ids
+    if db is None: return False
+    await run_sync("write", db.collection(COLLECTION_ADMINS).document(str(admin_id)).set, {
+        'added_by': added_by,
+        'role': 'admin',
+        'added_at': firestore.SERVER_TIMESTAMP
+    })
+    _admin_ids = _admin_ids | {str(admin_id)}
+    return True
+
+async def remove_admin(admin_id):
+    global _admin_ids
+    if db is None: return False
+    try:
+        if str(admin_id) == str(ADMIN_USER_ID_STR):
+            return False
+        await run_sync("write", db.collection(COLLECTION_ADMINS).document(str(admin_id)).delete)
+        _admin_ids = _admin_ids - {str(admin_id)}
+        return True
+    except Exception as e:
+        logger.exception(f"Remove Admin Error: {e}")
+        record_error("remove_admin")
+        return False
+
+
+# ==========================================
+# ইউজার
+# ==========================================
+
+async def get_or_create_user(user_id, username, first_name, referred_by=None):
+    if db is None: return {"status": "NO_DB"}
+    try:
+        user_ref = db.collection(COLLECTION_USERS).document(str(user_id))
+        user_doc = await run_sync("read", user_ref.get)
+
+        if user_doc.exists:
+            user_data = user_doc.to_dict()
+            if user_data.get('is_blocked', False):
+                return {"status": "blocked"}
+            state_store.prime(user_id, user_data.get('state', STATE_IDLE), user_data.get('temp_data'))
+            return {"status": "exists", "data": user_data}
+        else:
+            new_user = User(user_id=user_id, username=username, first_name=first_name, referred_by=referred_by,
+                            joined_at=firestore.SERVER_TIMESTAMP).to_dict()
+            # ইউজার ডক, system/stats এর কাউন্টার আর রেফারেল ইভেন্ট একই ব্যাচে;
+            # রেফারারের বোনাস পরে referral_processor দেয় (referrals.py)
+            writes = [
+                ('set', user_ref, new_user),
+                ('merge', _stats_ref(), {'total_users': firestore.Increment(1)}),
+            ]
+            if referred_by and str(user_id) != str(referred_by):
+                writes.append(('set', db.collection(COLLECTION_REFERRALS).document(str(user_id)), {
+                    'referrer': referred_by,
+                    'referred': user_id,
+                    'status': 'pending',
+                    'created_at': firestore.SERVER_TIMESTAMP
+                }))
+            await write_coalescer.write(writes)
+            state_store.prime(user_id, STATE_IDLE, {})
+            return {"status": "created", "data": new_user}
+    except Exception as e:
+        logger.error(f"User Create Error: {e}")
+        return {"status": "NO_DB"}
+
+async def update_user_fields(user_id, fields, balance_delta=0.0):
+    """ইউজার ডকের কয়েকটি ফিল্ড একসাথে লেখে; balance_delta থাকলে ব্যালেন্স আর system/stats ও একই ব্যাচে।
+
+    ইউজার না থাকলে (বা লেখা ব্যর্থ হলে) False।
+    """
+    if db is None: return False
+    fields = dict(fields)
+    writes = []
+    if balance_delta:
+        fields['balance'] = firestore.Increment(balance_delta)
+        writes.append(('merge', _stats_ref(), {'total_balance': firestore.Increment(balance_delta)}))
+    if not fields:
+        return True
+    try:
+        await write_coalescer.write([('update', db.collection(COLLECTION_USERS).document(str(user_id)), fields)] + writes)
+        return True
+    except Exception as e:
+        # ইউজার না থাকলেও এখানে আসে (update এ NotFound)
+        logger.warning(f"User Update Error ({user_id}): {e}")
+        record_error("update_user_fields")
+        return False
+
+async def update_balance(user_id, amount, extra_fields=None):
+    """ব্যালেন্স (আর চাইলে একই ডকের অন্য ফিল্ড) ও system/stats একসাথে বাড়ায়; ইউজার না থাকলে False।"""
+    return await update_user_fields(user_id, extra_fields or {}, amount)
+
+async def get_user_doc(user_id):
+    """পুরো ইউজার ডক (না থাকলে None)। হ্যান্ডলার সরাসরি না ডেকে context.user_doc() ব্যবহার করে।"""
+    if db is None: return None
+    doc = await run_sync("read", db.collection(COLLECTION_USERS).document(str(user_id)).get)
+    return doc.to_dict() if doc.exists else None
+
+async def get_user(user_id, fields=None):
+    """ইউজার ডক User হিসেবে (না থাকলে None); fields দিলে শুধু সেগুলো পড়া হয়।"""
+    if db is None: return None
+    field_paths = User.projection(fields) if fields is not None else None
+    doc = await run_sync("read", db.collection(COLLECTION_USERS).document(str(user_id)).get, field_paths)
+    return User.from_snapshot(doc)
+
+async def get_balance(user_id):
+    user = await get_user(user_id, ('balance',))
+    return user.balance if user is not None else 0.0
+
+async def get_user_referral_count(user_id):
+    user = await get_user(user_id, ('referral_count',))
+    return user.referral_count if user is not None else 0
+
+async def get_system_stats():
+    """system/stats থেকে মোট ইউজার ও মোট ব্যালেন্স (O(1), কখনো স্ক্যান নয়)।
+
+    কাউন্টার চালুর আগের ইউজাররা এতে নেই; কখনো রিকনসাইল না হয়ে থাকলে
+    'reconciled' False আসে আর বট চালুর সময় reconcile_stats জব সেটা ঠিক করে।
+    """
+    if db is None: return {'total_users': 0, 'total_balance': 0.0, 'reconciled': False}
+    doc = await run_sync("read", _stats_ref().get)
+    data = doc.to_dict() if doc.exists else {}
+    return {
+        'total_users': data.get('total_users', 0),
+        'total_balance': data.get('total_balance', 0.0),
+        'reconciled': 'reconciled_at' in data
+    }
+
+async def get_total_system_liability():
+    if db is None: return 0.0
+    try:
+        return (await get_system_stats())['total_balance']
+    except Exception as e:
+        logger.error(f"Total Liability Error: {e}")
+        return 0.0
+
+# একই প্রসেসে একসাথে একটিই রিকনসাইল
+_reconcile_lock = asyncio.Lock()
+
+async def reconcile_system_stats():
+    """সব ইউজার স্ক্যান করে system/stats এর ড্রিফট ঠিক করে এবং ড্রিফট রিটার্ন করে।
+
+    কাউন্টার আর পুরো স্ক্যান একই read_time এ (কাউন্টারের স্ন্যাপশটের সময়) পড়া
+    হয়, তাই স্ক্যান চলাকালীন আসা লেখা দুটোর কোনোটিতেই নেই; সেগুলো নিজেদের
+    Increment দিয়েই কাউন্টারে যায়। ড্রিফট Increment হিসেবে একটি ট্রানজ্যাকশনে
+    লেখা হয়, আর এর মধ্যে অন্য কোনো রিকনসাইল (অন্য রেপ্লিকা) শেষ হয়ে থাকলে
+    লেখা হয় না, যাতে ড্রিফট দুবার যোগ না হয়। ফায়ারস্টোর (PITR ছাড়া) এক ঘণ্টার
+    পুরোনো read_time পর্যন্ত পড়তে দেয়, তাই স্ক্যান এর মধ্যে শেষ হতে হবে।
+    অন্য রিকনসাইল আগে শেষ হলে RuntimeError।
+    """
+    if db is None: return None
+
+    async with _reconcile_lock:
+        before = await run_sync("read", _stats_ref().get)
+        recorded = before.to_dict() if before.exists else {}
+
+        actual_users = 0
+        actual_balance = 0.0
+        async for page in iter_user_pages(('balance',), read_time=before.read_time):
+            actual_users += len(page)
+            actual_balance += sum(data.get('balance', 0.0) for _, data in page)
+
+        drift = {
+            'total_users': actual_users - recorded.get('total_users', 0),
+            'total_balance': actual_balance - recorded.get('total_balance', 0.0)
+        }
+
+        def _apply(transaction):
+            current = _stats_ref().get(transaction=transaction)
+            current = current.to_dict() if current.exists else {}
+            if current.get('reconciled_at') != recorded.get('reconciled_at'):
+                return False
+            transaction.set(_stats_ref(), {
+                'total_users': firestore.Increment(drift['total_users']),
+                'total_balance': firestore.Increment(drift['total_balance']),
+                'reconciled_at': firestore.SERVER_TIMESTAMP
+            }, merge=True)
+            return True
+
+        if not await run_sync("transaction", _run_transaction, _apply):
+            raise RuntimeError("another reconcile finished during the scan")
+    return {'total_users': actual_users, 'total_balance': actual_balance, 'drift': drift}
+
+async def update_user_state(user_id, state, temp_data=None):
+    await state_store.set(user_id, state, temp_data)
+
+async def get_user_state_and_data(user_id):
+    return await state_store.get(user_id)
+
+async def get_users_page(fields, start_after=None, limit=USER_PAGE_SIZE, read_time=None):
+    """ডকুমেন্ট আইডি ক্রমে এক পেজ ইউজার: [(doc_id, data), ...]। start_after আগের পেজের শেষ doc_id।
+
+    read_time দিলে সেই মুহূর্তের ডেটা।
+    """
+    if db is None: return []
+    query = db.collection(COLLECTION_USERS).select(list(fields)).order_by('__name__').limit(limit)
+    if start_after is not None:
+        query = query.start_after({'__name__': start_after})
+    options = {'read_time': read_time} if read_time is not None else {}
+    return await run_sync("read", lambda: [(doc.id, doc.to_dict() or {}) for doc in query.stream(**options)])
+
+async def iter_user_pages(fields=('user_id',), page_size=USER_PAGE_SIZE, start_after=None, read_time=None):
+    """কার্সর পেজিনেশনে পুরো users কালেকশন পেজ ধরে দেয়।
+
+    কলার একটি পেজ প্রসেস করার সময় পরের পেজ আগেই আনা হয়, আর মেমরিতে একসাথে
+    সর্বোচ্চ দুটি পেজ থাকে, ইউজার সংখ্যা যত বড়ই হোক। read_time দিলে সব পেজ
+    একই মুহূর্তের।
+    """
+    next_page = asyncio.ensure_future(get_users_page(fields, start_after, page_size, read_time))
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            if not page:
+                return
+            if len(page) == page_size:
+                next_page = asyncio.ensure_future(get_users_page(fields, page[-1][0], page_size, read_time))
+            yield page
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+async def iter_user_ids(page_size=USER_PAGE_SIZE, start_after=None):
+    async for page in iter_user_pages(('user_id',), page_size, start_after):
+        for doc_id, data in page:
+            yield data.get('user_id', doc_id)
+
+async def get_total_users_count():
+    if db is None: return 0
+    try:
+        return (await get_system_stats())['total_users']
+    except Exception as e:
+        logger.exception(f"User Count Error: {e}")
+        record_error("get_total_users_count")
+        return 0
+
+async def delete_user(user_id):
+    if db is None: return False
+    user_ref = db.collection(COLLECTION_USERS).document(str(user_id))
+
+    def _delete(transaction):
+        doc = user_ref.get(transaction=transaction)
+        if not doc.exists:
+            return False
+        transaction.delete(user_ref)
+        transaction.set(_stats_ref(), {
+            'total_users': firestore.Increment(-1),
+            'total_balance': firestore.Increment(-(doc.to_dict().get('balance', 0.0)))
+        }, merge=True)
+        return True
+
+    try:
+        deleted = await run_sync("transaction", _run_transaction, _delete)
+        state_store.forget(user_id)
+        return deleted
+    except Exception as e:
+        logger.exception(f"Delete User Error ({user_id}): {e}")
+        record_error("delete_user")
+        return False
+
+async def toggle_block_user(user_id, block_status):
+    if db is None: return False
+    try:
+        await run_sync("write", db.collection(COLLECTION_USERS).document(str(user_id)).update, {'is_blocked': block_status})
+        return True
+    except Exception as e:
+        logger.exception(f"Block User Error ({user_id}): {e}")
+        record_error("toggle_block_user")
+        return False
+
+
+# ==========================================
+# কথোপকথন স্টেট (state, temp_data)
+# ==========================================
+# state/temp_data শুধু বট নিজেই পড়ে, তাই প্রতিটি ধাপে রাউন্ড ট্রিপের বদলে
+# মেমরিতে রাখা হয় আর ব্যাচ করে ইউজার ডকুমেন্টে লেখা হয়।
+
+class FirestoreStateBackend:
+    BATCH_LIMIT = 500
+
+    def _load(self, user_id):
+        doc = db.collection(COLLECTION_USERS).document(user_id).get(field_paths=['state', 'temp_data'])
+        if not doc.exists:
+            return None
+        data = doc.to_dict() or {}
+        return data.get('state', STATE_IDLE), data.get('temp_data') or {}
+
+    def _fields(self, state, temp_data):
+        fields = {'state': state}
+        if temp_data is not None:
+            fields['temp_data'] = temp_data
+        return fields
+
+    def _save_many(self, items):
+        items = list(items.items())
+        for start in range(0, len(items), self.BATCH_LIMIT):
+            chunk = items[start:start + self.BATCH_LIMIT]
+            batch = db.batch()
+            for user_id, (state, temp_data) in chunk:
+                batch.update(db.collection(COLLECTION_USERS).document(user_id), self._fields(state, temp_data))
+            try:
+                batch.commit()
+            except Exception:
+                # ডিলিট হওয়া ইউজারের জন্য পুরো ব্যাচ ব্যর্থ হয়; তখন একটি একটি করে লেখা
+                for user_id, (state, temp_data) in chunk:
+                    try:
+                        db.collection(COLLECTION_USERS).document(user_id).update(self._fields(state, temp_data))
+                    except Exception as e:
+                        logger.warning(f"State write skipped for {user_id}: {e}")
+
+    async def load(self, user_id):
+        if db is None: return None
+        return await run_sync("read", self._load, user_id)
+
+    async def save_many(self, items):
+        if db is None: return
+        await run_sync("write", self._save_many, items)
+
+
+def _make_state_backend():
+    if STATE_BACKEND == "sqlite":
+        return SQLiteStateBackend(STATE_SQLITE_PATH)
+    return FirestoreStateBackend()
+
+
+state_store = StateStore(
+    _make_state_backend(),
+    capacity=STATE_CACHE_SIZE,
+    flush_interval=STATE_FLUSH_INTERVAL,
+    default_state=STATE_IDLE
+)
+
+
+# ==========================================
+# সাপোর্ট গ্রুপ অ্যাক্টিভিটি
+# ==========================================
+
+# প্রতিটি গ্রুপ মেসেজে ফায়ারস্টোর রিডের বদলে কুলডাউন মেমরিতে থাকে;
+# ডকুমেন্ট শুধু প্রথম দেখায় পড়া হয় আর রিপ্লাইয়ের সময় ব্যাচে লেখা হয়।
+
+class FirestoreCooldownBackend:
+    BATCH_LIMIT = 500
+
+    def _load(self, user_id):
+        doc = db.collection(COLLECTION_GROUP_ACTIVITY).document(user_id).get(field_paths=['last_reply_time'])
+        if not doc.exists:
+            return None
+        last_time = (doc.to_dict() or {}).get('last_reply_time')
+        return last_time.timestamp() if isinstance(last_time, datetime) else None
+
+    def _save_many(self, items):
+        items = list(items.items())
+        for start in range(0, len(items), self.BATCH_LIMIT):
+            batch = db.batch()
+            for user_id, (replied_at, username) in items[start:start + self.BATCH_LIMIT]:
+                batch.set(db.collection(COLLECTION_GROUP_ACTIVITY).document(user_id), {
+                    'last_reply_time': datetime.fromtimestamp(replied_at, timezone.utc),
+                    'username': username or "N/A"
+                }, merge=True)
+            batch.commit()
+
+    async def load(self, user_id):
+        if db is None: return None
+        return await run_sync("read", self._load, user_id)
+
+    async def save_many(self, items):
+        if db is None: return
+        await run_sync("write", self._save_many, items)
+
+
+group_cooldown = CooldownTracker(
+    FirestoreCooldownBackend(),
+    period=GROUP_REPLY_COOLDOWN,
+    capacity=GROUP_COOLDOWN_CACHE_SIZE,
+    flush_interval=STATE_FLUSH_INTERVAL
+)
+
+
+# ==========================================
+# সাবমিশন এবং উইথড্র
+# ==========================================
+
+async def add_submission(submission: Submission):
+    _, ref = await run_sync("write", db.collection(COLLECTION_SUBMISSIONS).add, submission.to_dict())
+    return ref.id
+
+async def get_submission(sub_id):
+    doc = await run_sync("read", db.collection(COLLECTION_SUBMISSIONS).document(sub_id).get)
+    return doc.to_dict() if doc.exists else None
+
+async def review_submission(sub_id, approve, by):
+    """pending → approved/rejected; অ্যাপ্রুভ হলে রিওয়ার্ড ও system/stats একই ট্রানজ্যাকশনে।
+
+    একসাথে একাধিক অ্যাডমিন ক্লিক করলেও শুধু একটি ট্রানজ্যাকশন pending দেখতে পায়,
+    তাই রিওয়ার্ড একবারই যায়। স্ট্যাটাস: "ok", "not_found" বা "already"।
+    """
+    reward = 0.0
+    if approve:
+        reward = float((await get_system_config()).get('task_reward', 5.0))
+    sub_ref = db.collection(COLLECTION_SUBMISSIONS).document(sub_id)
+
+    def _review(transaction):
+        doc = sub_ref.get(transaction=transaction)
+        if not doc.exists:
+            return {"status": "not_found"}
+        data = doc.to_dict()
+        if data.get('status') != 'pending':
+            return {"status": "already"}
+        user_ref = db.collection(COLLECTION_USERS).document(str(data['user_id']))
+        credit = approve and user_ref.get(transaction=transaction).exists
+        transaction.update(sub_ref, {
+            'status': 'approved' if approve else 'rejected',
+            'by': by,
+            'reward': reward if credit else 0.0,
+            'processed_at': firestore.SERVER_TIMESTAMP
+        })
+        if credit:
+            transaction.update(user_ref, {'balance': firestore.Increment(reward)})
+            transaction.set(_stats_ref(), {'total_balance': firestore.Increment(reward)}, merge=True)
+        return {"status": "ok", "data": data, "reward": reward if credit else 0.0}
+
+    return await run_sync("transaction", _run_transaction, _review)
+
+# বাল্ক প্রসেসিংয়ের টার্গেট: কালেকশন, "type" ফিল্টারের ফিল্ড আর সময়ের ফিল্ড
+PENDING_TARGETS = {
+    'submissions': (COLLECTION_SUBMISSIONS, 'type', 'submitted_at'),
+    'withdrawals': (COLLECTION_WITHDRAWALS, 'method', 'time'),
+}
+
+def _pending_query(target, filters=None):
+    """status == pending, পুরোনো থেকে নতুন ক্রমে; filters: type, user_id, since, until (datetime)।
+
+    ফিল্টারের প্রতিটি সম্ভাব্য মিশ্রণের (status, [type], [user_id], সময়) জন্য
+    firestore.indexes.json এ আলাদা কম্পোজিট ইনডেক্স আছে; ইনডেক্স মার্জিংয়ের
+    উপর নির্ভর করা হয় না।
+    """
+    collection_name, type_field, time_field = PENDING_TARGETS[target]
+    filters = filters or {}
+    query = db.collection(collection_name).where('status', '==', 'pending')
+    if filters.get('type'):
+        query = query.where(type_field, '==', filters['type'])
+    if filters.get('user_id') is not None:
+        query = query.where('user_id', '==', filters['user_id'])
+    if filters.get('since') is not None:
+        query = query.where(time_field, '>=', filters['since'])
+    if filters.get('until') is not None:
+        query = query.where(time_field, '<', filters['until'])
+    return query.order_by(time_field)
+
+async def get_pending_page(target, filters=None, limit=REVIEW_QUEUE_PAGE_SIZE, start_after=None):
+    """এক পেজ pending ডকুমেন্ট: [(doc_id, data), ...]।
+
+    start_after আগের পেজের শেষ doc_id; সেটি এর মধ্যে প্রসেস হয়ে গেলেও তার
+    সময় থেকেই পরের পেজ শুরু হয়।
+    """
+    if db is None: return []
+    collection = db.collection(PENDING_TARGETS[target][0])
+    query = _pending_query(target, filters).limit(limit)
+
+    def _op():
+        page_query = query
+        if start_after is not None:
+            cursor = collection.document(start_after).get()
+            if cursor.exists:
+                page_query = page_query.start_after(cursor)
+        return [(doc.id, doc.to_dict() or {}) for doc in page_query.stream()]
+
+    return await run_sync("read", _op)
+
+async def get_pending_submissions_page(limit=REVIEW_QUEUE_PAGE_SIZE, start_after=None):
+    return await get_pending_page('submissions', None, limit, start_after)
+
+async def count_pending(target, filters=None):
+    """ফিল্টারে মেলা pending ডকুমেন্টের সংখ্যা (ডকুমেন্ট না পড়ে অ্যাগ্রিগেশন কুয়েরিতে)।"""
+    if db is None: return 0
+    aggregate = _pending_query(target, filters).count()
+
+    def count():
+        return int(aggregate.get()[0][0].value)
+
+    return await run_sync("read", count)
+
+async def _process_pending_bulk(collection_name, ids, status, by, credit_of, credit_field, chunk_size):
+    """pending ডকুমেন্টগুলোকে `status` এ নেয়, প্রতি `chunk_size` টি একটি ট্রানজ্যাকশনে।
+
+    প্রতিটি চাঙ্কে সব ডকুমেন্ট ও ইউজার একটি করে get_all এ পড়া হয়, একই ইউজারের
+    টাকা একটি Increment এ যায় আর system/stats একবারই লেখা হয়। pending নয় বা
+    পাওয়া যায়নি এমন আইডি বাদ পড়ে, তাই একক অ্যাকশনের সাথে একসাথে চললেও টাকা
+    দুবার যায় না। একটি চাঙ্ক ব্যর্থ হলে আগের চাঙ্কগুলো কমিটেড থাকে।
+
+    credit_of(data): ইউজারের ব্যালেন্সে কত যোগ হবে (ইউজার না থাকলে যোগ হয় না)।
+    ফলাফল: {"processed": [(doc_id, data, credit), ...], "skipped": n}
+    """
+    collection = db.collection(collection_name)
+    processed, skipped = [], 0
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = list(dict.fromkeys(ids[start:start + chunk_size]))
+
+        def _process(transaction, chunk=chunk):
+            docs = {doc.id: doc for doc in db.get_all([collection.document(i) for i in chunk], transaction=transaction)}
+            pending = []
+            for doc_id in chunk:
+                doc = docs.get(doc_id)
+                data = doc.to_dict() if doc is not None and doc.exists else None
+                if data is not None and data.get('status') == 'pending':
+                    pending.append((doc_id, data, credit_of(data)))
+
+            existing = set()
+            user_refs = {str(data['user_id']): db.collection(COLLECTION_USERS).document(str(data['user_id'])) for _, data, credit in pending if credit}
+            if user_refs:
+                existing = {doc.id for doc in db.get_all(list(user_refs.values()), transaction=transaction) if doc.exists}
+
+            credits = {}
+            results = []
+            for doc_id, data, credit in pending:
+                uid = str(data['user_id'])
+                if uid not in existing:
+                    credit = 0.0
+                fields = {'status': status, 'by': by, 'processed_at': firestore.SERVER_TIMESTAMP}
+                if credit_field:
+                    fields[credit_field] = credit
+                transaction.update(collection.document(doc_id), fields)
+                if credit:
+                    credits[uid] = credits.get(uid, 0.0) + credit
+                results.append((doc_id, data, credit))
+            for uid, amount in credits.items():
+                transaction.update(user_refs[uid], {'balance': firestore.Increment(amount)})
+            if credits:
+                transaction.set(_stats_ref(), {'total_balance': firestore.Increment(sum(credits.values()))}, merge=True)
+            return results
+
+        results = await run_sync("transaction", _run_transaction, _process)
+        processed.extend(results)
+        skipped += len(chunk) - len(results)
+
+    return {"processed": processed, "skipped": skipped}
+
+async def review_submissions_bulk(sub_ids, approve, by, chunk_size=REVIEW_BULK_CHUNK):
+    """একাধিক সাবমিশন approve/reject (review_submission এর বাল্ক রূপ)। credit = রিওয়ার্ড।"""
+    reward = 0.0
+    if approve:
+        reward = float((await get_system_config()).get('task_reward', 5.0))
+    return await _process_pending_bulk(
+        COLLECTION_SUBMISSIONS, sub_ids, 'approved' if approve else 'rejected', by,
+        lambda data: reward, 'reward', chunk_size
+    )
+
+async def process_withdrawals_bulk(w_ids, pay, by, chunk_size=REVIEW_BULK_CHUNK):
+    """একাধিক উইথড্র paid অথবা rejected (টাকা ফেরতসহ)। credit = ফেরত দেওয়া পরিমাণ।"""
+    if pay:
+        return await _process_pending_bulk(COLLECTION_WITHDRAWALS, w_ids, 'paid', by, lambda data: 0.0, None, chunk_size)
+    return await _process_pending_bulk(
+        COLLECTION_WITHDRAWALS, w_ids, 'rejected', by, lambda data: float(data.get('amount', 0)), None, chunk_size
+    )
+
+async def get_withdrawal(w_id):
+    doc = await run_sync("read", db.collection(COLLECTION_WITHDRAWALS).document(w_id).get)
+    return doc.to_dict() if doc.exists else None
+
+async def create_withdrawal(w_id, withdrawal: Withdrawal):
+    """ব্যালেন্স যাচাই, কাটা এবং উইথড্র ডক তৈরি একটি ট্রানজ্যাকশনে।
+
+    w_id হলো আইডেমপোটেন্সি কী (উইজার্ড শুরুতে তৈরি), তাই একই রিকোয়েস্ট দুবার
+    এলে দ্বিতীয়টি "duplicate" পায় এবং টাকা আর কাটে না।
+    স্ট্যাটাস: "created", "duplicate", "insufficient" বা "NO_DB"।
+    """
+    if db is None: return {"status": "NO_DB"}
+    amount = withdrawal.amount
+    w_data = withdrawal.to_dict()
+    w_ref = db.collection(COLLECTION_WITHDRAWALS).document(w_id)
+    user_ref = db.collection(COLLECTION_USERS).document(str(withdrawal.user_id))
+
+    def _create(transaction):
+        if w_ref.get(transaction=transaction).exists:
+            return {"status": "duplicate"}
+        user_doc = user_ref.get(transaction=transaction)
+        balance = (user_doc.to_dict() or {}).get('balance', 0.0) if user_doc.exists else 0.0
+        if amount <= 0 or amount > balance:
+            return {"status": "insufficient", "balance": balance}
+        transaction.set(w_ref, w_data)
+        transaction.update(user_ref, {'balance': firestore.Increment(-amount)})
+        transaction.set(_stats_ref(), {'total_balance': firestore.Increment(-amount)}, merge=True)
+        return {"status": "created", "balance": balance - amount}
+
+    return await run_sync("transaction", _run_transaction, _create)
+
+async def mark_withdrawal_paid(w_id, by):
+    """pending → paid। স্ট্যাটাস: "ok", "not_found" বা "already" (আগেই প্রসেস হয়েছে)।"""
+    w_ref = db.collection(COLLECTION_WITHDRAWALS).document(w_id)
+
+    def _pay(transaction):
+        doc = w_ref.get(transaction=transaction)
+        if not doc.exists:
+            return {"status": "not_found"}
+        data = doc.to_dict()
+        if data.get('status') != 'pending':
+            return {"status": "already"}
+        transaction.update(w_ref, {'status': 'paid', 'by': by, 'processed_at': firestore.SERVER_TIMESTAMP})
+        return {"status": "ok", "data": data}
+
+    return await run_sync("transaction", _run_transaction, _pay)
+
+async def reject_withdrawal(w_id, by):
+    """pending → rejected এবং একই ট্রানজ্যাকশনে টাকা ফেরত। স্ট্যাটাস mark_withdrawal_paid এর মতো।"""
+    w_ref = db.collection(COLLECTION_WITHDRAWALS).document(w_id)
+
+    def _reject(transaction):
+        doc = w_ref.get(transaction=transaction)
+        if not doc.exists:
+            return {"status": "not_found"}
+        data = doc.to_dict()
+        if data.get('status') != 'pending':
+            return {"status": "already"}
+        amount = data.get('amount', 0)
+        user_ref = db.collection(COLLECTION_USERS).document(str(data['user_id']))
+        user_exists = user_ref.get(transaction=transaction).exists
+        transaction.update(w_ref, {'status': 'rejected', 'by': by, 'processed_at': firestore.SERVER_TIMESTAMP})
+        if user_exists:
+            transaction.update(user_ref, {'balance': firestore.Increment(amount)})
+            transaction.set(_stats_ref(), {'total_balance': firestore.Increment(amount)}, merge=True)
+        return {"status": "ok", "data": data, "refunded": user_exists}
+
+    return await run_sync("transaction", _run_transaction, _reject)
+
+
+# ==========================================
+# রেফারেল
+# ==========================================
+
+async def apply_referral(referred_id, bonus, check, referrer_fields):
+    """একটি pending রেফারেল একটি ট্রানজ্যাকশনে credited বা rejected করে।
+
+    check(referral, referrer) রিজেক্টের কারণ দেয় (অথবা None); referrer এর ডক
+    না থাকলে None পায়। referrer_fields(referrer) বোনাসের সাথে রেফারারের ডকে
+    আর কী লেখা হবে (যেমন ভেলোসিটি কাউন্টার)। ইভেন্ট দুবার এলেও দ্বিতীয়টি
+    pending দেখে না, তাই বোনাস একবারই যায়।
+    স্ট্যাটাস: "credited", "rejected" (সাথে reason) বা "already"।
+    """
+    referral_ref = db.collection(COLLECTION_REFERRALS).document(str(referred_id))
+
+    def _apply(transaction):
+        doc = referral_ref.get(transaction=transaction)
+        referral = doc.to_dict() if doc.exists else None
+        if referral is None or referral.get('status') != 'pending':
+            return {"status": "already"}
+        referrer_ref = db.collection(COLLECTION_USERS).document(str(referral['referrer']))
+        referrer_doc = referrer_ref.get(transaction=transaction)
+        referrer = referrer_doc.to_dict() if referrer_doc.exists else None
+        reason = check(referral, referrer)
+        if reason:
+            transaction.update(referral_ref, {'status': 'rejected', 'reason': reason, 'processed_at': firestore.SERVER_TIMESTAMP})
+            return {"status": "rejected", "reason": reason, "referrer": referral['referrer']}
+        transaction.update(referrer_ref, {
+            'balance': firestore.Increment(bonus),
+            'referral_count': firestore.Increment(1),
+            **referrer_fields(referrer)
+        })
+        transaction.set(_stats_ref(), {'total_balance': firestore.Increment(bonus)}, merge=True)
+        transaction.update(referral_ref, {'status': 'credited', 'bonus': bonus, 'processed_at': firestore.SERVER_TIMESTAMP})
+        return {"status": "credited", "referrer": referral['referrer']}
+
+    return await run_sync("transaction", _run_transaction, _apply)
+
+async def get_pending_referrals(limit=1000):
+    """রিস্টার্টের আগে প্রসেস না হওয়া রেফারেল: [(referred_id, referrer), ...]"""
+    if db is None: return []
+    query = db.collection(COLLECTION_REFERRALS).where('status', '==', 'pending').limit(limit)
+    return await run_sync("read", lambda: [(int(doc.id), doc.to_dict().get('referrer')) for doc in query.stream()])
+
+
+# ==========================================
+# ব্রডকাস্ট
+# ==========================================
+
+async def create_broadcast(data):
+    _, ref = await run_sync("write", db.collection(COLLECTION_BROADCASTS).add, {
+        **data,
+        'status': 'running',
+        'cursor': None,
+        'sent': 0,
+        'failed': 0,
+        'blocked': 0,
+        'started_at': firestore.SERVER_TIMESTAMP,
+        'updated_at': firestore.SERVER_TIMESTAMP
+    })
+    return ref.id
+
+async def get_broadcast(broadcast_id):
+    doc = await run_sync("read", db.collection(COLLECTION_BROADCASTS).document(broadcast_id).get)
+    return doc.to_dict() if doc.exists else None
+
+async def update_broadcast(broadcast_id, fields):
+    await run_sync("write", db.collection(COLLECTION_BROADCASTS).document(broadcast_id).update, {
+        **fields,
+        'updated_at': firestore.SERVER_TIMESTAMP
+    })
+
+async def get_running_broadcast_ids():
+    if db is None: return []
+    return await run_sync("read", 
+        lambda: [doc.id for doc in db.collection(COLLECTION_BROADCASTS).where('status', '==', 'running').stream()]
+    )
+
+
+# ==========================================
+# ব্যাকগ্রাউন্ড জব
+# ==========================================
+
+async def create_job(kind, params, admin_id):
+    _, ref = await run_sync("write", db.collection(COLLECTION_JOBS).add, {
+        'kind': kind,
+        'params': params,
+        'admin_id': admin_id,
+        'status': 'running',
+        'progress': {},
+        'created_at': firestore.SERVER_TIMESTAMP,
+        'updated_at': firestore.SERVER_TIMESTAMP
+    })
+    return ref.id
+
+async def get_job(job_id):
+    doc = await run_sync("read", db.collection(COLLECTION_JOBS).document(job_id).get)
+    return doc.to_dict() if doc.exists else None
+
+async def update_job(job_id, fields):
+    await run_sync("write", db.collection(COLLECTION_JOBS).document(job_id).update, {
+        **fields,
+        'updated_at': firestore.SERVER_TIMESTAMP
+    })
+
+async def get_recent_jobs(limit=10):
+    if db is None: return []
+    query = db.collection(COLLECTION_JOBS).order_by('created_at', direction=firestore.Query.DESCENDING).limit(limit)
+    return await run_sync("read", lambda: [(doc.id, doc.to_dict()) for doc in query.stream()])
+
+async def get_running_jobs():
+    if db is None: return []
+    return await run_sync("read", 
+        lambda: [(doc.id, doc.to_dict()) for doc in db.collection(COLLECTION_JOBS).where('status', '==', 'running').stream()]
+    )
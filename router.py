@@ -0,0 +1,129 @@
+import time
+import logging
+
+from metrics import record_handler
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixTrie:
+    """callback_data এর প্রিফিক্স থেকে রুট খোঁজার ট্রাই।
+
+    খোঁজার খরচ শুধু কী-এর দৈর্ঘ্যের উপর নির্ভর করে, কতগুলো রুট আছে তার উপর নয়।
+    একাধিক প্রিফিক্স মিললে সবচেয়ে লম্বাটি জেতে।
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, prefix, value):
+        node = self._root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node[None] = value
+
+    def longest_match(self, key):
+        node = self._root
+        found = node.get(None)
+        for ch in key:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class _Route:
+    __slots__ = ("name", "handler", "guard", "answer")
+
+    def __init__(self, name, handler, guard=None, answer=True):
+        self.name = name
+        self.handler = handler
+        self.guard = guard
+        self.answer = answer
+
+
+class Router:
+    """স্টেট ও callback_data থেকে হ্যান্ডলার বের করার ডিসপ্যাচ টেবিল।
+
+    স্টেট রুট একটি dict এ, callback রুট হুবহু মিল হলে dict এ আর প্রিফিক্স
+    হলে ট্রাইতে থাকে। প্রতিটি রুটের সময় ও ত্রুটি metrics এর হিস্টোগ্রামে যায়।
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._exact = {}
+        self._prefixes = PrefixTrie()
+        self._routes = []
+
+    def _add(self, name, handler, **options):
+        route = _Route(name, handler, **options)
+        self._routes.append(route)
+        return route
+
+    def state(self, *states):
+        """ডেকোরেটর: handler(update, context, state, temp_data)"""
+        def register(handler):
+            for state in states:
+                if state in self._states:
+                    raise ValueError(f"State {state} already routed to {self._states[state].name}")
+                self._states[state] = self._add(f"state:{state}", handler)
+            return handler
+        return register
+
+    def callback(self, key, prefix=False, guard=None, answer=True):
+        """ডেকোরেটর: handler(update, context)
+
+        `guard(user_id)` False দিলে হ্যান্ডলার চলে না, "Access Denied" দেখায়।
+        `answer` True হলে হ্যান্ডলারের আগে query.answer() করা হয়; যেসব রুট
+        নিজেরা অ্যালার্ট দেখায় তারা False দেয়।
+        """
+        def register(handler):
+            if prefix:
+                self._prefixes.insert(key, self._add(f"cb:{key}*", handler, guard=guard, answer=answer))
+            else:
+                if key in self._exact:
+                    raise ValueError(f"Callback {key} already routed")
+                self._exact[key] = self._add(f"cb:{key}", handler, guard=guard, answer=answer)
+            return handler
+        return register
+
+    def resolve_callback(self, data):
+        route = self._exact.get(data)
+        if route is None:
+            route = self._prefixes.longest_match(data)
+        return route
+
+    async def _run(self, route, *args):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await route.handler(*args)
+            failed = False
+            return result
+        finally:
+            record_handler(route.handler.__name__, route.name, time.perf_counter() - started, failed)
+
+    async def dispatch_state(self, update, context, state, temp_data):
+        route = self._states.get(state)
+        if route is None:
+            return False
+        await self._run(route, update, context, state, temp_data)
+        return True
+
+    async def dispatch_callback(self, update, context):
+        """সব callback query এর একমাত্র PTB হ্যান্ডলার।"""
+        query = update.callback_query
+        route = self.resolve_callback(query.data or "")
+        if route is None:
+            await query.answer()
+            return
+        if route.guard is not None and not await route.guard(query.from_user.id):
+            await query.answer("Access Denied", show_alert=True)
+            return
+        if route.answer:
+            await query.answer()
+        await self._run(route, update, context)
+
+
+router = Router()
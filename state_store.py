@@ -0,0 +1,165 @@
+import json
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """ইউজারের কথোপকথন স্টেট (state, temp_data) এর ইন-মেমরি LRU সামনের স্তর।
+
+    পড়া মেমরি থেকে হয়, মিস হলে ব্যাকএন্ড থেকে একবার লোড হয়। লেখা সাথে সাথে
+    মেমরিতে বসে আর `flush_interval` সেকেন্ড পর পর একসাথে ব্যাকএন্ডে যায়
+    (write-behind)। বন্ধ হওয়ার সময় stop() বাকি সব লেখা ফ্লাশ করে।
+    """
+
+    def __init__(self, backend, capacity=10000, flush_interval=2.0, default_state=0):
+        self.backend = backend
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.default_state = default_state
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._dirty = {}
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    def _remember(self, user_id, state, temp_data):
+        self._entries[user_id] = (state, temp_data)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.capacity:
+            # ডার্টি এন্ট্রি _dirty তে থেকে যায়, তাই ফ্লাশের আগে হারায় না
+            self._entries.popitem(last=False)
+
+    def _cached(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is None:
+            pending = self._dirty.get(user_id)
+            # শুধু state লেখা থাকলে temp_data এখনও অজানা
+            if pending is not None and pending[1] is not None:
+                entry = pending
+        return entry
+
+    async def get(self, user_id):
+        user_id = str(user_id)
+        entry = self._cached(user_id)
+        if entry is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = await self.backend.load(user_id) or (self.default_state, {})
+            # লোড চলাকালীন set() হয়ে থাকলে সেটাই নতুন
+            pending = self._dirty.get(user_id)
+            if pending is not None:
+                entry = (pending[0], pending[1] if pending[1] is not None else entry[1])
+        self._remember(user_id, *entry)
+        state, temp_data = entry
+        return state, dict(temp_data)
+
+    async def set(self, user_id, state, temp_data=None):
+        user_id = str(user_id)
+        if temp_data is None:
+            current = self._cached(user_id)
+            if current is None:
+                # আগের temp_data অজানা: শুধু state লেখা হবে
+                self._dirty[user_id] = (state, None)
+                return
+            temp_data = current[1]
+        entry = (state, dict(temp_data))
+        self._dirty[user_id] = entry
+        self._remember(user_id, *entry)
+
+    def prime(self, user_id, state, temp_data):
+        """অন্য কোনো রিড থেকে পাওয়া স্টেট ক্যাশে বসায় (ডার্টি না করে)।"""
+        user_id = str(user_id)
+        if user_id not in self._entries and user_id not in self._dirty:
+            self._remember(user_id, state, dict(temp_data or {}))
+
+    def forget(self, user_id):
+        user_id = str(user_id)
+        self._entries.pop(user_id, None)
+        self._dirty.pop(user_id, None)
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            pending, self._dirty = self._dirty, {}
+            try:
+                await self.backend.save_many(pending)
+            except Exception as e:
+                logger.error(f"State flush error ({len(pending)} users): {e}")
+                # নতুন লেখা থাকলে সেটাই রাখা হবে, নাহলে পরের বার আবার চেষ্টা
+                for user_id, entry in pending.items():
+                    self._dirty.setdefault(user_id, entry)
+                return 0
+            return len(pending)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "dirty": len(self._dirty)}
+
+
+class SQLiteStateBackend:
+    """লোকাল টেস্ট ও বেঞ্চমার্কের জন্য SQLite ব্যাকএন্ড (STATE_BACKEND=sqlite)।"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS user_state (user_id TEXT PRIMARY KEY, state INTEGER, temp_data TEXT)"
+        )
+        self._conn.commit()
+
+    def _load(self, user_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, temp_data FROM user_state WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1] or "{}")
+
+    def _save_many(self, items):
+        with self._lock:
+            for user_id, (state, temp_data) in items.items():
+                if temp_data is None:
+                    self._conn.execute(
+                        "INSERT INTO user_state (user_id, state, temp_data) VALUES (?, ?, '{}') "
+                        "ON CONFLICT(user_id) DO UPDATE SET state = excluded.state",
+                        (user_id, state)
+                    )
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO user_state (user_id, state, temp_data) VALUES (?, ?, ?)",
+                        (user_id, state, json.dumps(temp_data, ensure_ascii=False))
+                    )
+            self._conn.commit()
+
+    async def load(self, user_id):
+        return await asyncio.to_thread(self._load, user_id)
+
+    async def save_many(self, items):
+        await asyncio.to_thread(self._save_many, items)
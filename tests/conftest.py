@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import repository
+from fake_firestore import install
+
+
+@pytest.fixture
+def fake_db():
+    """repository কে benchmarks/fake_firestore এ চালায়; টেস্ট শেষে আগের ক্লায়েন্ট ফেরত।"""
+    db, run_transaction = repository.db, repository._run_transaction
+    client = install(repository)
+    repository.invalidate_config()
+    yield client
+    repository.db, repository._run_transaction = db, run_transaction
+    repository.invalidate_config()
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import broadcast
+from broadcast import ChatLimiter, TokenBucket, send_with_retry
+
+
+class _Bot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, time.monotonic()))
+
+
+def _gaps(sent, chat_id):
+    times = [at for chat, at in sent if chat == chat_id]
+    return [b - a for a, b in zip(times, times[1:])]
+
+
+def test_same_chat_is_spaced_other_chats_are_not(monkeypatch):
+    monkeypatch.setattr(broadcast, "chat_limiter", ChatLimiter(rate=20, group_rate=10))
+    bot = _Bot()
+    bucket = TokenBucket(1000)
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(send_with_retry(bot, bucket, 7, "x") for _ in range(3)))
+        private = time.monotonic() - started
+        started = time.monotonic()
+        await asyncio.gather(*(send_with_retry(bot, bucket, chat_id, "x") for chat_id in range(100, 110)))
+        return private, time.monotonic() - started
+
+    private, spread = asyncio.run(run())
+    assert all(gap >= 0.04 for gap in _gaps(bot.sent, 7))
+    assert private >= 0.09
+    assert spread < 0.04
+
+
+def test_groups_use_group_rate(monkeypatch):
+    monkeypatch.setattr(broadcast, "chat_limiter", ChatLimiter(rate=1000, group_rate=10))
+    bot = _Bot()
+
+    async def run():
+        await asyncio.gather(*(send_with_retry(bot, TokenBucket(1000), chat_id, "x") for chat_id in (-5, -5, "@channel", "@channel")))
+
+    asyncio.run(run())
+    assert all(gap >= 0.08 for gap in _gaps(bot.sent, -5))
+    assert all(gap >= 0.08 for gap in _gaps(bot.sent, "@channel"))
+
+
+def test_idle_chats_are_pruned():
+    limiter = ChatLimiter(rate=1000, group_rate=1000, max_chats=10)
+
+    async def run():
+        for chat_id in range(100):
+            await limiter.acquire(chat_id)
+            await asyncio.sleep(0.002)
+
+    asyncio.run(run())
+    assert len(limiter._buckets) <= 20
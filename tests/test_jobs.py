@@ -0,0 +1,46 @@
+import asyncio
+
+from jobs import JobManager
+
+
+def test_exclusive_kind_runs_once(fake_db):
+    manager = JobManager()
+    release = asyncio.Event()
+    runs = []
+
+    @manager.register("reconcile", exclusive=True)
+    async def runner(ctx):
+        runs.append(ctx.id)
+        await release.wait()
+
+    async def run():
+        first, second = await asyncio.gather(
+            manager.submit("reconcile", {}, 1), manager.submit("reconcile", {}, 2)
+        )
+        await asyncio.sleep(0)
+        again = await manager.submit("reconcile", {}, 3)
+        release.set()
+        await asyncio.gather(*manager._tasks.values())
+        after = await manager.submit("reconcile", {}, 4)
+        await asyncio.gather(*manager._tasks.values())
+        return first, second, again, after
+
+    first, second, again, after = asyncio.run(run())
+    assert first is not None and second is None and again is None
+    assert after is not None
+    assert runs == [first, after]
+
+
+def test_non_exclusive_kind_runs_concurrently(fake_db):
+    manager = JobManager()
+
+    @manager.register("broadcast")
+    async def runner(ctx):
+        await asyncio.sleep(0)
+
+    async def run():
+        ids = await asyncio.gather(*(manager.submit("broadcast", {}, 1) for _ in range(3)))
+        await asyncio.gather(*manager._tasks.values())
+        return ids
+
+    assert all(asyncio.run(run()))
@@ -0,0 +1,67 @@
+import random
+import asyncio
+
+from firebase_admin import firestore
+
+import repository
+from config import COLLECTION_USERS
+from models import Submission
+
+USER_ID = 515151
+REWARD = 5.0
+
+
+def _seed(client):
+    client._write(f"{COLLECTION_USERS}/{USER_ID}", {'user_id': USER_ID, 'balance': 0.0})
+
+
+async def _submit():
+    return await repository.add_submission(Submission(user_id=USER_ID, type='review_data', submitted_at=firestore.SERVER_TIMESTAMP))
+
+
+async def _stats_balance():
+    doc = await repository.run_sync("read", repository._stats_ref().get)
+    return (doc.to_dict() or {}).get('total_balance', 0.0) if doc.exists else 0.0
+
+
+def test_concurrent_clicks_credit_reward_once(fake_db):
+    _seed(fake_db)
+    rng = random.Random(1)
+
+    async def run():
+        await repository.update_system_config('task_reward', REWARD)
+        credited = 0.0
+        for _ in range(5):
+            sub_id = await _submit()
+            outcomes = await asyncio.gather(*(
+                repository.review_submission(sub_id, rng.random() < 0.7, f"admin{i}") for i in range(20)
+            ))
+            winners = [o for o in outcomes if o['status'] == 'ok']
+            assert len(winners) == 1
+            assert all(o['status'] == 'already' for o in outcomes if o['status'] != 'ok')
+            credited += winners[0]['reward']
+        return credited, await repository.get_balance(USER_ID), await _stats_balance()
+
+    credited, balance, stats_balance = asyncio.run(run())
+    assert balance == credited
+    assert stats_balance == credited
+
+
+def test_reviewed_submission_is_not_reviewed_again(fake_db):
+    _seed(fake_db)
+
+    async def run():
+        await repository.update_system_config('task_reward', REWARD)
+        sub_id = await _submit()
+        first = await repository.review_submission(sub_id, True, 'a1')
+        second = await repository.review_submission(sub_id, True, 'a2')
+        return first, second, await repository.get_balance(USER_ID)
+
+    first, second, balance = asyncio.run(run())
+    assert first['status'] == 'ok' and first['reward'] == REWARD
+    assert second['status'] == 'already'
+    assert balance == REWARD
+
+
+def test_missing_submission(fake_db):
+    assert asyncio.run(repository.review_submission("nope", True, 'a1'))['status'] == 'not_found'
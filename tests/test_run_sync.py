@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+import metrics
+import repository
+from models import Withdrawal
+
+
+@pytest.fixture
+def ops(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(repository, "record_firestore", lambda op, seconds, failed=False: recorded.append(op))
+    return recorded
+
+
+def test_ui_config_seed_is_recorded_as_write(fake_db, ops):
+    asyncio.run(repository.get_ui_config())
+    assert ops == ["read", "write"]
+    repository.invalidate_config()
+    ops.clear()
+    asyncio.run(repository.get_ui_config())
+    assert ops == ["read"]
+
+
+def test_new_user_and_withdrawal_are_labelled(fake_db, ops):
+    # নতুন ইউজার: একটি রিড, তারপর ব্যাচ কমিট
+    asyncio.run(repository.get_or_create_user(1, "u", "U"))
+    assert ops == ["read", "write"]
+    ops.clear()
+    withdrawal = Withdrawal(user_id=1, amount=10.0, method='Bkash', target='017')
+    asyncio.run(repository.create_withdrawal("w1", withdrawal))
+    assert ops == ["transaction"]
+
+
+def test_unknown_op_is_rejected(fake_db):
+    with pytest.raises(ValueError):
+        asyncio.run(repository.run_sync("call", lambda: None))
+
+
+def test_failed_call_is_counted(fake_db):
+    def boom():
+        raise RuntimeError("rpc failed")
+
+    errors = metrics.FIRESTORE_ERRORS.labels("write")
+    before = errors.value
+    with pytest.raises(RuntimeError):
+        asyncio.run(repository.run_sync("write", boom))
+    assert errors.value == before + 1
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+import repository
+from config import COLLECTION_USERS
+
+BALANCES = [10.0, 20.0, 30.0, 40.0]
+
+
+def _seed(client):
+    # কাউন্টার চালুর আগের ইউজার: system/stats এ নেই
+    for user_id, balance in enumerate(BALANCES, start=1):
+        client._write(f"{COLLECTION_USERS}/{user_id}", {'user_id': user_id, 'balance': balance})
+
+
+def _stats(client):
+    return client._read(repository._stats_ref().path) or {}
+
+
+def _actual(client):
+    users = client._docs(COLLECTION_USERS)
+    return len(users), sum(d.get('balance', 0.0) for _, d in users)
+
+
+def _during_scan(monkeypatch, action):
+    """প্রথম পেজ পড়ার ঠিক আগে action চালায়, অর্থাৎ কাউন্টার পড়ার পরে, স্ক্যানের মাঝখানে।"""
+    original = repository.get_users_page
+    calls = []
+
+    async def get_users_page(*args, **kwargs):
+        if not calls:
+            calls.append(1)
+            await action()
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(repository, "get_users_page", get_users_page)
+
+
+def test_get_system_stats_never_scans(fake_db):
+    _seed(fake_db)
+    before = fake_db.rpc_count
+    stats = asyncio.run(repository.get_system_stats())
+    assert fake_db.rpc_count - before == 1
+    assert stats == {'total_users': 0, 'total_balance': 0.0, 'reconciled': False}
+
+
+def test_reconcile_fixes_drift(fake_db):
+    _seed(fake_db)
+    result = asyncio.run(repository.reconcile_system_stats())
+    assert result['drift'] == {'total_users': len(BALANCES), 'total_balance': sum(BALANCES)}
+    stats = asyncio.run(repository.get_system_stats())
+    assert stats == {'total_users': len(BALANCES), 'total_balance': sum(BALANCES), 'reconciled': True}
+
+
+def test_writes_during_scan_are_counted_once(fake_db, monkeypatch):
+    _seed(fake_db)
+
+    async def writes():
+        assert await repository.update_balance(1, 5.0)
+        await repository.get_or_create_user(99, "late", "U")
+
+    _during_scan(monkeypatch, writes)
+    asyncio.run(repository.reconcile_system_stats())
+    users, balance = _actual(fake_db)
+    stats = _stats(fake_db)
+    assert stats['total_users'] == users == len(BALANCES) + 1
+    assert stats['total_balance'] == balance == sum(BALANCES) + 5.0
+
+
+def test_concurrent_reconciles_apply_drift_once(fake_db):
+    _seed(fake_db)
+
+    async def run():
+        return await asyncio.gather(repository.reconcile_system_stats(), repository.reconcile_system_stats())
+
+    first, second = asyncio.run(run())
+    assert second['drift'] == {'total_users': 0, 'total_balance': 0.0}
+    users, balance = _actual(fake_db)
+    assert (_stats(fake_db)['total_users'], _stats(fake_db)['total_balance']) == (users, balance)
+
+
+def test_reconcile_finished_elsewhere_is_not_applied_twice(fake_db, monkeypatch):
+    _seed(fake_db)
+    users, balance = _actual(fake_db)
+
+    async def other_replica():
+        # অন্য রেপ্লিকার রিকনসাইল এই স্ক্যানের মাঝখানে শেষ হলো
+        fake_db._write(repository._stats_ref().path, {
+            'total_users': users, 'total_balance': balance, 'reconciled_at': 'elsewhere'
+        }, merge=True)
+
+    _during_scan(monkeypatch, other_replica)
+    with pytest.raises(RuntimeError):
+        asyncio.run(repository.reconcile_system_stats())
+    assert (_stats(fake_db)['total_users'], _stats(fake_db)['total_balance']) == (users, balance)
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+import pytest
+from telegram import Chat, Message, Update, User
+from telegram.ext import ApplicationBuilder, ContextTypes
+
+from user_context import BotContext
+
+
+def _application():
+    return ApplicationBuilder().token("1:X").context_types(ContextTypes(context=BotContext)).build()
+
+
+def _update(user_id):
+    chat = Chat(user_id, Chat.PRIVATE)
+    message = Message(1, datetime.now(timezone.utc), chat, from_user=User(user_id, "U", False), text="hi")
+    return Update(1, message=message)
+
+
+def test_user_doc_defaults_to_update_user():
+    context = BotContext.from_update(_update(42), _application())
+    assert context.user_doc().user_id == 42
+    assert context.user_doc() is context.user_doc(42)
+    assert context.user_doc(7).user_id == 7
+
+
+def test_user_doc_without_user_needs_explicit_id():
+    context = BotContext.from_update(object(), _application())
+    with pytest.raises(ValueError):
+        context.user_doc()
+    assert context.user_doc(7).user_id == 7
@@ -0,0 +1,75 @@
+import asyncio
+
+from firebase_admin import firestore
+
+import repository
+from config import COLLECTION_USERS, COLLECTION_WITHDRAWALS
+from models import Withdrawal
+
+USER_ID = 424242
+AMOUNT = 30.0
+
+
+def _seed(client, balance):
+    client._write(f"{COLLECTION_USERS}/{USER_ID}", {'user_id': USER_ID, 'balance': balance})
+
+
+def _withdrawal(amount=AMOUNT):
+    return Withdrawal(user_id=USER_ID, amount=amount, method='Bkash', target='01700000000', time=firestore.SERVER_TIMESTAMP)
+
+
+def test_concurrent_withdrawals_never_overdraw(fake_db):
+    _seed(fake_db, 300.0)
+    keys = [f"w{i:03d}" for i in range(40)]
+
+    async def run():
+        # প্রতিটি কী দুবার: ডুপ্লিকেট মেসেজ/ওয়েবহুক রিট্রাই
+        results = await asyncio.gather(*(repository.create_withdrawal(key, _withdrawal()) for key in keys + keys))
+        return results, await repository.get_balance(USER_ID)
+
+    results, balance = asyncio.run(run())
+    created = [r for r in results if r['status'] == 'created']
+    assert len(created) == 10
+    assert balance == 0.0
+    assert len(fake_db._docs(COLLECTION_WITHDRAWALS)) == 10
+
+
+def test_same_key_is_idempotent(fake_db):
+    _seed(fake_db, 100.0)
+
+    async def run():
+        first = await repository.create_withdrawal("same", _withdrawal())
+        second = await repository.create_withdrawal("same", _withdrawal())
+        return first, second, await repository.get_balance(USER_ID)
+
+    first, second, balance = asyncio.run(run())
+    assert first['status'] == 'created'
+    assert second['status'] == 'duplicate'
+    assert balance == 100.0 - AMOUNT
+
+
+def test_insufficient_balance_is_rejected(fake_db):
+    _seed(fake_db, 10.0)
+    result = asyncio.run(repository.create_withdrawal("big", _withdrawal(50.0)))
+    assert result['status'] == 'insufficient'
+    assert asyncio.run(repository.get_balance(USER_ID)) == 10.0
+    assert fake_db._docs(COLLECTION_WITHDRAWALS) == []
+
+
+def test_pay_and_refund_race_processes_once(fake_db):
+    _seed(fake_db, 100.0)
+
+    async def run():
+        await repository.create_withdrawal("race", _withdrawal())
+        outcomes = await asyncio.gather(
+            repository.mark_withdrawal_paid("race", 'a1'),
+            repository.reject_withdrawal("race", 'a2'),
+            repository.reject_withdrawal("race", 'a3'),
+        )
+        return outcomes, await repository.get_balance(USER_ID)
+
+    outcomes, balance = asyncio.run(run())
+    winners = [o for o in outcomes if o['status'] == 'ok']
+    assert len(winners) == 1
+    refunded = AMOUNT if winners[0].get('refunded') else 0.0
+    assert balance == 100.0 - AMOUNT + refunded
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class UserOrderedUpdateProcessor(BaseUpdateProcessor):
+    """ভিন্ন ইউজারের আপডেট একসাথে চলে, একই ইউজারের আপডেট আসার ক্রমে একটার পর একটা।
+
+    কথোপকথনের state/temp_data পড়া-লেখা একই ইউজারের দুটি আপডেটের মধ্যে
+    জড়িয়ে না যায় সেজন্য প্রতি ইউজারের একটি asyncio.Lock (FIFO)। ইউজারের লক
+    পাওয়ার পরেই গ্লোবাল স্লট (`concurrency`) নেওয়া হয়, তাই একজন ইউজারের জমে
+    থাকা আপডেট অন্যদের স্লট আটকায় না। PTB এর নিজের সেমাফোর (`max_pending`)
+    শুধু মোট কতগুলো আপডেট অপেক্ষা/চলমান থাকতে পারে তার সীমা।
+    """
+
+    def __init__(self, concurrency, max_pending=None):
+        super().__init__(max(max_pending or concurrency * 16, concurrency, 2))
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        # key -> [lock, এই লকের জন্য অপেক্ষমাণ/চলমান আপডেট সংখ্যা]
+        self._locks = {}
+        self.active = 0
+        self.peak = 0
+
+    @staticmethod
+    def _key(update):
+        user = getattr(update, "effective_user", None)
+        if user is not None:
+            return user.id
+        chat = getattr(update, "effective_chat", None)
+        return ("chat", chat.id) if chat is not None else None
+
+    async def _run(self, coroutine):
+        async with self._slots:
+            self.active += 1
+            if self.active > self.peak:
+                self.peak = self.active
+            try:
+                await coroutine
+            finally:
+                self.active -= 1
+
+    async def do_process_update(self, update, coroutine):
+        key = self._key(update)
+        if key is None:
+            await self._run(coroutine)
+            return
+
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await self._run(coroutine)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def stats(self):
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "peak": self.peak,
+            "users_in_flight": len(self._locks),
+        }
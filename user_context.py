@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import contextvars
+
+from firebase_admin import firestore
+from telegram import Update
+from telegram.ext import CallbackContext
+
+from repository import get_user_doc, update_user_fields
+
+logger = logging.getLogger(__name__)
+
+
+class UserContext:
+    """একটি আপডেটের ভেতরে একজন ইউজারের ডক।
+
+    প্রথমবার কোনো ফিল্ড চাইলে ডকটি একবারই পড়া হয় (একসাথে কয়েকটি get()
+    এলেও একটি রিড), পরের সব পড়া মেমরি থেকে। set()/add() সাথে সাথে লেখে না,
+    ফিল্ডগুলো dirty হিসেবে জমে থাকে আর আপডেট শেষে (বা commit() ডাকলে) একটি
+    ব্যাচে যায়; ব্যালেন্সের পরিবর্তন system/stats এর সাথে একই ব্যাচে।
+    """
+
+    __slots__ = ("user_id", "_data", "_load", "_dirty", "_balance_delta")
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._data = None
+        self._load = None
+        self._dirty = {}
+        self._balance_delta = 0.0
+
+    def prime(self, data):
+        """অন্য কোনো রিড (যেমন get_or_create_user) থেকে পাওয়া ডক বসায়, যাতে আবার পড়তে না হয়।"""
+        if self._load is None and data is not None:
+            self._data = dict(data)
+            self._load = asyncio.get_running_loop().create_future()
+            self._load.set_result(None)
+
+    async def load(self):
+        """ইউজার ডক (না থাকলে None); জমে থাকা পরিবর্তনসহ।"""
+        if self._load is None:
+            self._load = asyncio.ensure_future(self._fetch())
+        await self._load
+        return self._data
+
+    async def _fetch(self):
+        data = await get_user_doc(self.user_id)
+        if data is not None:
+            # পড়ার আগেই set()/add() হয়ে থাকলে সেগুলো উপরে বসে
+            for key, value in self._dirty.items():
+                self._apply(data, key, value)
+            data['balance'] = data.get('balance', 0.0) + self._balance_delta
+        self._data = data
+
+    async def exists(self):
+        return await self.load() is not None
+
+    async def get(self, field, default=None):
+        data = await self.load()
+        return default if data is None else data.get(field, default)
+
+    @staticmethod
+    def _apply(data, key, value):
+        if isinstance(value, firestore.Increment):
+            data[key] = data.get(key, 0) + value.value
+        else:
+            data[key] = value
+
+    def set(self, field, value):
+        self._dirty[field] = value
+        if self._data is not None:
+            self._data[field] = value
+
+    def add(self, field, amount):
+        """ফিল্ডে Increment; একই ফিল্ডে একাধিক add() একটি লেখায় মেশে।"""
+        if field == 'balance':
+            self.add_balance(amount)
+            return
+        current = self._dirty.get(field)
+        if current is None:
+            self._dirty[field] = firestore.Increment(amount)
+        elif isinstance(current, firestore.Increment):
+            self._dirty[field] = firestore.Increment(current.value + amount)
+        else:
+            self._dirty[field] = current + amount
+        if self._data is not None:
+            self._apply(self._data, field, firestore.Increment(amount))
+
+    def add_balance(self, amount):
+        self._balance_delta += amount
+        if self._data is not None:
+            self._data['balance'] = self._data.get('balance', 0.0) + amount
+
+    @property
+    def dirty(self):
+        return bool(self._dirty) or bool(self._balance_delta)
+
+    async def commit(self):
+        """জমে থাকা লেখা একটি ব্যাচে পাঠায়। কিছু না থাকলে True; ইউজার না থাকলে False।"""
+        if not self.dirty:
+            return True
+        fields, balance_delta = self._dirty, self._balance_delta
+        self._dirty, self._balance_delta = {}, 0.0
+        return await update_user_fields(self.user_id, fields, balance_delta)
+
+
+# এই আপডেটে তৈরি হওয়া UserContext গুলো, আপডেট শেষে কমিটের জন্য
+_pending = contextvars.ContextVar("user_contexts", default=None)
+
+
+def begin_update():
+    return _pending.set([])
+
+
+async def finish_update(token):
+    """আপডেটের সব হ্যান্ডলার শেষে: dirty UserContext গুলো কমিট করে।"""
+    user_docs = _pending.get() or []
+    _pending.reset(token)
+    dirty = [user_doc for user_doc in user_docs if user_doc.dirty]
+    if not dirty:
+        return
+    results = await asyncio.gather(*(user_doc.commit() for user_doc in dirty), return_exceptions=True)
+    for user_doc, result in zip(dirty, results):
+        if result is not True:
+            logger.error(f"User {user_doc.user_id} write at end of update failed: {result}")
+
+
+class BotContext(CallbackContext):
+    """CallbackContext + context.user_doc(): আপডেটপ্রতি একবার পড়া ইউজার ডক।
+
+    PTB প্রতিটি আপডেটে from_update() দিয়ে একটি context বানায়, তাই এখানে রাখা
+    UserContext শুধু ওই আপডেটের জন্য; পরের আপডেট আবার ফায়ারস্টোর থেকে পড়ে।
+    আপডেটের ইউজার আইডিও তখনই update.effective_user থেকে রাখা হয়।
+    """
+
+    @classmethod
+    def from_update(cls, update, application):
+        context = super().from_update(update, application)
+        user = update.effective_user if isinstance(update, Update) else None
+        context.__dict__['_update_user_id'] = user.id if user else None
+        return context
+
+    def user_doc(self, user_id=None):
+        """user_id না দিলে আপডেটের ইউজার (ইউজারহীন আপডেটে ValueError)।"""
+        if user_id is None:
+            user_id = self.__dict__.get('_update_user_id')
+            if user_id is None:
+                raise ValueError("user_doc() needs a user_id for updates without a user")
+        docs = self.__dict__.setdefault('_user_docs', {})
+        key = str(user_id)
+        user_doc = docs.get(key)
+        if user_doc is None:
+            user_doc = docs[key] = UserContext(user_id)
+            pending = _pending.get()
+            if pending is not None:
+                pending.append(user_doc)
+        return user_doc
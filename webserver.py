@@ -0,0 +1,122 @@
+import json
+import time
+import signal
+import asyncio
+import logging
+
+import tornado.web
+import tornado.httpserver
+from telegram import Update
+from telegram.ext import Application
+from telegram.request import HTTPXRequest
+
+from metrics import begin_update, end_update, record_telegram, render_prometheus
+import user_context
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# ইনস্ট্রুমেন্টেড অ্যাপ্লিকেশন ও রিকোয়েস্ট
+# ==========================================
+
+class InstrumentedApplication(Application):
+    """প্রতিটি আপডেটের মোট সময় ও তার ভেতরের কলের সংখ্যা মাপে, আর শেষে
+    হ্যান্ডলারদের জমা রাখা ইউজার ডকের লেখা (context.user_doc()) কমিট করে।"""
+
+    async def process_update(self, update):
+        scope, token = begin_update()
+        user_docs = user_context.begin_update()
+        started = time.perf_counter()
+        try:
+            await super().process_update(update)
+        finally:
+            try:
+                await user_context.finish_update(user_docs)
+            finally:
+                end_update(scope, token, time.perf_counter() - started)
+
+
+class InstrumentedHTTPXRequest(HTTPXRequest):
+    """Bot API এর প্রতিটি মেথড কলের সময় মাপে।"""
+
+    async def do_request(self, url, method, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().do_request(url, method, *args, **kwargs)
+        finally:
+            record_telegram(url.rsplit("/", 1)[-1], time.perf_counter() - started)
+
+
+# ==========================================
+# ওয়েবহুক + /metrics সার্ভার
+# ==========================================
+# PTB এর run_webhook নিজের সার্ভারে অন্য পাথ যোগ করতে দেয় না, তাই একই
+# PORT এ ওয়েবহুক ও /metrics দুটোই এই ছোট tornado অ্যাপ থেকে দেওয়া হয়।
+
+class _WebhookHandler(tornado.web.RequestHandler):
+    def initialize(self, app):
+        self.app = app
+
+    async def post(self):
+        try:
+            data = json.loads(self.request.body)
+        except ValueError:
+            self.send_error(400)
+            return
+        update = Update.de_json(data, self.app.bot)
+        if update is not None:
+            await self.app.update_queue.put(update)
+        self.set_status(200)
+
+    def log_exception(self, typ, value, tb):
+        logger.error(f"Webhook request error: {value}")
+
+
+class _MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(render_prometheus())
+
+
+def _log_request(handler):
+    # ওয়েবহুকের পাথে বট টোকেন থাকে, তাই টর্নেডোর ডিফল্ট অ্যাক্সেস লগ বন্ধ; শুধু ব্যর্থ রিকোয়েস্ট
+    status = handler.get_status()
+    if status >= 400:
+        logger.warning(f"HTTP {status} {handler.request.method} ({handler.__class__.__name__})")
+
+
+async def serve_webhook(app, port, url_path, webhook_url, allowed_updates):
+    """run_webhook এর মতোই অ্যাপের পুরো জীবনচক্র চালায়, সাথে /metrics।"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    web_app = tornado.web.Application([
+        (rf"/{url_path}/?", _WebhookHandler, {"app": app}),
+        (r"/metrics", _MetricsHandler),
+    ], log_function=_log_request)
+    server = tornado.httpserver.HTTPServer(web_app)
+
+    await app.initialize()
+    if app.post_init:
+        await app.post_init(app)
+    try:
+        server.listen(port, address="0.0.0.0")
+        await app.bot.set_webhook(webhook_url, allowed_updates=allowed_updates)
+        await app.start()
+        logger.info(f"Webhook server listening on :{port} (/metrics enabled)")
+        await stop.wait()
+    finally:
+        server.stop()
+        if app.running:
+            await app.stop()
+        if app.post_stop:
+            await app.post_stop(app)
+        await app.shutdown()
+        if app.post_shutdown:
+            await app.post_shutdown(app)
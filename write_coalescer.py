@@ -0,0 +1,179 @@
+import time
+import asyncio
+import logging
+
+from firebase_admin import firestore
+
+from metrics import WRITE_FLUSH_SECONDS, WRITE_FLUSH_OPS, WRITE_COALESCED
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _merge_fields(into, fields):
+    """`fields` কে আগের লেখা `into` তে মেশায়; মেশানো না গেলে কিছু না বদলে False।
+
+    দুটি Increment যোগ হয়ে একটি Increment হয়, আগের সংখ্যার উপর Increment সংখ্যাটাই
+    বাড়ায়, আর সাধারণ মান আগেরটাকে প্রতিস্থাপন করে। Increment এর আগে সংখ্যা নয় এমন
+    মান থাকলে ফলাফল আলাদা লেখা ছাড়া প্রকাশ করা যায় না।
+    """
+    merged = {}
+    for key, value in fields.items():
+        current = into.get(key, _MISSING)
+        if current is _MISSING or not isinstance(value, firestore.Increment):
+            merged[key] = value
+        elif isinstance(current, firestore.Increment):
+            merged[key] = firestore.Increment(current.value + value.value)
+        elif _is_number(current):
+            merged[key] = current + value.value
+        else:
+            return False
+    into.update(merged)
+    return True
+
+
+class _PendingBatch:
+    __slots__ = ("groups", "entries", "last")
+
+    def __init__(self):
+        # (mutations, future): প্রতিটি write() কল, ব্যর্থ হলে আলাদা করে আবার চেষ্টার জন্য
+        self.groups = []
+        # [kind, ref, fields]: একই ডকুমেন্টে পরপর একই ধরনের লেখা মিশে একটি
+        self.entries = []
+        self.last = {}
+
+
+class WriteCoalescer:
+    """ছোট ছোট ফায়ারস্টোর লেখা জমিয়ে `interval` সেকেন্ড পর পর বা `max_ops` টি
+    হলে একটি WriteBatch এ কমিট করে।
+
+    প্রতিটি `write(mutations)` কলের লেখাগুলো একসাথে (অ্যাটমিক) বসে, আর কমিট
+    হলে তবেই কলার ফিরে যায়। একই ডকুমেন্টে বারবার লেখা (যেমন system/stats এর
+    কাউন্টার) একটি লেখায় মিশে যায়। মেশানো ব্যাচ ব্যর্থ হলে (যেমন একটি update
+    এর ডকুমেন্ট নেই) প্রতিটি কল আলাদা ব্যাচে আবার চেষ্টা হয়, যাতে একজনের ভুলে
+    অন্যদের লেখা না হারায়।
+
+    mutation: ('set' | 'merge' | 'update', doc_ref, fields)
+    """
+
+    def __init__(self, commit, max_ops=400, interval=0.005):
+        self._commit = commit
+        self.max_ops = max_ops
+        self.interval = interval
+        self._ready = []
+        self._pending = _PendingBatch()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self.flushes = 0
+        self.writes = 0
+        self.merged = 0
+        self.fallbacks = 0
+
+    def _add(self, batch, mutation):
+        kind, ref, fields = mutation
+        path = ref.path
+        index = batch.last.get(path)
+        if index is not None and kind != 'set':
+            entry = batch.entries[index]
+            if entry[0] == kind and _merge_fields(entry[2], fields):
+                self.merged += 1
+                WRITE_COALESCED.labels().inc()
+                return
+        batch.last[path] = len(batch.entries)
+        batch.entries.append([kind, ref, dict(fields)])
+
+    async def write(self, mutations):
+        """mutations কমিট হওয়া পর্যন্ত অপেক্ষা করে; ব্যর্থ হলে এক্সেপশন।"""
+        if self._task is None:
+            # ব্যাকগ্রাউন্ড ফ্লাশার চালু না থাকলে (স্ক্রিপ্ট, শাটডাউনের পর) সরাসরি কমিট
+            await self._commit(mutations)
+            return
+
+        if len(self._pending.entries) + len(mutations) > self.max_ops:
+            self._ready.append(self._pending)
+            self._pending = _PendingBatch()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.groups.append((mutations, future))
+        for mutation in mutations:
+            self._add(self._pending, mutation)
+        self.writes += len(mutations)
+        self._wake.set()
+        await future
+
+    async def _commit_batch(self, batch):
+        started = time.perf_counter()
+        try:
+            await self._commit(batch.entries)
+        except Exception as e:
+            self.fallbacks += 1
+            logger.warning(f"Coalesced batch of {len(batch.entries)} writes failed ({e}), retrying per caller")
+            for mutations, future in batch.groups:
+                try:
+                    await self._commit(mutations)
+                except Exception as group_error:
+                    if not future.done():
+                        future.set_exception(group_error)
+                    continue
+                if not future.done():
+                    future.set_result(None)
+            return
+        finally:
+            WRITE_FLUSH_SECONDS.labels().observe(time.perf_counter() - started)
+            WRITE_FLUSH_OPS.labels().observe(len(batch.entries))
+            self.flushes += 1
+        for _, future in batch.groups:
+            if not future.done():
+                future.set_result(None)
+
+    async def flush(self):
+        """জমে থাকা সব লেখা এখনই কমিট করে (ট্রানজ্যাকশনের আগে ডাকা হয়)।"""
+        async with self._flush_lock:
+            while self._ready or self._pending.groups:
+                if self._ready:
+                    batch = self._ready.pop(0)
+                else:
+                    batch, self._pending = self._pending, _PendingBatch()
+                await self._commit_batch(batch)
+
+    async def _loop(self):
+        while True:
+            await self._wake.wait()
+            if not self._ready and len(self._pending.entries) < self.max_ops:
+                await asyncio.sleep(self.interval)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Write flush error: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def pending(self):
+        return sum(len(b.entries) for b in self._ready) + len(self._pending.entries)
+
+    def stats(self):
+        return {
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "merged": self.merged,
+            "fallbacks": self.fallbacks,
+            "pending": self.pending(),
+        }